@@ -0,0 +1 @@
+"""Micro-benchmarks for the SDK's hot paths; run with ``python -m benchmarks``."""
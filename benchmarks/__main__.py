@@ -0,0 +1,109 @@
+"""Run the micro-benchmarks and compare them with the stored baselines.
+
+Usage::
+
+    python -m benchmarks                      # run everything, print a table
+    python -m benchmarks -k to_jpeg_bytes     # only cases whose name contains the filter
+    python -m benchmarks --compare            # exit 1 if a case regressed past --tolerance
+    python -m benchmarks --update             # rewrite baselines.json from this run
+    python -m benchmarks --json results.json  # also write the raw numbers
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+from .cases import CASES, Case
+
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+
+def measure(case: Case, *, repeat: int, min_time: float) -> dict[str, Any] | None:
+    """Time ``case``; ``best`` and ``median`` are seconds per call over ``repeat`` rounds."""
+
+    func = case.setup()
+    if func is None:
+        return None
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(number, int(number * min_time / max(elapsed, 1e-9)))
+    rounds = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {"best": min(rounds), "median": statistics.median(rounds), "number": number, "repeat": repeat}
+
+
+def _format_seconds(value: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:8.2f} {unit}"
+    return f"{value / 1e-9:8.2f} ns"
+
+
+def compare(results: dict[str, dict[str, Any]], baselines: dict[str, float], tolerance: float) -> list[str]:
+    """Return the cases whose best time is more than ``tolerance`` slower than the baseline."""
+
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is not None and result["best"] > baseline * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds per case (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per round (default: 0.2)")
+    parser.add_argument("--compare", action="store_true", help="fail when a case regressed against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for --compare (default: 25%%)")
+    parser.add_argument("--update", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    stored = json.loads(BASELINES.read_text()) if BASELINES.exists() else {"cases": {}}
+    baselines: dict[str, float] = stored.get("cases", {})
+
+    results: dict[str, dict[str, Any]] = {}
+    print(f"{'case':48} {'best':>11} {'median':>11} {'vs baseline':>12}")
+    for case in CASES:
+        if args.filter not in case.name:
+            continue
+        result = measure(case, repeat=args.repeat, min_time=args.min_time)
+        if result is None:
+            print(f"{case.name:48} {'skipped (optional dependency missing)':>36}")
+            continue
+        results[case.name] = result
+        baseline = baselines.get(case.name)
+        change = f"{(result['best'] / baseline - 1) * 100:+10.1f}%" if baseline else f"{'-':>11}"
+        print(f"{case.name:48} {_format_seconds(result['best'])} {_format_seconds(result['median'])} {change}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    if args.update:
+        baselines.update({name: result["best"] for name, result in results.items()})
+        stored = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cases": dict(sorted(baselines.items())),
+        }
+        BASELINES.write_text(json.dumps(stored, indent=2) + "\n")
+        print(f"baselines written to {BASELINES}")
+    if args.compare:
+        regressions = compare(results, baselines, args.tolerance)
+        if regressions:
+            print(f"regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""Benchmark case registry.
+
+Each case is a zero-argument callable produced by a setup function, so fixture
+construction (encoding test images, writing temp files) is never timed.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import tempfile
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from intellioptics import IntelliOptics, _json
+from intellioptics._decode import construct_image_query
+from intellioptics._img import to_jpeg_bytes
+from intellioptics.client import _build_image_query_request, _normalize_image_query_payload, _serialize_model
+from intellioptics.models import Detector, FeedbackIn, ImageQuery
+
+from . import fixtures
+
+
+# A setup returns the callable to time, or ``None`` when an optional dependency is missing.
+Setup = Callable[[], Optional[Callable[[], Any]]]
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    setup: Setup
+
+
+CASES: list[Case] = []
+
+
+def case(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        CASES.append(Case(name, setup))
+        return setup
+
+    return register
+
+
+_tmpdir: tempfile.TemporaryDirectory[str] | None = None
+
+
+def _temp_file(name: str, data: bytes) -> Path:
+    global _tmpdir
+    if _tmpdir is None:
+        _tmpdir = tempfile.TemporaryDirectory(prefix="intellioptics-bench-")
+    path = Path(_tmpdir.name) / name
+    if not path.exists():
+        path.write_bytes(data)
+    return path
+
+
+# ----------------------------------------------------------------------
+# to_jpeg_bytes, per input type and size
+# ----------------------------------------------------------------------
+_IMAGE_INPUTS: dict[str, Callable[[str], Any]] = {
+    "jpeg-bytes": lambda size: fixtures.encoded(size, "JPEG"),
+    "png-bytes": lambda size: fixtures.encoded(size, "PNG"),
+    "pil": fixtures.pil_image,
+    "numpy": fixtures.numpy_frame,
+    "path": lambda size: str(_temp_file(f"{size}.jpg", fixtures.encoded(size, "JPEG"))),
+    # to_jpeg_bytes rewinds file-like inputs, so one stream serves every iteration.
+    "file": lambda size: BytesIO(fixtures.encoded(size, "JPEG")),
+}
+
+
+def _jpeg_setup(kind: str, size: str) -> Setup:
+    def setup() -> Callable[[], Any] | None:
+        image = _IMAGE_INPUTS[kind](size)
+        if image is None:
+            return None
+        return lambda: to_jpeg_bytes(image)
+
+    return setup
+
+
+for _size in fixtures.SIZES:
+    for _kind in _IMAGE_INPUTS:
+        CASES.append(Case(f"to_jpeg_bytes[{_kind}-{_size}]", _jpeg_setup(_kind, _size)))
+
+
+# ----------------------------------------------------------------------
+# Request building and response parsing
+# ----------------------------------------------------------------------
+@case("build_image_query_request[pil-720p]")
+def _build_request() -> Callable[[], Any]:
+    image = fixtures.pil_image("720p")
+    return lambda: _build_image_query_request(
+        "det_001",
+        image,
+        wait=10.0,
+        patience_time=None,
+        confidence_threshold=0.9,
+        human_review=None,
+        metadata={"camera": "cam-1", "line": 2},
+        inspection_id=None,
+        image_query_id=None,
+        want_async=False,
+        request_timeout=None,
+    )
+
+
+@case("normalize_image_query_payload")
+def _normalize() -> Callable[[], Any]:
+    payload = fixtures.image_query_payload(0, random.Random(fixtures.SEED))
+    return lambda: _normalize_image_query_payload(payload)
+
+
+@case("ImageQuery(**normalized)")
+def _construct() -> Callable[[], Any]:
+    normalized = _normalize_image_query_payload(fixtures.image_query_payload(0, random.Random(fixtures.SEED)))
+    return lambda: ImageQuery(**normalized)
+
+
+@case("construct_image_query(normalized)")
+def _construct_trusted() -> Callable[[], Any]:
+    normalized = _normalize_image_query_payload(fixtures.image_query_payload(0, random.Random(fixtures.SEED)))
+    return lambda: construct_image_query(normalized)
+
+
+def _parse_result_setup(kind: str, typed: bool) -> Setup:
+    def setup() -> Callable[[], Any]:
+        payload = fixtures.typed_image_query_payload(kind if typed else None, kind)
+        normalized = _normalize_image_query_payload(payload)
+        return lambda: ImageQuery(**normalized)
+
+    return setup
+
+
+for _kind in fixtures.RESULTS:
+    CASES.append(Case(f"parse_result[{_kind.lower()}]", _parse_result_setup(_kind, True)))
+    CASES.append(Case(f"parse_result[{_kind.lower()}-untyped]", _parse_result_setup(_kind, False)))
+
+
+class _StaticHttp:
+    def __init__(self, payload: Any) -> None:
+        self.payload = payload
+
+    def get_json(self, path: str, **_: Any) -> Any:
+        return self.payload
+
+
+def _list_setup(trusted: bool = False, raw: Any = False) -> Setup:
+    def setup() -> Callable[[], Any]:
+        client = IntelliOptics(
+            endpoint="http://bench.invalid", api_token="bench", trusted_responses=trusted, raw=raw
+        )
+        client._http = _StaticHttp(fixtures.image_query_page(1000))  # type: ignore[assignment]
+        return lambda: client.list_image_queries(page_size=1000)
+
+    return setup
+
+
+CASES.append(Case("list_image_queries[1000]", _list_setup()))
+CASES.append(Case("list_image_queries[1000-trusted]", _list_setup(trusted=True)))
+CASES.append(Case("list_image_queries[1000-raw]", _list_setup(raw=True)))
+CASES.append(Case("list_image_queries[1000-record]", _list_setup(raw="record")))
+
+
+class _StreamedBody:
+    """A ``requests`` response whose body arrives in 16 KiB chunks."""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def iter_content(self, chunk_size: int) -> Any:
+        return (self.body[start : start + chunk_size] for start in range(0, len(self.body), chunk_size))
+
+    def close(self) -> None:
+        pass
+
+
+def _stream_setup(first_only: bool) -> Setup:
+    def setup() -> Callable[[], Any]:
+        client = IntelliOptics(endpoint="http://bench.invalid", api_token="bench")
+        body = json.dumps(fixtures.image_query_page(1000)).encode()
+        client._http.request_raw = lambda *args, **kwargs: _StreamedBody(body)  # type: ignore[method-assign]
+        if first_only:
+            return lambda: next(iter(client.stream_image_queries(page_size=1000)))
+        return lambda: list(client.stream_image_queries(page_size=1000))
+
+    return setup
+
+
+CASES.append(Case("stream_image_queries[1000]", _stream_setup(first_only=False)))
+CASES.append(Case("stream_image_queries[1000-first-item]", _stream_setup(first_only=True)))
+
+
+# ----------------------------------------------------------------------
+# JSON codecs, per backend, on typical bodies
+# ----------------------------------------------------------------------
+_JSON_BODIES: dict[str, Callable[[], Any]] = {
+    "image_query_page-1000": lambda: fixtures.image_query_page(1000),
+    "detector_page-100": lambda: fixtures.detector_page(100),
+    "alert": fixtures.alert_payload,
+}
+
+
+def _json_setup(codec_name: str, body: str, decode: bool) -> Setup:
+    def setup() -> Callable[[], Any] | None:
+        if codec_name not in _json.available_codecs():
+            return None
+        codec = _json._resolve(codec_name)
+        document = _JSON_BODIES[body]()
+        if decode:
+            encoded = codec.dumps(document)
+            return lambda: codec.loads(encoded)
+        return lambda: codec.dumps(document)
+
+    return setup
+
+
+for _codec in ("json", "orjson", "msgspec"):
+    for _body in _JSON_BODIES:
+        CASES.append(Case(f"json_loads[{_body}-{_codec}]", _json_setup(_codec, _body, decode=True)))
+        CASES.append(Case(f"json_dumps[{_body}-{_codec}]", _json_setup(_codec, _body, decode=False)))
+
+
+@case("serialize_model[detector]")
+def _serialize_detector() -> Callable[[], Any]:
+    detector = Detector(
+        id="det_001",
+        name="door-open",
+        query="Is the door open?",
+        mode="BINARY",
+        metadata={"site": "plant-3"},
+    )
+    return lambda: _serialize_model(detector)
+
+
+@case("serialize_model[feedback]")
+def _serialize_feedback() -> Callable[[], Any]:
+    feedback = FeedbackIn(image_query_id="iq_000001", correct_label="YES", bboxes=[{"x": 1, "y": 2}])
+    return lambda: _serialize_model(feedback)
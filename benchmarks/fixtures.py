@@ -0,0 +1,160 @@
+"""Deterministic inputs for the benchmark cases.
+
+Everything is generated from a fixed seed so runs on different machines (and
+different SDK versions) measure exactly the same work.
+"""
+
+from __future__ import annotations
+
+import functools
+import random
+from io import BytesIO
+from typing import Any
+
+from PIL import Image
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - numpy is optional
+    np = None  # type: ignore[assignment]
+
+
+SEED = 20240607
+
+SIZES = {
+    "vga": (640, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+}
+
+_LABELS = ("YES", "NO", "UNCLEAR")
+
+
+@functools.lru_cache(maxsize=None)
+def pil_image(size: str) -> Image.Image:
+    """A camera-like frame: a smooth gradient with seeded sensor noise."""
+
+    width, height = SIZES[size]
+    rng = random.Random(f"{SEED}-{size}")
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.frombytes("L", (width, height), rng.randbytes(width * height))
+    return Image.merge(
+        "RGB", (gradient, Image.blend(gradient, noise, 0.15), noise.point(lambda value: value // 4))
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def encoded(size: str, fmt: str) -> bytes:
+    buffer = BytesIO()
+    pil_image(size).save(buffer, format=fmt, **({"quality": 90} if fmt == "JPEG" else {}))
+    return buffer.getvalue()
+
+
+def numpy_frame(size: str) -> Any:
+    if np is None:
+        return None
+    return np.asarray(pil_image(size))
+
+
+def image_query_payload(index: int, rng: random.Random) -> dict[str, Any]:
+    """A wire-format image query as the API returns it, with every optional block present."""
+
+    confidence = round(rng.random(), 4)
+    return {
+        "id": f"iq_{index:06d}",
+        "detector_id": f"det_{rng.randrange(50):03d}",
+        "created_at": f"2024-06-{1 + index % 28:02d}T12:{index % 60:02d}:00+00:00",
+        "status": "DONE" if confidence > 0.3 else "PENDING",
+        "done_processing": confidence > 0.3,
+        "answer": rng.choice(_LABELS),
+        "confidence": confidence,
+        "confidence_threshold": 0.9,
+        "patience_time": 30.0,
+        "result_type": "binary_classification",
+        "latency_ms": rng.randrange(20, 900),
+        "model_version": f"v{rng.randrange(1, 9)}",
+        "metadata": '{"camera": "cam-%d", "line": %d}' % (rng.randrange(16), rng.randrange(4)),
+        "result": {"label": rng.choice(_LABELS), "confidence": confidence, "source": "ALGORITHM"},
+    }
+
+
+# One wire-format ``result`` block per result type, keyed by the ``result_type`` the API sends.
+RESULTS: dict[str, dict[str, Any]] = {
+    "BINARY": {"label": "YES", "confidence": 0.93, "source": "ALGORITHM"},
+    "COUNTING": {"label": "person", "count": 4, "confidence": 0.88},
+    "MULTICLASS": {"label": "cat", "confidence": 0.81, "probabilities": {"cat": 0.81, "dog": 0.19}},
+    "TEXT": {"text": "ABC-1234", "confidence": 0.97, "spans": [{"start": 0, "end": 8}]},
+    "BOUNDING_BOX": {
+        "label": "helmet",
+        "confidence": 0.9,
+        "rois": [{"label": "helmet", "top_left": [0.1, 0.2], "bottom_right": [0.3, 0.4], "confidence": 0.9}],
+    },
+}
+
+
+def typed_image_query_payload(result_type: str | None, kind: str) -> dict[str, Any]:
+    """An image query carrying the ``kind`` result, labelled with ``result_type`` (or untyped)."""
+
+    payload = {"id": "iq_typed", "detector_id": "det_001", "status": "DONE", "result": dict(RESULTS[kind])}
+    if result_type is not None:
+        payload["result_type"] = result_type
+    return payload
+
+
+@functools.lru_cache(maxsize=None)
+def image_query_page(count: int) -> dict[str, Any]:
+    rng = random.Random(f"{SEED}-page-{count}")
+    return {
+        "count": count,
+        "next": None,
+        "previous": None,
+        "results": [image_query_payload(index, rng) for index in range(count)],
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def detector_page(count: int) -> dict[str, Any]:
+    rng = random.Random(f"{SEED}-detectors-{count}")
+    modes = ("BINARY", "COUNTING", "MULTI_CLASS")
+    return {
+        "count": count,
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "id": f"det_{index:04d}",
+                "name": f"station-{index}",
+                "query": "Is the guard rail in place?",
+                "group_name": f"line-{index % 7}",
+                "mode": modes[index % len(modes)],
+                "confidence_threshold": round(rng.uniform(0.5, 0.99), 2),
+                "patience_time": 30.0,
+                "metadata": {"site": "plant-3", "camera": f"cam-{rng.randint(1, 40)}"},
+                "status": "ON",
+                "type": "detector",
+                "created_at": "2024-06-01T12:00:00+00:00",
+            }
+            for index in range(count)
+        ],
+    }
+
+
+def alert_payload() -> dict[str, Any]:
+    return {
+        "name": "guard-rail-missing",
+        "detector_id": "det_0001",
+        "enabled": True,
+        "condition": {"verb": "CHANGED_TO", "parameters": {"label": "NO"}},
+        "action": [{"channel": "EMAIL", "recipient": "ops@example.com", "include_image": True}],
+        "webhook_action": [
+            {
+                "url": "https://hooks.example.com/alerts",
+                "include_image": False,
+                "payload_template": {"template": '{"detector": "{{ detector_name }}"}', "headers": {"X-Key": "k"}},
+            }
+        ],
+        "snooze_time_enabled": True,
+        "snooze_time_value": 15,
+        "snooze_time_unit": "MINUTES",
+        "human_review_required": False,
+    }
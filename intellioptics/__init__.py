@@ -1,4 +1,38 @@
+from ._circuit import CircuitBreaker, CircuitState
+from ._deadline import Timeouts, deadline
+from ._hedge import HedgePolicy
+from ._jsonstream import AsyncItemStream, ItemStream
+from ._live import AsyncLiveSubmitter, LiveSubmitter
+from ._metrics import MetricsRegistry
+from ._ratelimit import RateLimiter
+from ._scheduler import PRIORITY_CRITICAL, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, SubmissionScheduler
+from ._server import LocalServer
+from ._spool import SubmissionSpool
+from ._timing import OpenTelemetryExporter, RequestTiming
 from .client import AsyncIntelliOptics, ExperimentalApi, IntelliOptics
 
-__all__ = ["IntelliOptics", "AsyncIntelliOptics", "ExperimentalApi"]
-
+__all__ = [
+    "IntelliOptics",
+    "AsyncIntelliOptics",
+    "ExperimentalApi",
+    "LiveSubmitter",
+    "AsyncLiveSubmitter",
+    "SubmissionSpool",
+    "SubmissionScheduler",
+    "RateLimiter",
+    "CircuitBreaker",
+    "CircuitState",
+    "HedgePolicy",
+    "LocalServer",
+    "RequestTiming",
+    "ItemStream",
+    "AsyncItemStream",
+    "OpenTelemetryExporter",
+    "MetricsRegistry",
+    "Timeouts",
+    "deadline",
+    "PRIORITY_CRITICAL",
+    "PRIORITY_HIGH",
+    "PRIORITY_NORMAL",
+    "PRIORITY_LOW",
+]
@@ -0,0 +1,304 @@
+"""Load generator behind ``intellioptics bench``."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable
+
+from ._metrics import Histogram
+from ._timing import RequestTiming
+from .errors import IntelliOpticsClientError
+from .models import ImageQuery
+
+
+MODES = ("sync", "threads", "async")
+_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def load_corpus(
+    path: str | None = None, *, count: int = 8, size: tuple[int, int] = (640, 480), seed: int = 0
+) -> list[bytes]:
+    """Read the images under ``path`` (a file or directory), or synthesise ``count`` seeded frames."""
+
+    if path:
+        root = Path(path)
+        files = sorted(p for p in root.iterdir() if p.suffix.lower() in _IMAGE_SUFFIXES) if root.is_dir() else [root]
+        if not files:
+            raise ValueError(f"no images found in {path}")
+        return [file.read_bytes() for file in files]
+
+    from PIL import Image
+
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        frame = Image.frombytes("RGB", size, rng.randbytes(size[0] * size[1] * 3))
+        buffer = BytesIO()
+        frame.save(buffer, format="JPEG", quality=85)
+        corpus.append(buffer.getvalue())
+    return corpus
+
+
+@dataclass
+class BenchConfig:
+    """What to send and how: ``rate`` of ``0`` runs closed-loop (as fast as ``concurrency`` allows)."""
+
+    detector: str
+    images: list[bytes]
+    mode: str = "threads"
+    concurrency: int = 4
+    duration: float = 10.0
+    rate: float = 0.0
+    wait: float = 0.0
+    confident: bool = False
+    confidence_threshold: float | None = None
+    timeout: float = 30.0
+    poll_interval: float = 0.1
+
+    def __post_init__(self) -> None:
+        if self.mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        if not self.images:
+            raise ValueError("the image corpus is empty")
+        if self.mode == "sync":
+            self.concurrency = 1
+
+
+@dataclass
+class BenchReport:
+    """Results of one :func:`run_bench` call; latencies are in seconds."""
+
+    mode: str
+    concurrency: int
+    rate: float
+    elapsed: float = 0.0
+    requests: int = 0
+    errors: Counter = field(default_factory=Counter)
+    latency: Histogram = field(default_factory=Histogram)
+    time_to_confident: Histogram = field(default_factory=Histogram)
+    unconfident: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+    @property
+    def succeeded(self) -> int:
+        return self.requests - sum(self.errors.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        elapsed = self.elapsed or 1e-9
+        return {
+            "mode": self.mode,
+            "concurrency": self.concurrency,
+            "target_rate": self.rate or None,
+            "elapsed": self.elapsed,
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "throughput": self.succeeded / elapsed,
+            "latency": _quantiles(self.latency),
+            "time_to_confident": _quantiles(self.time_to_confident) if self.time_to_confident.count else None,
+            "unconfident": self.unconfident,
+            "errors": dict(self.errors),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "sent_bytes_per_second": self.bytes_sent / elapsed,
+            "received_bytes_per_second": self.bytes_received / elapsed,
+        }
+
+    def format_table(self) -> str:
+        data = self.as_dict()
+        rows = [
+            ("mode", f"{self.mode} x{self.concurrency}" + (f" @ {self.rate:g}/s" if self.rate else "")),
+            ("elapsed", f"{self.elapsed:.2f} s"),
+            ("requests", f"{self.requests} ({self.succeeded} ok)"),
+            ("throughput", f"{data['throughput']:.1f} req/s"),
+        ]
+        rows += [(f"latency {name}", f"{value * 1000:.1f} ms") for name, value in data["latency"].items()]
+        if data["time_to_confident"]:
+            rows += [
+                (f"confident {name}", f"{value * 1000:.1f} ms") for name, value in data["time_to_confident"].items()
+            ]
+            rows.append(("not confident", str(self.unconfident)))
+        rows.append(("sent", f"{_format_bytes(data['sent_bytes_per_second'])}/s"))
+        rows.append(("received", f"{_format_bytes(data['received_bytes_per_second'])}/s"))
+        for reason, count in sorted(self.errors.items(), key=lambda item: -item[1]):
+            rows.append((f"error {reason}", str(count)))
+        width = max(len(label) for label, _ in rows)
+        return "\n".join(f"{label:<{width}}  {value}" for label, value in rows)
+
+
+def _quantiles(histogram: Histogram) -> dict[str, float]:
+    return {
+        "p50": histogram.quantile(0.5),
+        "p95": histogram.quantile(0.95),
+        "p99": histogram.quantile(0.99),
+        "max": histogram.max if histogram.count else 0.0,
+    }
+
+
+def _format_bytes(value: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def _error_reason(exc: BaseException) -> str:
+    status = getattr(exc, "status_code", None)
+    if isinstance(exc, IntelliOpticsClientError) and status is not None:
+        return f"HTTP {status}"
+    return type(exc).__name__
+
+
+class _Recorder:
+    """Thread-safe sink for per-request outcomes and the transport's byte counts."""
+
+    def __init__(self, report: BenchReport) -> None:
+        self.report = report
+        self._lock = threading.Lock()
+
+    def on_request(self, timing: RequestTiming) -> None:
+        with self._lock:
+            self.report.bytes_sent += timing.request_bytes or 0
+            self.report.bytes_received += timing.response_bytes or 0
+
+    def success(self, latency: float, query: ImageQuery, confident_after: float | None, threshold: float | None) -> None:
+        with self._lock:
+            self.report.requests += 1
+            self.report.latency.record(latency)
+            if confident_after is None:
+                return
+            confidence = getattr(query.result, "confidence", None)
+            required = threshold if threshold is not None else query.confidence_threshold or 0.9
+            if confidence is not None and confidence >= required:
+                self.report.time_to_confident.record(confident_after)
+            else:
+                self.report.unconfident += 1
+
+    def failure(self, exc: BaseException) -> None:
+        with self._lock:
+            self.report.requests += 1
+            self.report.errors[_error_reason(exc)] += 1
+
+
+class _Pacer:
+    """Hand out send times: ``rate`` per second across all workers, or immediately when ``rate`` is 0."""
+
+    def __init__(self, rate: float, start: float, stop: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._start = start
+        self._stop = stop
+        self._slots = itertools.count()
+        self._lock = threading.Lock()
+
+    def next_slot(self) -> float | None:
+        with self._lock:
+            slot = self._start + next(self._slots) * self._interval
+        return slot if slot < self._stop and time.monotonic() < self._stop else None
+
+
+def run_bench(config: BenchConfig, client_factory: Callable[..., Any]) -> BenchReport:
+    """Drive ``config`` through clients built by ``client_factory(on_request=..., async_=...)``."""
+
+    report = BenchReport(mode=config.mode, concurrency=config.concurrency, rate=config.rate)
+    recorder = _Recorder(report)
+    started = time.monotonic()
+    if config.mode == "async":
+        asyncio.run(_run_async(config, client_factory, recorder))
+    else:
+        _run_threads(config, client_factory, recorder)
+    report.elapsed = time.monotonic() - started
+    return report
+
+
+def _run_threads(config: BenchConfig, client_factory: Callable[..., Any], recorder: _Recorder) -> None:
+    client = client_factory(on_request=recorder.on_request, async_=False)
+    images = itertools.cycle(config.images)
+    images_lock = threading.Lock()
+    start = time.monotonic()
+    pacer = _Pacer(config.rate, start, start + config.duration)
+
+    def worker() -> None:
+        while True:
+            slot = pacer.next_slot()
+            if slot is None:
+                return
+            delay = slot - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            with images_lock:
+                image = next(images)
+            began = time.monotonic()
+            try:
+                query = client.submit_image_query(
+                    config.detector, image, wait=config.wait, confidence_threshold=config.confidence_threshold
+                )
+                latency = time.monotonic() - began
+                confident_after = None
+                if config.confident:
+                    query = client.wait_for_confident_result(
+                        query,
+                        confidence_threshold=config.confidence_threshold or query.confidence_threshold or 0.9,
+                        timeout_sec=config.timeout,
+                        poll_interval=config.poll_interval,
+                    )
+                    confident_after = time.monotonic() - began
+            except Exception as exc:
+                recorder.failure(exc)
+                continue
+            recorder.success(latency, query, confident_after, config.confidence_threshold)
+
+    try:
+        with ThreadPoolExecutor(max_workers=config.concurrency, thread_name_prefix="intellioptics-bench") as pool:
+            for future in [pool.submit(worker) for _ in range(config.concurrency)]:
+                future.result()
+    finally:
+        client.close()
+
+
+async def _run_async(config: BenchConfig, client_factory: Callable[..., Any], recorder: _Recorder) -> None:
+    images = itertools.cycle(config.images)
+    start = time.monotonic()
+    pacer = _Pacer(config.rate, start, start + config.duration)
+
+    async with client_factory(on_request=recorder.on_request, async_=True) as client:
+
+        async def worker() -> None:
+            while True:
+                slot = pacer.next_slot()
+                if slot is None:
+                    return
+                delay = slot - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                image = next(images)
+                began = time.monotonic()
+                try:
+                    query = await client.submit_image_query(
+                        config.detector, image, wait=config.wait, confidence_threshold=config.confidence_threshold
+                    )
+                    latency = time.monotonic() - began
+                    confident_after = None
+                    if config.confident:
+                        query = await client.wait_for_confident_result(
+                            query,
+                            confidence_threshold=config.confidence_threshold or query.confidence_threshold or 0.9,
+                            timeout_sec=config.timeout,
+                            poll_interval=config.poll_interval,
+                        )
+                        confident_after = time.monotonic() - began
+                except Exception as exc:
+                    recorder.failure(exc)
+                    continue
+                recorder.success(latency, query, confident_after, config.confidence_threshold)
+
+        await asyncio.gather(*(worker() for _ in range(config.concurrency)))
@@ -0,0 +1,196 @@
+"""Circuit breaker for the HTTP layer."""
+
+from __future__ import annotations
+
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable
+
+from .errors import CircuitOpenError
+
+
+class CircuitState(str, Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+StateChangeCallback = Callable[["CircuitState", "CircuitState"], Any]
+
+
+class CircuitBreaker:
+    """Fail fast while the backend is unhealthy instead of waiting out every timeout.
+
+    The breaker opens after ``failure_threshold`` consecutive failures
+    (transport errors, timeouts or ``5xx`` responses). While open, requests are
+    rejected immediately with :class:`~intellioptics.errors.CircuitOpenError`
+    and a background thread probes ``/healthz`` every ``probe_interval``
+    seconds. Once a probe succeeds the breaker half-opens and lets
+    ``half_open_max_calls`` trial requests through; a successful trial closes it
+    again, a failed one re-opens it. Without a probe the breaker half-opens
+    after ``recovery_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        probe_interval: float = 5.0,
+        probe_timeout: float = 2.0,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        on_state_change: StateChangeCallback | None = None,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._callbacks: list[StateChangeCallback] = [on_state_change] if on_state_change else []
+
+        # Re-entrant so state-change callbacks may inspect the breaker.
+        self._lock = threading.RLock()
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._changed_at = time.time()
+        self._consecutive_failures = 0
+        self._half_open_calls = 0
+        self._epoch = 0  # bumped by every transition, so late releases cannot reach a newer half-open window
+        self._probe: Callable[[], bool] | None = None
+        self._probe_thread: threading.Thread | None = None
+        self._counters = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0, "probes": 0, "probe_failures": 0}
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if (
+                self._state is CircuitState.OPEN
+                and self._probe is None
+                and time.monotonic() - self._opened_at >= self.recovery_timeout
+            ):
+                self._transition(CircuitState.HALF_OPEN)
+            return self._state
+
+    def add_listener(self, callback: StateChangeCallback) -> None:
+        """Register ``callback(old_state, new_state)`` for every transition."""
+
+        self._callbacks.append(callback)
+
+    def attach_probe(self, probe: Callable[[], bool]) -> None:
+        """Use ``probe`` (returning ``True`` when healthy) to decide when to half-open."""
+
+        self._probe = probe
+
+    # ------------------------------------------------------------------
+    # Request bookkeeping
+    # ------------------------------------------------------------------
+    def before_request(self) -> int | None:
+        """Admit a request or raise :class:`CircuitOpenError`.
+
+        Returns a trial token when the request took a half-open trial slot, else
+        ``None``. A trial slot is freed by recording the request's outcome. A
+        request that ends without one (cancelled, or stopped by the caller's own
+        deadline) must hand its token back with :meth:`release_trial`.
+        """
+
+        state = self.state
+        with self._lock:
+            if state is CircuitState.OPEN or (
+                state is CircuitState.HALF_OPEN and self._half_open_calls >= self.half_open_max_calls
+            ):
+                self._counters["rejected"] += 1
+                raise CircuitOpenError("Circuit breaker is open; the IntelliOptics API is unhealthy")
+            if state is CircuitState.HALF_OPEN:
+                self._half_open_calls += 1
+                return self._epoch
+            return None
+
+    def release_trial(self, trial: int) -> None:
+        """Give back the slot behind ``trial`` for a request that ended without an outcome.
+
+        Tokens from an earlier half-open window are ignored; their slots went with it.
+        """
+
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN and trial == self._epoch and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._counters["successes"] += 1
+            self._consecutive_failures = 0
+            if self._state is CircuitState.HALF_OPEN:
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._counters["failures"] += 1
+            self._consecutive_failures += 1
+            if self._state is CircuitState.HALF_OPEN or (
+                self._state is CircuitState.CLOSED and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def record_status(self, status_code: int) -> None:
+        if status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    # ------------------------------------------------------------------
+    # Internals (called with the lock held)
+    # ------------------------------------------------------------------
+    def _transition(self, new_state: CircuitState) -> None:
+        old_state = self._state
+        if old_state is new_state:
+            return
+        self._state = new_state
+        self._changed_at = time.time()
+        self._half_open_calls = 0
+        self._epoch += 1
+        for callback in list(self._callbacks):
+            try:
+                callback(old_state, new_state)
+            except Exception:  # pragma: no cover - callbacks must not break requests
+                pass
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._counters["opened"] += 1
+        self._transition(CircuitState.OPEN)
+        if self._probe is not None and (self._probe_thread is None or not self._probe_thread.is_alive()):
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="intellioptics-healthz-probe", daemon=True)
+            self._probe_thread.start()
+
+    def _probe_loop(self) -> None:
+        while True:
+            time.sleep(self.probe_interval)
+            with self._lock:
+                if self._state is not CircuitState.OPEN or self._probe is None:
+                    return
+                probe = self._probe
+            try:
+                healthy = bool(probe())
+            except Exception:
+                healthy = False
+            with self._lock:
+                self._counters["probes"] += 1
+                if not healthy:
+                    self._counters["probe_failures"] += 1
+                    continue
+                if self._state is CircuitState.OPEN:
+                    self._transition(CircuitState.HALF_OPEN)
+                return
+
+    def metrics(self) -> dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state.value,
+                "consecutive_failures": self._consecutive_failures,
+                "last_state_change": self._changed_at,
+                **self._counters,
+            }
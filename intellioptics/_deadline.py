@@ -0,0 +1,102 @@
+"""End-to-end deadlines and per-phase HTTP timeouts."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Iterator, Union
+
+import httpx
+
+
+@dataclass(frozen=True)
+class Timeouts:
+    """Per-phase HTTP timeouts in seconds.
+
+    ``requests`` only distinguishes ``connect`` and ``read``; ``write`` and
+    ``pool`` are honoured by the async (``httpx``) transport.
+    """
+
+    connect: float = 30.0
+    read: float = 30.0
+    write: float = 30.0
+    pool: float = 30.0
+
+    @classmethod
+    def coerce(cls, value: Union[float, "Timeouts"]) -> "Timeouts":
+        if isinstance(value, Timeouts):
+            return value
+        seconds = float(value)
+        return cls(connect=seconds, read=seconds, write=seconds, pool=seconds)
+
+    def clipped(self, budget: float | None) -> "Timeouts":
+        """Return a copy where no phase exceeds ``budget`` seconds."""
+
+        if budget is None:
+            return self
+        return replace(
+            self,
+            connect=min(self.connect, budget),
+            read=min(self.read, budget),
+            write=min(self.write, budget),
+            pool=min(self.pool, budget),
+        )
+
+    def longest(self) -> float:
+        return max(self.connect, self.read, self.write, self.pool)
+
+    def for_requests(self) -> tuple[float, float]:
+        return (self.connect, self.read)
+
+    def for_httpx(self) -> httpx.Timeout:
+        return httpx.Timeout(connect=self.connect, read=self.read, write=self.write, pool=self.pool)
+
+
+class Deadline:
+    """A point in (monotonic) time by which an operation must finish."""
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, seconds: float) -> None:
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar("intellioptics_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """Bound every SDK call made inside the block to ``seconds`` in total.
+
+    Deadlines nest: an inner block can only shorten the budget of an outer one.
+    The budget follows the current thread or asyncio task via :mod:`contextvars`.
+    """
+
+    candidate = Deadline(seconds)
+    outer = _current_deadline.get()
+    active = outer if outer is not None and outer.expires_at <= candidate.expires_at else candidate
+    token = _current_deadline.set(active)
+    try:
+        yield active
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+def remaining_budget() -> float | None:
+    """Seconds left on the active deadline, or ``None`` when no deadline is set."""
+
+    active = _current_deadline.get()
+    return None if active is None else active.remaining()
@@ -0,0 +1,219 @@
+"""Trusted fast path for turning normalized image query payloads into models.
+
+``ImageQuery(**data)`` validates every field of every query. For responses
+from the IntelliOptics API the flat fields already have their final types, so
+:func:`construct_image_query` only validates the nested parts (``result``,
+``rois``, ``created_at``) and assembles the model the way ``model_construct``
+does. The result is identical to full validation; any value outside the
+expected shapes falls back to it, so malformed payloads still raise the usual
+:class:`pydantic.ValidationError`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Mapping, get_args
+
+from pydantic import BaseModel, ValidationError
+
+from .models import ImageQuery, PaginatedImageQueryList, _result_model_for
+
+try:  # pragma: no cover - pydantic v2
+    from pydantic import TypeAdapter
+except ImportError:  # pragma: no cover - pydantic v1 fallback
+    TypeAdapter = None  # type: ignore[assignment,misc]
+
+
+class _Fallback(Exception):
+    """A value only full validation can handle."""
+
+
+def _exact(*types: type) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        if type(value) in types:
+            return value
+        raise _Fallback
+
+    return convert
+
+
+def _float(value: Any) -> float:
+    kind = type(value)
+    if kind is float:
+        return value
+    if kind is int:
+        return float(value)
+    raise _Fallback
+
+
+def _patience_time(value: Any) -> float:
+    value = _float(value)
+    if not 0.0 <= value <= 3600.0:
+        raise _Fallback
+    return value
+
+
+def _metadata(value: Any) -> dict[str, Any]:
+    if type(value) is not dict or not all(type(key) is str for key in value):
+        raise _Fallback
+    return dict(value)
+
+
+def _adapted(field: str, *types: type) -> Callable[[Any], Any]:
+    adapter = TypeAdapter(ImageQuery.model_fields[field].annotation)
+
+    def convert(value: Any) -> Any:
+        if type(value) not in types:
+            raise _Fallback
+        return adapter.validate_python(value)
+
+    return convert
+
+
+def _nests_models(annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_nests_models(arg) for arg in get_args(annotation))
+
+
+class _ResultConverter:
+    """Validate a ``result`` block against the union member smart-mode validation would pick.
+
+    When ``result_type`` (or the detector mode) names a model, that model is
+    used, as :class:`ImageQuery` does. Otherwise the first payload of each key
+    layout goes through the full union and the member pydantic chose is
+    remembered, but only when that choice cannot depend on the values: smart
+    mode ranks members by fields set, nested models included, so the member
+    must set more top-level fields than any other member could set for the
+    layout. Ties, layouts where another member has nested models in play, and
+    payloads the remembered member rejects all use the full union.
+    """
+
+    _MAX_LAYOUTS = 256
+
+    def __init__(self) -> None:
+        annotation = ImageQuery.model_fields["result"].annotation
+        self._union = TypeAdapter(annotation)
+        members = [member for member in annotation.__args__ if member is not type(None)]
+        self._members = [
+            (
+                member,
+                frozenset(member.model_fields),
+                frozenset(name for name, field in member.model_fields.items() if _nests_models(field.annotation)),
+            )
+            for member in members
+        ]
+        # layout -> validator of the member the union always picks, or None for "ask the union".
+        self._layouts: dict[tuple[str, ...], Any] = {}
+
+    def _dominant(self, layout: tuple[str, ...], chosen: type) -> Any:
+        keys = frozenset(layout)
+        floor = 0
+        ceiling = 0
+        for member, names, nesting in self._members:
+            if member is chosen:
+                floor = len(keys & names)
+            elif keys & nesting:
+                return None  # nested fields set make this member's rank value-dependent
+            else:
+                ceiling = max(ceiling, len(keys & names))
+        return chosen.__pydantic_validator__ if floor > ceiling else None
+
+    def __call__(self, value: Any, model: Any = None) -> Any:
+        if type(value) is not dict:
+            raise _Fallback
+        if model is not None:
+            try:
+                return model.__pydantic_validator__.validate_python(value)
+            except ValidationError:
+                pass
+        layout = tuple(value)
+        if layout in self._layouts:
+            validator = self._layouts[layout]
+            if validator is not None:
+                try:
+                    return validator.validate_python(value)
+                except ValidationError:
+                    pass
+            return self._union.validate_python(value)
+        result = self._union.validate_python(value)
+        if len(self._layouts) < self._MAX_LAYOUTS:
+            self._layouts[layout] = self._dominant(layout, type(result))
+        return result
+
+
+_converters: dict[str, Callable[..., Any]] | None = None
+_defaults: dict[str, Any] = {}
+_private: dict[str, Any] = {}
+
+
+def _field_converters() -> dict[str, Callable[..., Any]]:
+    global _converters
+    if _converters is None:
+        _converters = {
+            "id": _exact(str),
+            "detector_id": _exact(str),
+            "confidence_threshold": _float,
+            "patience_time": _patience_time,
+            "created_at": _adapted("created_at", str),
+            "done_processing": _exact(bool),
+            "metadata": _metadata,
+            "query": _exact(str),
+            "result": _ResultConverter(),
+            "result_type": _exact(str),
+            "rois": _adapted("rois", list),
+            "text": _exact(str),
+            "type": _exact(str),
+            "status": _exact(str),
+        }
+        # Field order matters for ``__dict__``; ``id`` is always supplied by the caller.
+        _defaults.update(
+            (name, None if field.is_required() else field.get_default())
+            for name, field in ImageQuery.model_fields.items()
+        )
+        _private.update((name, attr.get_default()) for name, attr in ImageQuery.__private_attributes__.items())
+    return _converters
+
+
+def _assemble(fields: dict[str, Any]) -> ImageQuery:
+    # What ``model_construct`` does, minus its per-field loop over aliases and defaults.
+    values = dict(_defaults)
+    values.update(fields)
+    query = ImageQuery.__new__(ImageQuery)
+    object.__setattr__(query, "__dict__", values)
+    object.__setattr__(query, "__pydantic_fields_set__", set(fields))
+    object.__setattr__(query, "__pydantic_extra__", {})
+    object.__setattr__(query, "__pydantic_private__", dict(_private))
+    return query
+
+
+def construct_image_query(data: Mapping[str, Any], mode: Any = None) -> ImageQuery:
+    """Build the same :class:`ImageQuery` as ``ImageQuery(**data)`` with minimal validation.
+
+    ``data`` is the output of ``_normalize_image_query_payload``; ``mode`` is
+    the detector mode, used like the ``mode`` validation context of
+    :class:`ImageQuery`.
+    """
+
+    if TypeAdapter is None or "id" not in data:
+        return ImageQuery(**data)
+    converters = _field_converters()
+    try:
+        fields = {key: converters[key](value) for key, value in data.items() if key != "result"}
+        if "result" in data:
+            model = _result_model_for(data.get("result_type")) or _result_model_for(mode)
+            fields["result"] = converters["result"](data["result"], model)
+    except (KeyError, _Fallback, ValidationError):
+        return ImageQuery(**data)
+    return _assemble(fields)
+
+
+def construct_image_query_page(
+    count: Any, next: Any, previous: Any, results: list[ImageQuery]
+) -> PaginatedImageQueryList:
+    """Assemble a page around already-built queries; falls back to validation for odd envelopes."""
+
+    if TypeAdapter is None or type(count) is not int or not all(
+        value is None or type(value) is str for value in (next, previous)
+    ):
+        return PaginatedImageQueryList(count=count, next=next, previous=previous, results=results)
+    return PaginatedImageQueryList.model_construct(count=count, next=next, previous=previous, results=results)
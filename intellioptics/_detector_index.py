@@ -0,0 +1,113 @@
+"""Name to detector index behind ``get_detector_by_name`` and ``get_or_create_detector``.
+
+Looking a detector up by name used to walk the detector list one page at a
+time. The index is instead filled from one concurrent listing (see
+:func:`~intellioptics._paging.fetch_all`) and answers lookups from memory
+until it is ``ttl`` seconds old or refreshed on demand. Detectors the client
+creates are added as they are created; deleted or edited ones are dropped so
+the next lookup re-lists.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Iterable, Mapping
+
+DEFAULT_TTL = 300.0
+
+
+class DetectorIndex:
+    """Thread-safe ``name -> detector dict`` map with a time-to-live.
+
+    ``ttl=None`` keeps the index until :meth:`invalidate` is called; ``ttl=0``
+    re-lists on every lookup. Only one refresh runs at a time: callers that
+    arrive while another thread (or task) refreshes wait for it and reuse its
+    result instead of listing again.
+    """
+
+    def __init__(self, ttl: float | None = DEFAULT_TTL, *, clock: Callable[[], float] = time.monotonic) -> None:
+        if ttl is not None and ttl < 0:
+            raise ValueError("ttl must be zero or more, or None")
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._async_refresh_lock: asyncio.Lock | None = None
+        self._by_name: dict[str, dict[str, Any]] = {}
+        self._loaded_at: float | None = None
+        self._generation = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_name)
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every :meth:`replace`; lets a caller tell whether a refresh happened while it waited."""
+
+        return self._generation
+
+    def is_fresh(self) -> bool:
+        with self._lock:
+            return self._is_fresh()
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return self.ttl is None or self._clock() - self._loaded_at < self.ttl
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        """The detector called ``name``, or ``None``; check :meth:`is_fresh` first."""
+
+        with self._lock:
+            return self._by_name.get(name)
+
+    def replace(self, detectors: Iterable[Any]) -> int:
+        """Swap the contents for a complete listing and restart the TTL; returns the detector count.
+
+        When several detectors share a name the first in listing order wins, as
+        with the page-by-page scan this index replaces.
+        """
+
+        by_name: dict[str, dict[str, Any]] = {}
+        for item in detectors:
+            if isinstance(item, Mapping) and "name" in item:
+                by_name.setdefault(item["name"], dict(item))
+        with self._lock:
+            self._by_name = by_name
+            self._loaded_at = self._clock()
+            self._generation += 1
+        return len(by_name)
+
+    def add(self, detector: Mapping[str, Any]) -> None:
+        name = detector.get("name")
+        if name is None:
+            return
+        with self._lock:
+            self._by_name.setdefault(name, dict(detector))
+
+    def discard(self, detector_id: str) -> None:
+        """Drop the detector with ``detector_id``; looking its name up again then re-lists."""
+
+        with self._lock:
+            self._by_name = {name: item for name, item in self._by_name.items() if item.get("id") != detector_id}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    # ------------------------------------------------------------------
+    # Refresh coordination
+    # ------------------------------------------------------------------
+    @property
+    def refresh_lock(self) -> threading.Lock:
+        return self._refresh_lock
+
+    @property
+    def async_refresh_lock(self) -> asyncio.Lock:
+        # Created lazily so the lock binds to the loop that first refreshes.
+        if self._async_refresh_lock is None:
+            self._async_refresh_lock = asyncio.Lock()
+        return self._async_refresh_lock
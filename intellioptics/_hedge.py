@@ -0,0 +1,236 @@
+"""Hedged requests for idempotent reads."""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Awaitable, Callable, Deque, TypeVar
+
+
+T = TypeVar("T")
+
+_BUDGET_BURST = 10.0
+
+
+def is_retryable_status(status_code: int | None) -> bool:
+    """``True`` for throttling and server-side statuses (``408``, ``429``, ``5xx``)."""
+
+    return status_code is not None and (status_code in (408, 429) or status_code >= 500)
+
+
+class HedgePolicy:
+    """Decide when a slow idempotent request gets a duplicate.
+
+    Latencies are tracked per endpoint class. Once ``min_samples`` have been
+    observed, a request still outstanding after the class's ``quantile``
+    latency is sent a second time; the first successful answer wins and the
+    other attempt is cancelled (or its response discarded). A throttling or
+    server-error response only wins once the other attempt has failed too. ``budget`` caps
+    hedges to that fraction of requests, so a uniformly slow backend sees at
+    most ``budget`` extra load. One policy may be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        *,
+        quantile: float = 0.95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 512,
+        min_delay: float = 0.0,
+        max_delay: float | None = None,
+    ) -> None:
+        if not 0 < quantile < 1:
+            raise ValueError("quantile must be between 0 and 1")
+        if not 0 <= budget <= 1:
+            raise ValueError("budget must be between 0 and 1")
+        self.quantile = quantile
+        self.budget = budget
+        self.min_samples = max(1, min_samples)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._window = window
+        self._lock = threading.Lock()
+        self._samples: dict[str, Deque[float]] = {}
+        self._tokens = 0.0
+        self._counters = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+
+    def hedge_delay(self, key: str) -> float | None:
+        """Seconds to wait before hedging a ``key`` request, or ``None`` while still learning."""
+
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        delay = max(self.min_delay, ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))])
+        return delay if self.max_delay is None else min(delay, self.max_delay)
+
+    def stats(self) -> dict[str, Any]:
+        """Return request/hedge counters, hedge and win rates, and current delays."""
+
+        with self._lock:
+            keys = list(self._samples)
+            counters = dict(self._counters)
+        requests, hedged = counters["requests"], counters["hedged"]
+        return {
+            **counters,
+            "hedge_rate": hedged / requests if requests else 0.0,
+            "win_rate": counters["hedge_wins"] / hedged if hedged else 0.0,
+            "delay": {key: self.hedge_delay(key) for key in keys},
+        }
+
+    # ------------------------------------------------------------------
+    # Bookkeeping used by the hedged call helpers
+    # ------------------------------------------------------------------
+    def _begin(self, key: str) -> float | None:
+        with self._lock:
+            self._counters["requests"] += 1
+            self._tokens = min(_BUDGET_BURST, self._tokens + self.budget)
+        return self.hedge_delay(key)
+
+    def _try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def _refund(self) -> None:
+        with self._lock:
+            self._tokens += 1.0
+
+    def _observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = collections.deque(maxlen=self._window)
+            samples.append(seconds)
+
+    def _finish(self, hedged: bool, hedge_won: bool) -> None:
+        if not hedged:
+            return
+        with self._lock:
+            self._counters["hedged"] += 1
+            if hedge_won:
+                self._counters["hedge_wins"] += 1
+
+
+def _timed(policy: HedgePolicy, key: str, send: Callable[[], T]) -> T:
+    started = time.monotonic()
+    result = send()
+    policy._observe(key, time.monotonic() - started)
+    return result
+
+
+def hedged_call(
+    policy: HedgePolicy,
+    key: str,
+    send: Callable[[], T],
+    *,
+    executor: Executor,
+    can_hedge: Callable[[], bool] = lambda: True,
+    discard: Callable[[T], Any] | None = None,
+    usable: Callable[[T], bool] = lambda result: True,
+) -> T:
+    """Run ``send`` and, if it is slow, a duplicate on ``executor``; return the first success.
+
+    A result for which ``usable`` is false (say a ``503``) does not count as a
+    success while the other attempt is still running; if neither attempt
+    succeeds, a returned result is preferred over an exception, the primary's
+    over the hedge's. ``requests`` cannot abort an in-flight call, so the
+    losing attempt is left to finish in the background and its result is
+    handed to ``discard``.
+    """
+
+    delay = policy._begin(key)
+    if delay is None:
+        return _timed(policy, key, send)
+
+    primary = executor.submit(_timed, policy, key, send)
+    done, _ = wait([primary], timeout=delay)
+    if done or not policy._try_spend():
+        return primary.result()
+    if not can_hedge():
+        policy._refund()
+        return primary.result()
+
+    hedge = executor.submit(_timed, policy, key, send)
+    pending: set[Future[T]] = {primary, hedge}
+    winner: Future[T] | None = None
+    while pending and winner is None:
+        _, pending = wait(pending, return_when=FIRST_COMPLETED)
+        winner = _pick(primary, hedge, usable, settled=not pending)
+
+    policy._finish(True, winner is hedge and usable(hedge.result()))
+    if winner is None:
+        return primary.result()  # both raised; surface the original error
+    loser = hedge if winner is primary else primary
+    if discard is not None:
+        loser.add_done_callback(lambda attempt: attempt.exception() is None and discard(attempt.result()))
+    return winner.result()
+
+
+def _pick(primary: Any, hedge: Any, usable: Callable[[Any], bool], *, settled: bool) -> Any:
+    """The attempt to return, or ``None`` to keep waiting (or when both raised)."""
+
+    finished = [
+        attempt
+        for attempt in (primary, hedge)
+        if attempt.done() and not attempt.cancelled() and attempt.exception() is None
+    ]
+    for attempt in finished:
+        if usable(attempt.result()):
+            return attempt
+    # Only settle for a throttled or failed response once nothing better can arrive.
+    return finished[0] if settled and finished else None
+
+
+async def _timed_async(policy: HedgePolicy, key: str, send: Callable[[], Awaitable[T]]) -> T:
+    started = time.monotonic()
+    result = await send()
+    policy._observe(key, time.monotonic() - started)
+    return result
+
+
+async def hedged_call_async(
+    policy: HedgePolicy,
+    key: str,
+    send: Callable[[], Awaitable[T]],
+    *,
+    can_hedge: Callable[[], bool] = lambda: True,
+    usable: Callable[[T], bool] = lambda result: True,
+) -> T:
+    """Async :func:`hedged_call`; the losing attempt is cancelled outright."""
+
+    delay = policy._begin(key)
+    if delay is None:
+        return await _timed_async(policy, key, send)
+
+    primary = asyncio.ensure_future(_timed_async(policy, key, send))
+    hedge: asyncio.Future[T] | None = None
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not policy._try_spend():
+            return await primary
+        if not can_hedge():
+            policy._refund()
+            return await primary
+
+        hedge = asyncio.ensure_future(_timed_async(policy, key, send))
+        pending = {primary, hedge}
+        while pending:
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = _pick(primary, hedge, usable, settled=not pending)
+            if winner is not None:
+                policy._finish(True, winner is hedge and usable(winner.result()))
+                return winner.result()
+        policy._finish(True, False)
+        return primary.result()
+    finally:
+        for attempt in (primary, hedge):
+            if attempt is not None and not attempt.done():
+                attempt.cancel()
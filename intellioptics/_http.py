@@ -2,15 +2,125 @@
 
 from __future__ import annotations
 
+import asyncio
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Any, Iterable, Mapping, MutableMapping
+from urllib.parse import urlsplit
 
 import httpx
 import requests
-
-from .errors import IntelliOpticsClientError
+from requests.adapters import HTTPAdapter
+
+from ._circuit import CircuitBreaker
+from ._deadline import Timeouts, remaining_budget
+from . import _json
+from ._hedge import HedgePolicy, hedged_call, hedged_call_async, is_retryable_status
+from ._jsonstream import AsyncItemStream, ItemStream
+from ._metrics import MetricsRegistry
+from ._ratelimit import RateLimiter, classify_request
+from ._timing import (
+    RequestHook,
+    instrument_adapter,
+    instrument_send,
+    instrument_send_async,
+    make_traceparent,
+    request_hook,
+)
+from ._transport import UnixSocketAdapter, split_unix_endpoint
+from .errors import DeadlineExceeded, IntelliOpticsClientError
 
 
 _DEFAULT_TIMEOUT = 30.0
+_HEDGE_WORKERS = 32
+_HEALTH_PATH = "/healthz"
+_STREAM_CHUNK = 16 * 1024
+
+
+def _resolve_rate_limiter(rate_limiter: RateLimiter | Mapping[str, float] | None) -> RateLimiter | None:
+    if rate_limiter is None or isinstance(rate_limiter, RateLimiter):
+        return rate_limiter
+    return RateLimiter(rate_limiter)
+
+
+def _budgeted_timeouts(timeouts: Timeouts, method: str, path: str) -> tuple[Timeouts, bool]:
+    """Clip ``timeouts`` to the active deadline; the flag reports whether clipping happened."""
+
+    budget = remaining_budget()
+    if budget is None:
+        return timeouts, False
+    if budget <= 0:
+        raise DeadlineExceeded(f"{method.upper()} {path} not sent: deadline exceeded")
+    return timeouts.clipped(budget), budget < timeouts.longest()
+
+
+def _limiter_budget(method: str, path: str) -> float | None:
+    """How long a rate-limit wait may take under the active deadline; raises once it has run out."""
+
+    budget = remaining_budget()
+    if budget is not None and budget <= 0:
+        raise DeadlineExceeded(f"{method.upper()} {path} not sent: deadline exceeded")
+    return budget
+
+
+def _record_outcome(
+    rate_limiter: RateLimiter | None,
+    circuit_breaker: CircuitBreaker | None,
+    method: str,
+    path: str,
+    status_code: int,
+    headers: Mapping[str, str],
+) -> None:
+    if rate_limiter is not None:
+        rate_limiter.record(method, path, status_code, headers.get("Retry-After"))
+    if circuit_breaker is not None:
+        circuit_breaker.record_status(status_code)
+
+
+def _hedge_gate(rate_limiter: RateLimiter | None, method: str, path: str):
+    if rate_limiter is None:
+        return lambda: True
+    return lambda: rate_limiter.try_acquire(method, path)
+
+
+def _usable_response(response: requests.Response | httpx.Response) -> bool:
+    # A fast 503 or 429 from one hedged attempt must not beat a slower 200 from the other.
+    return not is_retryable_status(response.status_code)
+
+
+def _resolve_host(base_url: str) -> tuple[str, int] | None:
+    parts = urlsplit(base_url)
+    if not parts.hostname:
+        return None
+    return parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)
+
+
+def _combine_hooks(on_request: RequestHook | None, metrics: MetricsRegistry | None) -> RequestHook | None:
+    if metrics is None:
+        return on_request
+    if on_request is None:
+        return metrics.record_request
+
+    def hook(timing):  # type: ignore[no-untyped-def]
+        metrics.record_request(timing)
+        on_request(timing)
+
+    return hook
+
+
+def _encode_json_body(kwargs: dict[str, Any], headers: MutableMapping[str, str], field: str) -> None:
+    """Move a ``json=`` body into ``field``, encoded with the SDK codec instead of the transport's.
+
+    Like the transports' own ``json=`` handling, ``NaN`` and infinities raise :class:`ValueError`.
+    """
+
+    if kwargs.get("json") is None or kwargs.get(field) is not None or kwargs.get("files") is not None:
+        return  # nothing to encode, or a form body the transport combines on its own
+    kwargs[field] = _json.dumps_strict(kwargs.pop("json"))
+    if not any(key.lower() == "content-type" for key in headers):
+        headers["Content-Type"] = "application/json"
 
 
 def _build_url(base: str, path: str) -> str:
@@ -30,17 +140,41 @@ class HttpClient:
         api_token: str,
         *,
         verify: bool = True,
-        timeout: float = _DEFAULT_TIMEOUT,
+        timeout: float | Timeouts = _DEFAULT_TIMEOUT,
+        rate_limiter: RateLimiter | Mapping[str, float] | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        transport: HTTPAdapter | None = None,
+        on_request: RequestHook | None = None,
+        traceparent: bool = False,
+        metrics: MetricsRegistry | None = None,
     ) -> None:
         if not base_url:
             raise IntelliOpticsClientError("Missing INTELLIOPTICS_ENDPOINT")
 
-        self.base = base_url.rstrip("/")
+        self.base, self.socket_path = split_unix_endpoint(base_url)
         self.verify = verify
         self.timeout = timeout
+        self._timeouts = Timeouts.coerce(timeout)
+        self.rate_limiter = _resolve_rate_limiter(rate_limiter)
+        self.circuit_breaker = circuit_breaker
+        self.hedge_policy = hedge_policy
+        self.on_request = _combine_hooks(on_request, metrics)
+        self.traceparent = traceparent
+        self._hedge_executor: ThreadPoolExecutor | None = None
+        self._keepalive_stop: threading.Event | None = None
         self._session = requests.Session()
         self._session.headers.update({"Authorization": f"Bearer {api_token}"})
         self.headers = self._session.headers
+        if transport is None and self.socket_path is not None:
+            transport = UnixSocketAdapter(self.socket_path)
+        if transport is not None:
+            self._session.mount(self.base + "/", transport)
+        # Timed connections only record while a request hook is active, so this is cheap to keep on.
+        for adapter in self._session.adapters.values():
+            instrument_adapter(adapter)
+        if circuit_breaker is not None:
+            circuit_breaker.attach_probe(self._probe_health)
 
     # ------------------------------------------------------------------
     # Low level helpers
@@ -51,28 +185,189 @@ class HttpClient:
             combined.update(headers)
         return combined
 
+    def _probe_health(self) -> bool:
+        timeout = self.circuit_breaker.probe_timeout if self.circuit_breaker is not None else self._timeouts.connect
+        response = self._session.get(_build_url(self.base, _HEALTH_PATH), timeout=timeout, verify=self.verify)
+        return response.ok
+
+    # ------------------------------------------------------------------
+    # Connection warm-up
+    # ------------------------------------------------------------------
+    def warmup(self, connections: int = 1, *, keepalive_interval: float | None = None) -> int:
+        """Resolve the host and open ``connections`` pooled keep-alive connections.
+
+        Each connection is established by a concurrent ``GET /healthz`` so the
+        DNS, TCP and TLS cost is paid before the first real request. With
+        ``keepalive_interval`` a background thread repeats the pings so idle
+        connections are not reaped by load balancers. Returns the number of
+        successful pings.
+        """
+
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
+        target = _resolve_host(self.base) if self.socket_path is None else None
+        if target is not None:
+            try:
+                socket.getaddrinfo(*target, type=socket.SOCK_STREAM)
+            except OSError:
+                pass
+        self._ensure_pool_size(connections)
+        warmed = self._ping(connections)
+        if keepalive_interval is not None:
+            self._start_keepalive(connections, keepalive_interval)
+        return warmed
+
+    def _ensure_pool_size(self, connections: int) -> None:
+        url = self.base + "/"
+        adapter = self._session.get_adapter(url)
+        if type(adapter) not in (HTTPAdapter, UnixSocketAdapter) or adapter._pool_maxsize >= connections:
+            return  # custom transports manage their own pools
+        # requests routes by the longest matching prefix, so replace the adapter under that prefix.
+        prefix = max(
+            (mounted for mounted, candidate in self._session.adapters.items()
+             if candidate is adapter and url.lower().startswith(mounted.lower())),
+            key=len,
+        )
+        settings = {
+            "pool_connections": adapter._pool_connections,
+            "pool_maxsize": connections,
+            "max_retries": adapter.max_retries,
+            "pool_block": adapter._pool_block,
+        }
+        if isinstance(adapter, UnixSocketAdapter):
+            replacement: HTTPAdapter = UnixSocketAdapter(adapter.socket_path, **settings)
+        else:
+            replacement = HTTPAdapter(**settings)
+        instrument_adapter(replacement)
+        self._session.mount(prefix, replacement)
+        if all(mounted is not adapter for mounted in self._session.adapters.values()):
+            adapter.close()  # release the smaller pool's sockets
+
+    def _ping(self, connections: int) -> int:
+        def ping() -> bool:
+            try:
+                response = self._session.get(
+                    _build_url(self.base, _HEALTH_PATH), timeout=self._timeouts.for_requests(), verify=self.verify
+                )
+            except requests.RequestException:
+                return False
+            response.close()
+            return response.ok
+
+        if connections == 1:
+            return int(ping())
+        with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="intellioptics-warmup") as executor:
+            return sum(executor.map(lambda _: ping(), range(connections)))
+
+    def _start_keepalive(self, connections: int, interval: float) -> None:
+        self.stop_keepalive()
+        stop = self._keepalive_stop = threading.Event()
+
+        def loop() -> None:
+            while not stop.wait(interval):
+                self._ping(connections)
+
+        threading.Thread(target=loop, name="intellioptics-keepalive", daemon=True).start()
+
+    def stop_keepalive(self) -> None:
+        if self._keepalive_stop is not None:
+            self._keepalive_stop.set()
+            self._keepalive_stop = None
+
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=_HEDGE_WORKERS, thread_name_prefix="intellioptics-hedge")
+        return self._hedge_executor
+
     def request_raw(
         self,
         method: str,
         path: str,
         *,
         headers: Mapping[str, str] | None = None,
+        stream: bool = False,
         **kwargs: Any,
     ) -> requests.Response:
         url = _build_url(self.base, path)
-        response = self._session.request(
+        trial = self.circuit_breaker.before_request() if self.circuit_breaker is not None else None
+        try:
+            return self._send(method, path, url, headers, stream, kwargs)
+        finally:
+            # Exits that recorded no outcome (cancellation, deadline, hook errors) must not keep the slot.
+            if trial is not None:
+                self.circuit_breaker.release_trial(trial)
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        url: str,
+        headers: Mapping[str, str] | None,
+        stream: bool,
+        kwargs: dict[str, Any],
+    ) -> requests.Response:
+        if self.rate_limiter is not None and not self.rate_limiter.acquire(
+            method, path, timeout=_limiter_budget(method, path)
+        ):
+            raise DeadlineExceeded(f"{method.upper()} {path} not sent: rate limit wait exceeds the deadline")
+        timeouts, clipped = _budgeted_timeouts(self._timeouts, method, path)
+        merged_headers = self._merge_headers(headers)
+        if self.traceparent:
+            merged_headers["traceparent"] = make_traceparent()
+        try:
+            _encode_json_body(kwargs, merged_headers, "data")
+        except ValueError as exc:
+            raise requests.exceptions.InvalidJSONError(exc) from exc  # what requests raises for json=
+        send = partial(
+            self._session.request,
             method.upper(),
             url,
-            timeout=self.timeout,
+            timeout=timeouts.for_requests(),
             verify=self.verify,
-            headers=self._merge_headers(headers),
+            headers=merged_headers,
+            stream=stream,
             **kwargs,
         )
+        hook = request_hook(self.on_request)
+        if hook is not None:
+            send = instrument_send(
+                hook,
+                send,
+                method=method,
+                path=path,
+                url=url,
+                traceparent=merged_headers.get("traceparent"),
+                stream=stream,
+            )
+        try:
+            # A streamed body is consumed by the caller, so there is no complete response to race.
+            if self.hedge_policy is not None and method.upper() == "GET" and not stream:
+                response = hedged_call(
+                    self.hedge_policy,
+                    classify_request(method, path),
+                    send,
+                    executor=self._hedge_pool(),
+                    can_hedge=_hedge_gate(self.rate_limiter, method, path),
+                    discard=requests.Response.close,
+                    usable=_usable_response,
+                )
+            else:
+                response = send()
+        except requests.RequestException as exc:
+            # The caller ran out of time, not the backend: record no failure and let
+            # request_raw hand back a half-open trial slot.
+            if clipped and isinstance(exc, requests.Timeout):
+                raise DeadlineExceeded(f"{method.upper()} {path} exceeded the caller's deadline") from exc
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure()
+            raise
+        _record_outcome(self.rate_limiter, self.circuit_breaker, method, path, response.status_code, response.headers)
 
         if not response.ok:
             content = response.text.strip()
             raise IntelliOpticsClientError(
-                f"{method.upper()} {path} failed with {response.status_code}: {content or 'no body'}"
+                f"{method.upper()} {path} failed with {response.status_code}: {content or 'no body'}",
+                status_code=response.status_code,
             )
 
         return response
@@ -85,7 +380,7 @@ class HttpClient:
 
         content_type = response.headers.get("Content-Type", "").lower()
         if "json" in content_type:
-            return response.json()
+            return _json.loads(response.content)
         return response.text
 
     # ------------------------------------------------------------------
@@ -97,6 +392,22 @@ class HttpClient:
     def post_json(self, path: str, **kwargs: Any) -> Any:
         return self._request("POST", path, **kwargs)
 
+    def stream_json(
+        self,
+        path: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        convert: Any = None,
+        **kwargs: Any,
+    ) -> ItemStream:
+        """GET a paged list and parse its items as the body arrives; see :class:`ItemStream`."""
+
+        def open_body():  # type: ignore[no-untyped-def]
+            response = self.request_raw("GET", path, params=params, stream=True, **kwargs)
+            return response.iter_content(_STREAM_CHUNK), response.close
+
+        return ItemStream(open_body, convert)
+
     def put_json(self, path: str, **kwargs: Any) -> Any:
         return self._request("PUT", path, **kwargs)
 
@@ -107,6 +418,9 @@ class HttpClient:
         return self._request("DELETE", path, **kwargs)
 
     def close(self) -> None:
+        self.stop_keepalive()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
         self._session.close()
 
 
@@ -119,17 +433,42 @@ class AsyncHttpClient:
         api_token: str,
         *,
         verify: bool = True,
-        timeout: float = _DEFAULT_TIMEOUT,
+        timeout: float | Timeouts = _DEFAULT_TIMEOUT,
+        rate_limiter: RateLimiter | Mapping[str, float] | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        on_request: RequestHook | None = None,
+        traceparent: bool = False,
+        metrics: MetricsRegistry | None = None,
     ) -> None:
         if not base_url:
             raise IntelliOpticsClientError("Missing INTELLIOPTICS_ENDPOINT")
 
+        base, self.socket_path = split_unix_endpoint(base_url)
+        custom_transport = transport is not None
+        if transport is None and self.socket_path is not None:
+            transport = httpx.AsyncHTTPTransport(uds=self.socket_path, verify=verify)
+        self.rate_limiter = _resolve_rate_limiter(rate_limiter)
+        self.circuit_breaker = circuit_breaker
+        self.hedge_policy = hedge_policy
+        self.on_request = _combine_hooks(on_request, metrics)
+        self.traceparent = traceparent
+        self._keepalive_task: asyncio.Task[None] | None = None
+        self._verify = verify
+        self._timeouts = Timeouts.coerce(timeout)
+        self._custom_transport = custom_transport
         self._client = httpx.AsyncClient(
-            base_url=base_url.rstrip("/"),
-            timeout=timeout,
+            base_url=base,
+            timeout=self._timeouts.for_httpx(),
             verify=verify,
             headers={"Authorization": f"Bearer {api_token}"},
+            transport=transport,
         )
+        # A custom async transport cannot be driven from the probe thread; such breakers
+        # fall back to ``recovery_timeout``.
+        if circuit_breaker is not None and not custom_transport:
+            circuit_breaker.attach_probe(self._probe_health)
 
     async def _merge_headers(self, headers: Mapping[str, str] | None) -> MutableMapping[str, str]:
         combined: MutableMapping[str, str] = dict(self._client.headers)
@@ -137,29 +476,165 @@ class AsyncHttpClient:
             combined.update(headers)
         return combined
 
+    def _probe_health(self) -> bool:
+        # Runs on the breaker's probe thread, so it cannot share the event-loop bound client.
+        timeout = self.circuit_breaker.probe_timeout if self.circuit_breaker is not None else 5.0
+        transport = httpx.HTTPTransport(uds=self.socket_path) if self.socket_path is not None else None
+        with httpx.Client(
+            headers=dict(self._client.headers), verify=self._verify, timeout=timeout, transport=transport
+        ) as probe:
+            return probe.get(_build_url(str(self._client.base_url), _HEALTH_PATH)).is_success
+
+    def _ensure_pool_size(self, connections: int) -> None:
+        """Raise the keep-alive limit of the pool serving the base URL to ``connections``, in place.
+
+        httpx fixes ``Limits`` when the client is built, and swapping clients would
+        break requests and streamed responses still running on the old one, so the
+        pool's own limits are grown instead. Caller-supplied transports keep theirs.
+        """
+
+        if self._custom_transport:
+            return
+        pool = getattr(self._client._transport_for_url(self._client.base_url), "_pool", None)
+        if not hasattr(pool, "_max_connections") or not hasattr(pool, "_max_keepalive_connections"):
+            return  # an httpcore without these limits keeps its own
+        if pool._max_keepalive_connections < connections:
+            pool._max_connections = max(pool._max_connections, connections)
+            pool._max_keepalive_connections = connections
+
+    async def warmup(self, connections: int = 1, *, keepalive_interval: float | None = None) -> int:
+        """Async :meth:`HttpClient.warmup`; keep-alive pings run as an asyncio task.
+
+        When ``connections`` exceeds the pool's keep-alive limit (20 by default)
+        the limit is raised to match, without disturbing requests in flight.
+        Clients with a custom ``transport`` keep that transport's limits.
+        """
+
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
+        target = _resolve_host(str(self._client.base_url)) if self.socket_path is None else None
+        if target is not None:
+            try:
+                await asyncio.get_running_loop().getaddrinfo(*target, type=socket.SOCK_STREAM)
+            except OSError:
+                pass
+        self._ensure_pool_size(connections)
+        warmed = await self._ping(connections)
+        if keepalive_interval is not None:
+            self.stop_keepalive()
+            self._keepalive_task = asyncio.create_task(self._keepalive(connections, keepalive_interval))
+        return warmed
+
+    async def _ping(self, connections: int) -> int:
+        async def ping() -> bool:
+            try:
+                response = await self._client.get(_HEALTH_PATH)
+            except httpx.HTTPError:
+                return False
+            return response.is_success
+
+        return sum(await asyncio.gather(*(ping() for _ in range(connections))))
+
+    async def _keepalive(self, connections: int, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self._ping(connections)
+
+    def stop_keepalive(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
     async def request_raw(
         self,
         method: str,
         path: str,
         *,
         headers: Mapping[str, str] | None = None,
+        stream: bool = False,
         **kwargs: Any,
     ) -> httpx.Response:
-        response = await self._client.request(
+        trial = self.circuit_breaker.before_request() if self.circuit_breaker is not None else None
+        try:
+            return await self._send(method, path, headers, stream, kwargs)
+        finally:
+            if trial is not None:
+                self.circuit_breaker.release_trial(trial)
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        headers: Mapping[str, str] | None,
+        stream: bool,
+        kwargs: dict[str, Any],
+    ) -> httpx.Response:
+        if self.rate_limiter is not None and not await self.rate_limiter.acquire_async(
+            method, path, timeout=_limiter_budget(method, path)
+        ):
+            raise DeadlineExceeded(f"{method.upper()} {path} not sent: rate limit wait exceeds the deadline")
+        timeouts, clipped = _budgeted_timeouts(self._timeouts, method, path)
+        merged_headers = await self._merge_headers(headers)
+        if self.traceparent:
+            merged_headers["traceparent"] = make_traceparent()
+        _encode_json_body(kwargs, merged_headers, "content")
+        send = partial(
+            self._send_streaming if stream else self._client.request,
             method.upper(),
             path,
-            headers=await self._merge_headers(headers),
+            headers=merged_headers,
+            timeout=timeouts.for_httpx(),
             **kwargs,
         )
+        hook = request_hook(self.on_request)
+        if hook is not None:
+            send = instrument_send_async(
+                hook,
+                send,
+                method=method,
+                path=path,
+                url=_build_url(str(self._client.base_url), path),
+                traceparent=merged_headers.get("traceparent"),
+                stream=stream,
+            )
+        try:
+            if self.hedge_policy is not None and method.upper() == "GET" and not stream:
+                response = await hedged_call_async(
+                    self.hedge_policy,
+                    classify_request(method, path),
+                    send,
+                    can_hedge=_hedge_gate(self.rate_limiter, method, path),
+                    usable=_usable_response,
+                )
+            else:
+                response = await send()
+        except httpx.TransportError as exc:
+            # The caller ran out of time, not the backend: record no failure and let
+            # request_raw hand back a half-open trial slot.
+            if clipped and isinstance(exc, httpx.TimeoutException):
+                raise DeadlineExceeded(f"{method.upper()} {path} exceeded the caller's deadline") from exc
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure()
+            raise
+        _record_outcome(self.rate_limiter, self.circuit_breaker, method, path, response.status_code, response.headers)
 
         if not response.is_success:
+            if stream:
+                await response.aread()
+                await response.aclose()
             content = response.text.strip()
             raise IntelliOpticsClientError(
-                f"{method.upper()} {path} failed with {response.status_code}: {content or 'no body'}"
+                f"{method.upper()} {path} failed with {response.status_code}: {content or 'no body'}",
+                status_code=response.status_code,
             )
 
         return response
 
+    async def _send_streaming(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        extensions = kwargs.pop("extensions", None)
+        request = self._client.build_request(method, path, extensions=extensions, **kwargs)
+        return await self._client.send(request, stream=True)
+
     async def _request(self, method: str, path: str, **kwargs: Any) -> Any:
         response = await self.request_raw(method, path, **kwargs)
 
@@ -168,7 +643,7 @@ class AsyncHttpClient:
 
         content_type = response.headers.get("Content-Type", "").lower()
         if "json" in content_type:
-            return response.json()
+            return _json.loads(response.content)
         return response.text
 
     async def get_json(
@@ -179,6 +654,22 @@ class AsyncHttpClient:
     async def post_json(self, path: str, **kwargs: Any) -> Any:
         return await self._request("POST", path, **kwargs)
 
+    def stream_json(
+        self,
+        path: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        convert: Any = None,
+        **kwargs: Any,
+    ) -> AsyncItemStream:
+        """Async :meth:`HttpClient.stream_json`; iterate the result with ``async for``."""
+
+        async def open_body():  # type: ignore[no-untyped-def]
+            response = await self.request_raw("GET", path, params=params, stream=True, **kwargs)
+            return response.aiter_bytes(), response.aclose
+
+        return AsyncItemStream(open_body, convert)
+
     async def put_json(self, path: str, **kwargs: Any) -> Any:
         return await self._request("PUT", path, **kwargs)
 
@@ -189,6 +680,7 @@ class AsyncHttpClient:
         return await self._request("DELETE", path, **kwargs)
 
     async def close(self) -> None:
+        self.stop_keepalive()
         await self._client.aclose()
 
     async def __aenter__(self) -> "AsyncHttpClient":  # pragma: no cover - passthrough
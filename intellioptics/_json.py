@@ -0,0 +1,207 @@
+"""JSON encoding and decoding with the fastest available backend.
+
+Request bodies, responses and metadata strings go through :func:`dumps` and
+:func:`loads`. They use ``orjson`` when it is installed, then ``msgspec``,
+then the standard library. Set ``INTELLIOPTICS_JSON`` to ``orjson``,
+``msgspec`` or ``json`` to force one, or call :func:`use_codec`.
+
+For plain JSON data (dicts, lists, strings, numbers, booleans and ``None``)
+every backend produces the same compact UTF-8 output, up to the spelling of
+float exponents (``1e308`` versus ``1e+308``). Anything a fast backend
+cannot handle the way :mod:`json` does is retried with the standard library:
+integers beyond 64 bits, ``NaN`` and infinities (which the fast encoders would
+write as ``null``) and ``NaN`` literals in a response. The orjson encoder also
+hands datetimes, dataclasses and subclasses of built-in types back to
+:mod:`json`, so they raise :class:`TypeError` or encode exactly as without it.
+orjson still encodes ``uuid.UUID`` and plain ``Enum`` members itself; msgspec
+has no such switches and also encodes datetimes and dataclasses itself, where
+:mod:`json` raises :class:`TypeError`.
+
+Request bodies use :func:`dumps_strict`, which refuses ``NaN`` and infinities
+with :class:`ValueError` as ``json.dumps(allow_nan=False)`` does, so they never
+go out as invalid JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional dependency
+    import msgspec
+except Exception:  # pragma: no cover
+    msgspec = None  # type: ignore[assignment]
+
+
+ENV_CODEC = "INTELLIOPTICS_JSON"
+
+JsonInput = Union[bytes, bytearray, str]
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """A named pair of ``dumps(obj) -> bytes`` and ``loads(bytes | str) -> obj``."""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[JsonInput], Any]
+
+
+_std_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_strict_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+
+def _std_dumps(obj: Any) -> bytes:
+    return _std_encoder.encode(obj).encode()
+
+
+STDLIB = JsonCodec("json", _std_dumps, json.loads)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    # Exact type checks keep the walk cheap; orjson hands subclasses to json anyway.
+    stack = [obj]
+    pop, extend, isfinite = stack.pop, stack.extend, math.isfinite
+    while stack:
+        value = pop()
+        kind = type(value)
+        if kind is float:
+            if not isfinite(value):
+                return True
+        elif kind is dict:
+            extend(value.values())
+        elif kind is list or kind is tuple:
+            extend(value)
+    return False
+
+
+def _finite_only(dumps: Callable[[Any], bytes]) -> Callable[[Any], bytes]:
+    """Reject the ``null`` a fast encoder writes for ``NaN``/``inf``; the input is only walked when ``null`` appears."""
+
+    def checked(obj: Any) -> bytes:
+        data = dumps(obj)
+        if b"null" in data and _has_non_finite(obj):
+            raise ValueError("non-finite float")
+        return data
+
+    return checked
+
+
+def _reject(obj: Any) -> Any:
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _with_fallback(
+    name: str, dumps: Callable[[Any], bytes], loads: Callable[[JsonInput], Any], errors: Any
+) -> JsonCodec:
+    def safe_dumps(obj: Any) -> bytes:
+        try:
+            return dumps(obj)
+        except errors:
+            return _std_dumps(obj)
+
+    def safe_loads(data: JsonInput) -> Any:
+        try:
+            return loads(data)
+        except errors:
+            return json.loads(data)
+
+    return JsonCodec(name, safe_dumps, safe_loads)
+
+
+def _orjson_codec() -> JsonCodec | None:
+    if orjson is None:
+        return None
+    # Types orjson would encode but json rejects go to ``default``, which refuses them.
+    options = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+    dumps = _finite_only(lambda obj: orjson.dumps(obj, default=_reject, option=options))
+    return _with_fallback("orjson", dumps, orjson.loads, (TypeError, ValueError))
+
+
+def _msgspec_codec() -> JsonCodec | None:
+    if msgspec is None:
+        return None
+    encoder, decoder = msgspec.json.Encoder(), msgspec.json.Decoder()
+    dumps = _finite_only(encoder.encode)
+    return _with_fallback("msgspec", dumps, decoder.decode, (TypeError, ValueError, msgspec.MsgspecError))
+
+
+_FACTORIES: dict[str, Callable[[], JsonCodec | None]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": lambda: STDLIB,
+}
+
+
+def available_codecs() -> list[str]:
+    """Names of the backends importable here, fastest first."""
+
+    return [name for name, factory in _FACTORIES.items() if factory() is not None]
+
+
+def _resolve(choice: JsonCodec | str | None) -> JsonCodec:
+    if isinstance(choice, JsonCodec):
+        return choice
+    if choice:
+        if choice not in _FACTORIES:
+            raise ValueError(f"unknown JSON codec {choice!r}; expected one of {sorted(_FACTORIES)}")
+        codec = _FACTORIES[choice]()
+        if codec is None:
+            raise ValueError(f"JSON codec {choice!r} is not installed")
+        return codec
+    for factory in _FACTORIES.values():
+        codec = factory()
+        if codec is not None:
+            return codec
+    return STDLIB  # pragma: no cover - the stdlib factory always succeeds
+
+
+_codec = _resolve(os.getenv(ENV_CODEC))
+
+
+def get_codec() -> JsonCodec:
+    return _codec
+
+
+def use_codec(choice: JsonCodec | str | None) -> JsonCodec:
+    """Switch the process-wide codec (``None`` picks the fastest installed); returns the previous one."""
+
+    global _codec
+    previous, _codec = _codec, _resolve(choice)
+    return previous
+
+
+def dumps(obj: Any) -> bytes:
+    return _codec.dumps(obj)
+
+
+def dumps_strict(obj: Any) -> bytes:
+    """:func:`dumps` that raises :class:`ValueError` on ``NaN`` and infinities."""
+
+    data = _codec.dumps(obj)
+    if b"NaN" in data or b"Infinity" in data:
+        _strict_encoder.encode(obj)  # raises unless the literal was inside a string
+    return data
+
+
+def dumps_str(obj: Any) -> str:
+    return _codec.dumps(obj).decode()
+
+
+def loads(data: JsonInput) -> Any:
+    """Decode ``data``; raises :class:`ValueError` (a :class:`json.JSONDecodeError`) on invalid JSON."""
+
+    return _codec.loads(data)
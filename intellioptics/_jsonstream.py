@@ -0,0 +1,247 @@
+"""Incremental parsing of paged JSON responses.
+
+List endpoints return ``{"count": ..., "results": [...], ...}`` (or a bare
+array). :class:`JsonItemParser` is fed the body chunk by chunk and hands back
+each element of the item array as soon as its closing bracket arrives, so a
+caller can start on the first query while the rest of a large page is still
+on the wire, and only the unparsed tail of the body is ever held in memory.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Iterator
+
+# Members holding the page's items, in the order ``_coerce_image_query_items`` tries them.
+ITEM_KEYS = ("results", "items", "data", "image_queries")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SEPARATOR = re.compile(r"[ \t\n\r]*,?[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+_START, _KEY, _COLON, _VALUE, _ITEMS, _DONE = range(6)
+
+
+class JsonItemParser:
+    """Push parser yielding the items of a JSON page; every other member lands in :attr:`envelope`."""
+
+    def __init__(self, item_keys: Iterable[str] = ITEM_KEYS) -> None:
+        self.envelope: dict[str, Any] = {}
+        self._item_keys = frozenset(item_keys)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key: str | None = None
+        self._top_level_array = False
+        self._streamed = False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Add ``chunk`` of the body; returns the items it completed."""
+
+        self._buffer = self._buffer[self._pos :] + self._utf8.decode(chunk)
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> list[Any]:
+        """Signal the end of the body; raises :class:`ValueError` if it was truncated or malformed."""
+
+        self._buffer = self._buffer[self._pos :] + self._utf8.decode(b"", final=True)
+        self._pos = 0
+        items = self._parse(final=True)
+        if self._state not in (_START, _DONE) or self._buffer[self._pos :].strip():
+            raise ValueError("truncated or malformed JSON page")
+        return items
+
+    # ------------------------------------------------------------------
+    def _skip(self) -> bool:
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+        return self._pos < len(self._buffer)
+
+    def _value(self, final: bool) -> tuple[bool, Any]:
+        """Decode the value at the cursor, unless the buffer may still be missing part of it."""
+
+        try:
+            value, end = _DECODER.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError("malformed JSON page") from None
+            return False, None
+        # A number at the very end of the buffer could continue in the next chunk.
+        if end == len(self._buffer) and not final:
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _parse(self, *, final: bool) -> list[Any]:
+        items: list[Any] = []
+        buffer = self._buffer
+        while self._state != _DONE and self._skip():
+            char = buffer[self._pos]
+            if self._state == _START:
+                if char not in "[{":
+                    raise ValueError("expected a JSON object or array")
+                self._pos += 1
+                self._top_level_array = char == "["
+                self._state = _ITEMS if self._top_level_array else _KEY
+            elif self._state == _KEY:
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                elif char == ",":
+                    self._pos += 1
+                else:
+                    complete, self._key = self._value(final)
+                    if not complete:
+                        break
+                    self._state = _COLON
+            elif self._state == _COLON:
+                if char != ":":
+                    raise ValueError("malformed JSON page")
+                self._pos += 1
+                self._state = _VALUE
+            elif self._state == _VALUE:
+                if char == "[" and self._key in self._item_keys and not self._streamed:
+                    self._pos += 1
+                    self._streamed = True
+                    self._state = _ITEMS
+                    continue
+                complete, value = self._value(final)
+                if not complete:
+                    break
+                self.envelope[self._key] = value  # type: ignore[index]
+                self._state = _KEY
+            elif char == "]":  # _ITEMS
+                self._pos += 1
+                self._state = _DONE if self._top_level_array else _KEY
+            elif not self._items(items, final):
+                break
+        return items
+
+    def _items(self, items: list[Any], final: bool) -> bool:
+        """Decode consecutive array items; the hot loop, kept to locals. False when more input is needed."""
+
+        buffer, pos, size = self._buffer, self._pos, len(self._buffer)
+        decode, separator = _DECODER.raw_decode, _SEPARATOR.match
+        try:
+            while pos < size and buffer[pos] != "]":
+                try:
+                    value, end = decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise ValueError("malformed JSON page") from None
+                    return False
+                if end == size and not final:
+                    return False
+                items.append(value)
+                pos = separator(buffer, end).end()  # type: ignore[union-attr]
+            return True
+        finally:
+            self._pos = pos
+
+
+# ----------------------------------------------------------------------
+# Page streams
+# ----------------------------------------------------------------------
+Opener = Callable[[], "tuple[Iterable[bytes], Callable[[], None]]"]
+AsyncOpener = Callable[[], Awaitable["tuple[AsyncIterable[bytes], Callable[[], Awaitable[None]]]"]]
+
+
+class _PageFields:
+    envelope: dict[str, Any]
+
+    @property
+    def count(self) -> int | None:
+        return self.envelope.get("count")
+
+    @property
+    def next(self) -> str | None:
+        return self.envelope.get("next")
+
+    @property
+    def previous(self) -> str | None:
+        return self.envelope.get("previous")
+
+
+class ItemStream(_PageFields):
+    """The items of one page, converted as soon as each is parsed from the response body.
+
+    The request is sent when iteration starts and the connection is released
+    when it ends (or on :meth:`close`). ``count``/``next``/``previous`` fill in
+    as the body is parsed and are complete once iteration finishes. Items that
+    are not JSON objects are skipped.
+    """
+
+    def __init__(self, open_body: Opener, convert: Callable[[Any], Any] | None = None) -> None:
+        self.envelope = {}
+        self._open_body = open_body
+        self._convert = convert
+        self._close: Callable[[], None] | None = None
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._close is not None:
+            raise RuntimeError("a page stream can only be iterated once")
+        chunks, self._close = self._open_body()
+        parser = JsonItemParser()
+        self.envelope = parser.envelope
+        convert = self._convert
+        try:
+            for chunk in chunks:
+                for item in parser.feed(chunk):
+                    if isinstance(item, dict):
+                        yield convert(item) if convert is not None else item
+            for item in parser.close():
+                if isinstance(item, dict):
+                    yield convert(item) if convert is not None else item
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._close is not None:
+            self._close()
+
+    def __enter__(self) -> "ItemStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class AsyncItemStream(_PageFields):
+    """Async :class:`ItemStream`, iterated with ``async for``."""
+
+    def __init__(self, open_body: AsyncOpener, convert: Callable[[Any], Any] | None = None) -> None:
+        self.envelope = {}
+        self._open_body = open_body
+        self._convert = convert
+        self._close: Callable[[], Awaitable[None]] | None = None
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        if self._close is not None:
+            raise RuntimeError("a page stream can only be iterated once")
+        chunks, self._close = await self._open_body()
+        parser = JsonItemParser()
+        self.envelope = parser.envelope
+        convert = self._convert
+        try:
+            async for chunk in chunks:
+                for item in parser.feed(chunk):
+                    if isinstance(item, dict):
+                        yield convert(item) if convert is not None else item
+            for item in parser.close():
+                if isinstance(item, dict):
+                    yield convert(item) if convert is not None else item
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._close is not None:
+            await self._close()
+
+    async def __aenter__(self) -> "AsyncItemStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
@@ -0,0 +1,396 @@
+"""Latest-frame-wins submission for live camera feeds."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+
+from ._img import to_jpeg_bytes
+from ._timing import encode_scope, note_encode_time
+from .client import AsyncIntelliOptics, IntelliOptics, _detector_identifier
+from .models import Detector, ImageQuery
+
+
+ResultCallback = Callable[[str, Hashable, ImageQuery], Any]
+ErrorCallback = Callable[[str, Hashable, BaseException], Any]
+
+_COUNTER_NAMES = ("offered", "submitted", "superseded", "stale", "errors")
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Frame:
+    image: Any
+    captured_at: float
+    submit_kwargs: dict[str, Any]
+
+
+@dataclass
+class _Slot:
+    detector_id: str
+    source: Hashable
+    pending: _Frame | None = None
+    in_flight: bool = False
+    counters: dict[str, int] = field(default_factory=lambda: dict.fromkeys(_COUNTER_NAMES, 0))
+
+
+class _FrameSlots:
+    """Bookkeeping shared by the sync and async submitters.
+
+    One slot exists per ``(detector_id, source)`` pair. A slot holds at most one
+    pending frame; offering a new frame replaces (and counts as superseded) the
+    previous one. Callers must hold their own lock around these methods.
+    """
+
+    def __init__(self, max_age: float) -> None:
+        if max_age <= 0:
+            raise ValueError("max_age must be positive")
+        self.max_age = max_age
+        self._slots: dict[tuple[str, Hashable], _Slot] = {}
+
+    def offer(self, detector_id: str, source: Hashable, frame: _Frame) -> None:
+        slot = self._slots.get((detector_id, source))
+        if slot is None:
+            slot = self._slots[(detector_id, source)] = _Slot(detector_id, source)
+        slot.counters["offered"] += 1
+        if slot.pending is not None:
+            slot.counters["superseded"] += 1
+        slot.pending = frame
+
+    def take(self, now: float) -> tuple[_Slot, _Frame] | None:
+        """Claim the oldest pending frame whose slot has nothing in flight.
+
+        Frames that have already exceeded ``max_age`` are dropped here, before
+        any encoding work is spent on them.
+        """
+
+        while True:
+            ready = [slot for slot in self._slots.values() if slot.pending is not None and not slot.in_flight]
+            if not ready:
+                return None
+            slot = min(ready, key=lambda item: item.pending.captured_at)  # type: ignore[union-attr]
+            frame = slot.pending
+            slot.pending = None
+            assert frame is not None
+            if now - frame.captured_at >= self.max_age:
+                slot.counters["stale"] += 1
+                continue
+            slot.in_flight = True
+            return slot, frame
+
+    def has_ready(self) -> bool:
+        return any(slot.pending is not None and not slot.in_flight for slot in self._slots.values())
+
+    def release(self, slot: _Slot, outcome: str | None) -> None:
+        slot.in_flight = False
+        if outcome is not None:
+            slot.counters[outcome] += 1
+
+    def stats(self, per_source: bool = False) -> dict[str, Any]:
+        totals = dict.fromkeys(_COUNTER_NAMES, 0)
+        for slot in self._slots.values():
+            for name, value in slot.counters.items():
+                totals[name] += value
+        if not per_source:
+            return totals
+        return {
+            "total": totals,
+            "sources": {
+                key: dict(slot.counters) for key, slot in self._slots.items()
+            },
+        }
+
+
+def _encode_frame(frame: _Frame) -> tuple[bytes, float]:
+    """JPEG-encode ``frame``; returns the payload and the seconds spent encoding."""
+
+    started = time.perf_counter()
+    payload = to_jpeg_bytes(frame.image)
+    return payload, time.perf_counter() - started
+
+
+def _prepare_submission(frames: _FrameSlots, frame: _Frame) -> tuple[bytes, dict[str, Any]] | None:
+    """Encode ``frame`` and derive its time budget, or return ``None`` if it went stale."""
+
+    payload, encode_seconds = _encode_frame(frame)
+    note_encode_time(encode_seconds)
+    kwargs = _submission_kwargs(frames, frame)
+    return None if kwargs is None else (payload, kwargs)
+
+
+def _submission_kwargs(frames: _FrameSlots, frame: _Frame) -> dict[str, Any] | None:
+    remaining = frames.max_age - (time.time() - frame.captured_at)
+    if remaining <= 0:
+        return None
+
+    kwargs = dict(frame.submit_kwargs)
+    kwargs.setdefault("wait", remaining)
+    if kwargs["wait"] is not None:
+        kwargs["wait"] = min(float(kwargs["wait"]), remaining)
+    kwargs["patience_time"] = remaining
+    kwargs["request_timeout"] = remaining
+    return kwargs
+
+
+def _log_worker_error(slot: _Slot) -> None:
+    # Reached when no ``on_error`` callback is set, or when the callback itself raised.
+    _logger.exception("Live submission for detector %s, source %r failed", slot.detector_id, slot.source)
+
+
+class LiveSubmitter:
+    """Submit only the newest frame per detector and camera source.
+
+    Frames are offered with :meth:`offer` and uploaded by background worker
+    threads (see :meth:`start`) or by calling :meth:`process_pending` from the
+    caller's own loop. Frames older than ``max_age`` seconds are dropped before
+    they are encoded or uploaded, and ``patience_time``/``request_timeout`` are
+    set from whatever freshness budget remains.
+    """
+
+    def __init__(
+        self,
+        client: IntelliOptics,
+        *,
+        max_age: float = 2.0,
+        workers: int = 1,
+        on_result: ResultCallback | None = None,
+        on_error: ErrorCallback | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._client = client
+        self._frames = _FrameSlots(max_age)
+        self._workers = workers
+        self._on_result = on_result
+        self._on_error = on_error
+        self._cond = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._running = False
+
+    @property
+    def max_age(self) -> float:
+        return self._frames.max_age
+
+    def offer(
+        self,
+        detector: Detector | str,
+        image: Any,
+        *,
+        source: Hashable = "default",
+        captured_at: float | None = None,
+        **submit_kwargs: Any,
+    ) -> None:
+        """Queue ``image`` for ``(detector, source)``, replacing any pending frame."""
+
+        frame = _Frame(image, time.time() if captured_at is None else captured_at, submit_kwargs)
+        with self._cond:
+            self._frames.offer(_detector_identifier(detector), source, frame)
+            self._cond.notify()
+
+    def stats(self, *, per_source: bool = False) -> dict[str, Any]:
+        """Return submission and drop counters, optionally broken down per source."""
+
+        with self._cond:
+            return self._frames.stats(per_source)
+
+    def process_pending(self) -> list[ImageQuery]:
+        """Submit every currently pending frame from the calling thread."""
+
+        results: list[ImageQuery] = []
+        while True:
+            with self._cond:
+                claimed = self._frames.take(time.time())
+            if claimed is None:
+                return results
+            result = self._submit(*claimed)
+            if result is not None:
+                results.append(result)
+
+    def _submit(self, slot: _Slot, frame: _Frame) -> ImageQuery | None:
+        outcome: str | None = "errors"
+        result: ImageQuery | None = None
+        try:
+            with encode_scope():
+                prepared = _prepare_submission(self._frames, frame)
+                if prepared is None:
+                    outcome = "stale"
+                    return None
+                payload, kwargs = prepared
+                result = self._client.submit_image_query(slot.detector_id, payload, **kwargs)
+            outcome = "submitted"
+        except Exception as exc:
+            if self._on_error is None:
+                raise
+            self._on_error(slot.detector_id, slot.source, exc)
+            return None
+        finally:
+            with self._cond:
+                self._frames.release(slot, outcome)
+                self._cond.notify()
+
+        if self._on_result is not None:
+            self._on_result(slot.detector_id, slot.source, result)
+        return result
+
+    # ------------------------------------------------------------------
+    # Background workers
+    # ------------------------------------------------------------------
+    def start(self) -> "LiveSubmitter":
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        for index in range(self._workers):
+            thread = threading.Thread(target=self._worker, name=f"intellioptics-live-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._frames.has_ready():
+                    self._cond.wait()
+                if not self._running:
+                    return
+                claimed = self._frames.take(time.time())
+            if claimed is not None:
+                try:
+                    self._submit(*claimed)
+                except Exception:
+                    _log_worker_error(claimed[0])
+
+    def __enter__(self) -> "LiveSubmitter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+class AsyncLiveSubmitter:
+    """Async variant of :class:`LiveSubmitter` driven by asyncio tasks."""
+
+    def __init__(
+        self,
+        client: AsyncIntelliOptics,
+        *,
+        max_age: float = 2.0,
+        workers: int = 1,
+        on_result: ResultCallback | None = None,
+        on_error: ErrorCallback | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._client = client
+        self._frames = _FrameSlots(max_age)
+        self._workers = workers
+        self._on_result = on_result
+        self._on_error = on_error
+        self._wakeup: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def max_age(self) -> float:
+        return self._frames.max_age
+
+    def offer(
+        self,
+        detector: Detector | str,
+        image: Any,
+        *,
+        source: Hashable = "default",
+        captured_at: float | None = None,
+        **submit_kwargs: Any,
+    ) -> None:
+        frame = _Frame(image, time.time() if captured_at is None else captured_at, submit_kwargs)
+        self._frames.offer(_detector_identifier(detector), source, frame)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self, *, per_source: bool = False) -> dict[str, Any]:
+        return self._frames.stats(per_source)
+
+    async def process_pending(self) -> list[ImageQuery]:
+        results: list[ImageQuery] = []
+        while True:
+            claimed = self._frames.take(time.time())
+            if claimed is None:
+                return results
+            result = await self._submit(*claimed)
+            if result is not None:
+                results.append(result)
+
+    async def _submit(self, slot: _Slot, frame: _Frame) -> ImageQuery | None:
+        outcome: str | None = "errors"
+        result: ImageQuery | None = None
+        try:
+            # Full frames take tens of milliseconds to encode; keep that off the loop. The
+            # worker thread runs in a copied context, so its encode time is noted here instead.
+            payload, encode_seconds = await asyncio.to_thread(_encode_frame, frame)
+            kwargs = _submission_kwargs(self._frames, frame)
+            if kwargs is None:
+                outcome = "stale"
+                return None
+            with encode_scope():
+                note_encode_time(encode_seconds)
+                result = await self._client.submit_image_query(slot.detector_id, payload, **kwargs)
+            outcome = "submitted"
+        except Exception as exc:
+            if self._on_error is None:
+                raise
+            self._on_error(slot.detector_id, slot.source, exc)
+            return None
+        finally:
+            self._frames.release(slot, outcome)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+        if self._on_result is not None:
+            self._on_result(slot.detector_id, slot.source, result)
+        return result
+
+    async def start(self) -> "AsyncLiveSubmitter":
+        if self._tasks:
+            return self
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+        return self
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    async def _worker(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            claimed = self._frames.take(time.time())
+            if claimed is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            try:
+                await self._submit(*claimed)
+            except Exception:
+                _log_worker_error(claimed[0])
+
+    async def __aenter__(self) -> "AsyncLiveSubmitter":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
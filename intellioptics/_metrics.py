@@ -0,0 +1,233 @@
+"""In-process metrics: labelled counters and log-linear latency histograms."""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from typing import Any, Iterable, Mapping
+
+from ._ratelimit import UPLOAD, classify_request
+from ._timing import RequestTiming
+
+
+LabelKey = tuple[tuple[str, str], ...]
+
+_QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+_ID_SEGMENT = re.compile(r"^(?!v\d+$).*\d")
+
+_HELP = {
+    "intellioptics_requests_total": "HTTP requests by endpoint and status.",
+    "intellioptics_request_errors_total": "Failed HTTP requests by endpoint and status.",
+    "intellioptics_request_seconds": "HTTP request latency by endpoint.",
+    "intellioptics_uploaded_bytes_total": "Request body bytes sent by endpoint.",
+    "intellioptics_encode_seconds": "Time spent encoding images before upload.",
+    "intellioptics_submissions_total": "Image queries submitted by detector.",
+    "intellioptics_polls_per_query": "GET polls needed per waited-on image query.",
+    "intellioptics_time_to_confident_seconds": "Time until an answer met its confidence threshold.",
+    "intellioptics_cache_hits_total": "SDK cache hits by cache.",
+    "intellioptics_cache_misses_total": "SDK cache misses by cache.",
+}
+
+
+def route_template(path: str) -> str:
+    """Collapse ids in ``path`` so metrics are labelled per endpoint, not per object."""
+
+    route = path.split("?", 1)[0]
+    if "://" in route:
+        route = "/" + route.split("://", 1)[1].partition("/")[2]
+    segments = [("{id}" if _ID_SEGMENT.match(segment) else segment) for segment in route.strip("/").split("/")]
+    return "/" + "/".join(segments)
+
+
+class Histogram:
+    """HDR-style histogram with a bounded relative error.
+
+    Values are bucketed log-linearly: every power of two above ``lowest`` is
+    split into ``sub_buckets`` linear buckets, so quantiles are accurate to
+    about ``1 / sub_buckets`` (3% by default) across the whole range while
+    memory stays proportional to the number of distinct buckets touched.
+    """
+
+    __slots__ = ("lowest", "sub_buckets", "count", "sum", "min", "max", "_buckets")
+
+    def __init__(self, *, lowest: float = 1e-6, sub_buckets: int = 32) -> None:
+        self.lowest = lowest
+        self.sub_buckets = sub_buckets
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buckets: dict[int, int] = {}
+
+    def _index(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        mantissa, exponent = math.frexp(value / self.lowest)
+        return exponent * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+
+    def _upper_bound(self, index: int) -> float:
+        if index == 0:
+            return self.lowest
+        exponent, sub = divmod(index, self.sub_buckets)
+        return self.lowest * math.ldexp(0.5 + (sub + 1) / (2 * self.sub_buckets), exponent)
+
+    def record(self, value: float, count: int = 1) -> None:
+        index = self._index(value)
+        self._buckets[index] = self._buckets.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        summary: dict[str, float] = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "mean": self.sum / self.count if self.count else 0.0,
+        }
+        for label, q in _QUANTILES:
+            summary[label] = self.quantile(q)
+        return summary
+
+
+class MetricsRegistry:
+    """Thread-safe registry of labelled counters and histograms.
+
+    Clients created with ``metrics=`` feed it request counts, latencies,
+    upload sizes, encode times, submissions, polls per query, time to a
+    confident answer and cache hits. Read it with :meth:`snapshot` (a dict) or
+    :meth:`to_prometheus` (text exposition format); no exporter or external
+    service is needed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._histograms: dict[str, dict[LabelKey, Histogram]] = {}
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.record(value)
+
+    def record_request(self, timing: RequestTiming) -> None:
+        """Request hook (see ``on_request``) that records HTTP-level metrics."""
+
+        endpoint = route_template(timing.path)
+        status = str(timing.status_code) if timing.status_code is not None else "error"
+        self.inc("intellioptics_requests_total", endpoint=endpoint, method=timing.method, status=status)
+        self.observe("intellioptics_request_seconds", timing.total, endpoint=endpoint, method=timing.method)
+        if timing.status_code is None or timing.status_code >= 400:
+            self.inc("intellioptics_request_errors_total", endpoint=endpoint, method=timing.method, status=status)
+        if timing.request_bytes and classify_request(timing.method, timing.path) == UPLOAD:
+            self.inc("intellioptics_uploaded_bytes_total", timing.request_bytes, endpoint=endpoint)
+        if timing.encode is not None:
+            self.observe("intellioptics_encode_seconds", timing.encode)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def counter_value(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def histogram(self, name: str, **labels: Any) -> dict[str, float] | None:
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(_label_key(labels))
+            return None if histogram is None else histogram.summary()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return every series as plain data, suitable for logging or JSON."""
+
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [{"labels": dict(key), **histogram.summary()} for key, histogram in series.items()]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the registry in the Prometheus text exposition format.
+
+        Histograms are exposed as summaries (quantiles plus ``_sum`` and
+        ``_count``) because their log-linear buckets do not map onto fixed
+        ``le`` boundaries.
+        """
+
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                _header(lines, name, "counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for name, series in sorted(self._histograms.items()):
+                _header(lines, name, "summary")
+                for key, histogram in series.items():
+                    for _, q in _QUANTILES:
+                        labels = _format_labels(key + (("quantile", str(q)),))
+                        lines.append(f"{name}{labels} {_format_value(histogram.quantile(q))}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _label_key(labels: Mapping[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items() if value is not None))
+
+
+def _header(lines: list[str], name: str, kind: str) -> None:
+    help_text = _HELP.get(name)
+    if help_text:
+        lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _format_labels(key: Iterable[tuple[str, str]]) -> str:
+    parts = []
+    for name, value in key:
+        escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{escaped}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,330 @@
+"""Lazy iteration over paginated list endpoints: page prefetch and parallel fan-out.
+
+A list endpoint returns ``{"count", "next", "previous", "results"}``. The
+iterators here yield the items of one page at a time and follow ``next``
+links until there are none. While the caller works through page N, up to
+``prefetch`` later pages are fetched in the background: on a thread for the
+sync client, on a task for the async one. ``prefetch=0`` fetches each page
+only when the previous one is exhausted.
+
+:func:`fetch_all` reads ``count`` from the first page instead and requests
+the remaining pages concurrently, retrying pages that fail transiently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextvars
+import math
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ._spool import is_retryable_error
+from ._timing import retry_attempt
+
+# A page as the iterators see it: its converted items, its ``next`` link and the total ``count``.
+Page = Tuple[List[Any], Optional[str], Optional[int]]
+FetchPage = Callable[[Mapping[str, Any]], Page]
+FetchPageAsync = Callable[[Mapping[str, Any]], Awaitable[Page]]
+
+_POLL_INTERVAL = 0.1
+
+
+def next_params(link: str | None, params: Mapping[str, Any]) -> dict[str, Any] | None:
+    """Request parameters for the page behind ``link``, or ``None`` on the last page.
+
+    The query string of the link (absolute or relative) overrides the current
+    parameters, so cursors and server-chosen page sizes carry over. A link
+    without a query string falls back to the next page number.
+    """
+
+    if not link:
+        return None
+    query = {key: values[-1] for key, values in parse_qs(urlsplit(link).query).items()}
+    if not query:
+        query = {"page": int(params.get("page") or 1) + 1}
+    return {**params, **query}
+
+
+def _check_prefetch(prefetch: int) -> None:
+    if prefetch < 0:
+        raise ValueError("prefetch must be zero or more")
+
+
+def iter_items(fetch: FetchPage, params: Mapping[str, Any], prefetch: int = 1) -> Iterator[Any]:
+    """Yield every item across pages, prefetching up to ``prefetch`` pages on a background thread."""
+
+    _check_prefetch(prefetch)
+    return _iter_items(fetch, dict(params), prefetch)
+
+
+def _iter_items(fetch: FetchPage, params: dict[str, Any], prefetch: int) -> Iterator[Any]:
+    if prefetch == 0:
+        current: dict[str, Any] | None = params
+        while current is not None:
+            items, link, _ = fetch(current)
+            yield from items
+            current = next_params(link, current)
+        return
+
+    # A slot is taken before each fetch and given back once the caller starts on that page,
+    # so at most ``prefetch`` pages are ever fetched ahead of the one being consumed.
+    slots = threading.Semaphore(prefetch)
+    pages: queue.SimpleQueue[tuple[str, Any]] = queue.SimpleQueue()
+    stop = threading.Event()
+
+    def produce() -> None:
+        current: dict[str, Any] | None = params
+        try:
+            while current is not None:
+                while not slots.acquire(timeout=_POLL_INTERVAL):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                items, link, _ = fetch(current)
+                pages.put(("page", items))
+                current = next_params(link, current)
+        except Exception as exc:  # handed to the consumer
+            pages.put(("error", exc))
+            return
+        pages.put(("done", None))
+
+    # The worker sees the caller's deadline and timing collectors.
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(produce,), name="intellioptics-prefetch", daemon=True).start()
+    try:
+        while True:
+            kind, value = pages.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            slots.release()
+            yield from value
+    finally:
+        stop.set()
+
+
+def aiter_items(fetch: FetchPageAsync, params: Mapping[str, Any], prefetch: int = 1) -> AsyncIterator[Any]:
+    """Async :func:`iter_items`; pages are prefetched by a task on the running loop."""
+
+    _check_prefetch(prefetch)
+    return _aiter_items(fetch, dict(params), prefetch)
+
+
+async def _aiter_items(fetch: FetchPageAsync, params: dict[str, Any], prefetch: int) -> AsyncIterator[Any]:
+    if prefetch == 0:
+        current: dict[str, Any] | None = params
+        while current is not None:
+            items, link, _ = await fetch(current)
+            for item in items:
+                yield item
+            current = next_params(link, current)
+        return
+
+    slots = asyncio.Semaphore(prefetch)
+    pages: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+
+    async def produce() -> None:
+        current: dict[str, Any] | None = params
+        try:
+            while current is not None:
+                await slots.acquire()
+                items, link, _ = await fetch(current)
+                pages.put_nowait(("page", items))
+                current = next_params(link, current)
+        except Exception as exc:  # handed to the consumer
+            pages.put_nowait(("error", exc))
+            return
+        pages.put_nowait(("done", None))
+
+    worker = asyncio.ensure_future(produce())
+    try:
+        while True:
+            kind, value = await pages.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            slots.release()
+            for item in value:
+                yield item
+    finally:
+        if not worker.done():
+            worker.cancel()
+            await asyncio.wait([worker])
+
+
+# ----------------------------------------------------------------------
+# Parallel fan-out
+# ----------------------------------------------------------------------
+def _remaining_pages(first: Page, params: Mapping[str, Any]) -> list[dict[str, Any]] | None:
+    """Parameters of pages 2..N, or ``None`` when ``count`` is unknown and only ``next`` links work."""
+
+    items, link, count = first
+    if not link:
+        return []
+    if not isinstance(count, int) or not items:
+        return None
+    # A server that caps ``page_size`` pages by its own size; the first page reveals it.
+    per_page = len(items)
+    start = int(params.get("page") or 1)
+    pages = math.ceil(count / per_page)
+    return [{**params, "page": page} for page in range(start + 1, start + pages)]
+
+
+def _check_fan_out(max_workers: int, retries: int) -> None:
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if retries < 0:
+        raise ValueError("retries must be zero or more")
+
+
+def _retry_delay(backoff: float, attempt: int) -> float:
+    return backoff * 2 ** (attempt - 1)
+
+
+def fetch_all(
+    fetch: FetchPage,
+    params: Mapping[str, Any],
+    *,
+    max_workers: int = 8,
+    ordered: bool = True,
+    retries: int = 2,
+    backoff: float = 0.2,
+) -> Iterator[Any]:
+    """Yield every item, fetching pages 2..N on up to ``max_workers`` threads.
+
+    With ``ordered=True`` items come in page order and at most ``max_workers``
+    pages are held at once. ``ordered=False`` yields each page as soon as it
+    arrives. A page failing with a retryable error (see
+    :func:`is_retryable_error`) is retried ``retries`` times with exponential
+    ``backoff``. Without a ``count`` the remaining pages are followed serially.
+    """
+
+    _check_fan_out(max_workers, retries)
+    return _fetch_all(fetch, dict(params), max_workers, ordered, retries, backoff)
+
+
+def _fetch_all(
+    fetch: FetchPage, params: dict[str, Any], max_workers: int, ordered: bool, retries: int, backoff: float
+) -> Iterator[Any]:
+    def fetch_with_retry(page_params: Mapping[str, Any]) -> Page:
+        attempt = 0
+        while True:
+            try:
+                if not attempt:
+                    return fetch(page_params)
+                with retry_attempt(attempt):
+                    return fetch(page_params)
+            except Exception as exc:
+                if attempt >= retries or not is_retryable_error(exc):
+                    raise
+                attempt += 1
+                time.sleep(_retry_delay(backoff, attempt))
+
+    first = fetch_with_retry(params)
+    yield from first[0]
+    pending = _remaining_pages(first, params)
+    if pending is None:
+        yield from _iter_items(fetch_with_retry, next_params(first[1], params) or {}, 0)
+        return
+
+    todo = collections.deque(pending)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="intellioptics-fetch-all") as pool:
+
+        def submit() -> Future:
+            return pool.submit(contextvars.copy_context().run, fetch_with_retry, todo.popleft())
+
+        in_flight: collections.deque[Future] = collections.deque(submit() for _ in range(min(max_workers, len(todo))))
+        try:
+            while in_flight:
+                if ordered:
+                    done = in_flight.popleft()
+                else:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    done = next(future for future in in_flight if future in finished)
+                    in_flight.remove(done)
+                items = done.result()[0]
+                if todo:
+                    in_flight.append(submit())
+                yield from items
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+def afetch_all(
+    fetch: FetchPageAsync,
+    params: Mapping[str, Any],
+    *,
+    max_workers: int = 8,
+    ordered: bool = True,
+    retries: int = 2,
+    backoff: float = 0.2,
+) -> AsyncIterator[Any]:
+    """Async :func:`fetch_all`; ``max_workers`` bounds the page requests in flight on the loop."""
+
+    _check_fan_out(max_workers, retries)
+    return _afetch_all(fetch, dict(params), max_workers, ordered, retries, backoff)
+
+
+async def _afetch_all(
+    fetch: FetchPageAsync, params: dict[str, Any], max_workers: int, ordered: bool, retries: int, backoff: float
+) -> AsyncIterator[Any]:
+    async def fetch_with_retry(page_params: Mapping[str, Any]) -> Page:
+        attempt = 0
+        while True:
+            try:
+                if not attempt:
+                    return await fetch(page_params)
+                with retry_attempt(attempt):
+                    return await fetch(page_params)
+            except Exception as exc:
+                if attempt >= retries or not is_retryable_error(exc):
+                    raise
+                attempt += 1
+                await asyncio.sleep(_retry_delay(backoff, attempt))
+
+    first = await fetch_with_retry(params)
+    for item in first[0]:
+        yield item
+    pending = _remaining_pages(first, params)
+    if pending is None:
+        async for item in _aiter_items(fetch_with_retry, next_params(first[1], params) or {}, 0):
+            yield item
+        return
+
+    todo = collections.deque(pending)
+
+    def submit() -> asyncio.Future:
+        return asyncio.ensure_future(fetch_with_retry(todo.popleft()))
+
+    in_flight: collections.deque[asyncio.Future] = collections.deque(
+        submit() for _ in range(min(max_workers, len(todo)))
+    )
+    try:
+        while in_flight:
+            if ordered:
+                done = in_flight.popleft()
+                await asyncio.wait([done])
+            else:
+                finished, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                done = next(task for task in in_flight if task in finished)
+                in_flight.remove(done)
+            items = done.result()[0]
+            if todo:
+                in_flight.append(submit())
+            for item in items:
+                yield item
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.wait(in_flight)
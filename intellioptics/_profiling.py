@@ -0,0 +1,254 @@
+"""Opt-in profiling of public client methods.
+
+Enable it per client with ``profile=`` or process-wide with environment
+variables, without touching application code::
+
+    INTELLIOPTICS_PROFILE_DIR=/tmp/io-profile   # turn profiling on, write reports here
+    INTELLIOPTICS_PROFILE_EVERY=10              # profile one call in ten per method (default 1)
+    INTELLIOPTICS_PROFILE_INTERVAL=0.001        # stack sampling period in seconds
+    INTELLIOPTICS_PROFILE_MEMORY=1              # also track allocations with tracemalloc
+
+When profiling is off, client methods are not wrapped at all.
+"""
+
+from __future__ import annotations
+
+import atexit
+import collections
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Counter, Union
+
+
+ENV_DIR = "INTELLIOPTICS_PROFILE_DIR"
+ENV_EVERY = "INTELLIOPTICS_PROFILE_EVERY"
+ENV_INTERVAL = "INTELLIOPTICS_PROFILE_INTERVAL"
+ENV_MEMORY = "INTELLIOPTICS_PROFILE_MEMORY"
+
+_TOP_ALLOCATIONS = 25
+
+
+class _StackSampler(threading.Thread):
+    """Record the target thread's stack every ``interval`` seconds as folded stacks."""
+
+    def __init__(self, thread_id: int, interval: float, stacks: Counter[str]) -> None:
+        super().__init__(name="intellioptics-profiler", daemon=True)
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stacks = stacks
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        while not self._halt.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self._stacks[";".join(reversed(names))] += 1
+
+    def halt(self) -> None:
+        self._halt.set()
+        self.join()
+
+
+class Profiler:
+    """Profile one in ``every`` calls of each wrapped method and write reports to ``directory``.
+
+    A sampled call runs under :mod:`cProfile` while a background thread samples
+    its stack every ``interval`` seconds. With ``memory=True`` the allocations
+    it leaves behind are attributed by :mod:`tracemalloc`. :meth:`flush` (run
+    on client close and at exit) writes, per method:
+
+    * ``<method>.pstats`` - cumulative :mod:`pstats` data (``python -m pstats``, snakeviz);
+    * ``<method>.folded`` - folded stacks for ``flamegraph.pl`` or speedscope;
+
+    plus ``allocations.txt`` with the top allocating lines per method.
+
+    Only one call is profiled at a time: calls that overlap a sampled call
+    (nested SDK calls, other threads) run unprofiled.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike[str], *, every: int = 1, interval: float = 0.001, memory: bool = False
+    ) -> None:
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.directory = Path(directory)
+        self.every = every
+        self.interval = interval
+        self.memory = memory
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+        self._calls: Counter[str] = collections.Counter()
+        self._profiled: Counter[str] = collections.Counter()
+        self._stats: dict[str, pstats.Stats] = {}
+        self._stacks: dict[str, Counter[str]] = collections.defaultdict(collections.Counter)
+        self._allocations: dict[str, Counter[str]] = collections.defaultdict(collections.Counter)
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        atexit.register(self.flush)
+
+    # ------------------------------------------------------------------
+    # Wrapping
+    # ------------------------------------------------------------------
+    def instrument(self, client: Any) -> None:
+        """Replace ``client``'s public methods with profiled wrappers (on the instance only)."""
+
+        prefix = type(client).__name__
+        for name, _ in inspect.getmembers(type(client), inspect.isfunction):
+            if not name.startswith("_"):
+                setattr(client, name, self.wrap(f"{prefix}.{name}", getattr(client, name)))
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self._should_sample(name):
+                    return await func(*args, **kwargs)
+                state = self._start()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self._finish(name, state)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not self._should_sample(name):
+                return func(*args, **kwargs)
+            state = self._start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finish(name, state)
+
+        return wrapper
+
+    def _should_sample(self, name: str) -> bool:
+        with self._lock:
+            self._calls[name] += 1
+            if self._calls[name] % self.every:
+                return False
+        # cProfile cannot run twice at once; overlapping calls are simply not sampled.
+        return self._busy.acquire(blocking=False)
+
+    def _start(self) -> tuple[cProfile.Profile | None, _StackSampler, Counter[str], Any]:
+        stacks: Counter[str] = collections.Counter()
+        sampler = _StackSampler(threading.get_ident(), self.interval, stacks)
+        snapshot = tracemalloc.take_snapshot() if self.memory and tracemalloc.is_tracing() else None
+        sampler.start()
+        profile: cProfile.Profile | None = cProfile.Profile()
+        try:
+            profile.enable()  # type: ignore[union-attr]
+        except ValueError:  # another profiler (e.g. the application's own) is active
+            profile = None
+        return profile, sampler, stacks, snapshot
+
+    def _finish(self, name: str, state: tuple[cProfile.Profile | None, _StackSampler, Counter[str], Any]) -> None:
+        profile, sampler, stacks, snapshot = state
+        try:
+            if profile is not None:
+                profile.disable()
+            sampler.halt()
+            allocations = self._allocation_growth(snapshot) if snapshot is not None else None
+        finally:
+            self._busy.release()
+        with self._lock:
+            self._profiled[name] += 1
+            if profile is not None and name in self._stats:
+                self._stats[name].add(profile)
+            elif profile is not None:
+                self._stats[name] = pstats.Stats(profile)
+            self._stacks[name].update(stacks)
+            if allocations:
+                self._allocations[name].update(allocations)
+
+    @staticmethod
+    def _allocation_growth(before: tracemalloc.Snapshot) -> Counter[str]:
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        growth: Counter[str] = collections.Counter()
+        for stat in after.compare_to(before.filter_traces(ignore), "lineno"):
+            if stat.size_diff > 0:
+                frame = stat.traceback[0]
+                growth[f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+        return growth
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Calls seen and calls profiled, per method."""
+
+        with self._lock:
+            return {name: {"calls": count, "profiled": self._profiled[name]} for name, count in self._calls.items()}
+
+    def flush(self) -> list[Path]:
+        """Write the reports gathered so far; returns the files written."""
+
+        with self._lock:
+            if not self._profiled:
+                return []
+            self.directory.mkdir(parents=True, exist_ok=True)
+            written = []
+            for name, stats in self._stats.items():
+                path = self.directory / f"{name}.pstats"
+                stats.dump_stats(path)
+                written.append(path)
+            for name, stacks in self._stacks.items():
+                path = self.directory / f"{name}.folded"
+                path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+                written.append(path)
+            if self._allocations:
+                path = self.directory / "allocations.txt"
+                lines = []
+                for name, growth in sorted(self._allocations.items()):
+                    lines.append(f"{name} ({self._profiled[name]} profiled calls)")
+                    lines += [
+                        f"  {size / 1024:10.1f} KiB  {where}" for where, size in growth.most_common(_TOP_ALLOCATIONS)
+                    ]
+                path.write_text("\n".join(lines) + "\n")
+                written.append(path)
+            return written
+
+
+ProfileOption = Union[Profiler, str, "os.PathLike[str]", None]
+
+_env_profilers: dict[str, Profiler] = {}
+_env_lock = threading.Lock()
+
+
+def resolve_profiler(option: ProfileOption) -> Profiler | None:
+    """Return the profiler for a client's ``profile=`` option, falling back to the environment.
+
+    Environment-configured profilers are shared per directory so every client in
+    the process contributes to the same reports.
+    """
+
+    if isinstance(option, Profiler):
+        return option
+    directory = os.fspath(option) if option is not None else os.getenv(ENV_DIR)
+    if not directory:
+        return None
+    with _env_lock:
+        profiler = _env_profilers.get(directory)
+        if profiler is None:
+            profiler = _env_profilers[directory] = Profiler(
+                directory,
+                every=int(os.getenv(ENV_EVERY) or 1),
+                interval=float(os.getenv(ENV_INTERVAL) or 0.001),
+                memory=os.getenv(ENV_MEMORY) == "1",
+            )
+        return profiler
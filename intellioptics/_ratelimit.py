@@ -0,0 +1,206 @@
+"""Token-bucket rate limiting helpers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable, Mapping
+
+
+UPLOAD = "upload"
+POLL = "poll"
+MANAGEMENT = "management"
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    ``burst`` caps how many tokens can accumulate while idle; it defaults to one
+    second worth of tokens (at least one).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rate = float(rate)
+        self._burst = float(burst) if burst is not None else max(1.0, float(rate))
+        self._tokens = self._burst
+        self._updated = clock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill(self._clock())
+            self._rate = max(float(rate), 1e-6)
+            self._tokens = min(self._tokens, self._burst)
+
+    def pause(self, seconds: float) -> None:
+        """Withhold tokens for ``seconds`` (used to honour ``Retry-After``)."""
+
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, -seconds * self._rate)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` if available and return ``0.0``; otherwise return the seconds to wait."""
+
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self._rate
+
+    def acquire(self, tokens: float = 1.0, timeout: float | None = None) -> bool:
+        """Block until ``tokens`` are available.
+
+        Returns ``False`` without taking them as soon as the wait is known to
+        outlast ``timeout``.
+        """
+
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay == 0.0:
+                return True
+            if deadline is not None and delay > deadline - self._clock():
+                return False
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1.0, timeout: float | None = None) -> bool:
+        """Asyncio-friendly :meth:`acquire` that yields to the event loop while waiting."""
+
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay == 0.0:
+                return True
+            if deadline is not None and delay > deadline - self._clock():
+                return False
+            await asyncio.sleep(delay)
+
+
+def classify_request(method: str, path: str) -> str:
+    """Map a request onto the endpoint class used for rate limiting."""
+
+    route = path.split("?", 1)[0]
+    if "://" in route:
+        route = "/" + route.split("://", 1)[1].partition("/")[2]
+    route = route.rstrip("/")
+    if route.startswith("/v1/image-queries"):
+        if method.upper() == "POST":
+            return UPLOAD
+        if method.upper() == "GET" and route.count("/") >= 3:
+            return POLL
+    return MANAGEMENT
+
+
+class RateLimiter:
+    """Client-side rate limits per endpoint class that back off on ``429`` responses.
+
+    ``rates`` maps endpoint classes (``"upload"``, ``"poll"`` and
+    ``"management"``) to requests per second; classes without an entry are not
+    limited. A ``429`` cuts the class rate by ``decrease_factor`` (at most once
+    per second) and honours ``Retry-After``; successful responses then raise it
+    linearly back to the configured rate over ``recovery_seconds``. One instance
+    may be shared by several clients, threads and event loops.
+    """
+
+    def __init__(
+        self,
+        rates: Mapping[str, float],
+        *,
+        burst: Mapping[str, float] | None = None,
+        decrease_factor: float = 0.5,
+        min_rate: float = 0.1,
+        recovery_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._targets = {name: float(rate) for name, rate in rates.items()}
+        self._buckets = {
+            name: TokenBucket(rate, (burst or {}).get(name), clock=clock) for name, rate in self._targets.items()
+        }
+        self._decrease_factor = decrease_factor
+        self._min_rate = min_rate
+        self._recovery_seconds = recovery_seconds
+        self._last_adjusted = dict.fromkeys(self._targets, float("-inf"))
+        # Separate from ``_last_adjusted`` so increases never hold off the next cut.
+        self._last_decreased = dict.fromkeys(self._targets, float("-inf"))
+        self._throttled = dict.fromkeys(self._targets, 0)
+
+    def acquire(self, method: str, path: str, timeout: float | None = None) -> bool:
+        """Wait for a token; ``False`` (and no token) when the wait would outlast ``timeout``."""
+
+        bucket = self._buckets.get(classify_request(method, path))
+        return bucket is None or bucket.acquire(timeout=timeout)
+
+    async def acquire_async(self, method: str, path: str, timeout: float | None = None) -> bool:
+        bucket = self._buckets.get(classify_request(method, path))
+        return bucket is None or await bucket.acquire_async(timeout=timeout)
+
+    def try_acquire(self, method: str, path: str) -> bool:
+        """Take a token only if one is available right now."""
+
+        bucket = self._buckets.get(classify_request(method, path))
+        return bucket is None or bucket.try_acquire() == 0.0
+
+    def record(self, method: str, path: str, status_code: int, retry_after: str | None = None) -> None:
+        """Feed a response status back into the limiter for the request's endpoint class."""
+
+        name = classify_request(method, path)
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            return
+        now = self._clock()
+        with self._lock:
+            target = self._targets[name]
+            if status_code == 429:
+                self._throttled[name] += 1
+                if now - self._last_decreased[name] >= 1.0:
+                    bucket.set_rate(max(self._min_rate, bucket.rate * self._decrease_factor))
+                    self._last_decreased[name] = self._last_adjusted[name] = now
+                delay = _parse_retry_after(retry_after)
+                if delay:
+                    bucket.pause(delay)
+            elif status_code < 400 and bucket.rate < target:
+                elapsed = now - self._last_adjusted[name]
+                step = target * elapsed / self._recovery_seconds if self._recovery_seconds > 0 else target
+                bucket.set_rate(min(target, bucket.rate + step))
+                self._last_adjusted[name] = now
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                name: {"rate": bucket.rate, "target": self._targets[name], "throttled": self._throttled[name]}
+                for name, bucket in self._buckets.items()
+            }
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:  # HTTP-date form is not worth parsing here
+        return None
@@ -0,0 +1,299 @@
+"""Priority and fairness scheduling in front of ``submit_image_query``."""
+
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Hashable
+
+from ._ratelimit import TokenBucket
+from .client import IntelliOptics, _detector_identifier
+from .models import Detector, ImageQuery
+
+
+PRIORITY_CRITICAL = 0
+PRIORITY_HIGH = 1
+PRIORITY_NORMAL = 2
+PRIORITY_LOW = 3
+
+_WAIT_SAMPLES = 1024
+
+
+@dataclass
+class _Job:
+    detector_id: str
+    source: Hashable
+    priority: int
+    start_tag: float
+    finish_tag: float
+    enqueued_at: float
+    image: Any
+    kwargs: dict[str, Any]
+    future: Future = field(default_factory=Future)
+
+
+@dataclass
+class _PriorityClass:
+    virtual_time: float = 0.0
+    queues: dict[Hashable, Deque[_Job]] = field(default_factory=dict)
+    last_finish: dict[Hashable, float] = field(default_factory=dict)
+
+
+@dataclass
+class _WaitStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    samples: Deque[float] = field(default_factory=lambda: collections.deque(maxlen=_WAIT_SAMPLES))
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+    def summary(self) -> dict[str, float]:
+        ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else 0.0
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p95": p95,
+            "max": self.max,
+        }
+
+
+class SubmissionScheduler:
+    """Dispatch image queries by priority class with weighted fairness across sources.
+
+    Jobs are grouped by priority class (lower numbers are served first). Within
+    a class, camera sources are interleaved using weighted fair queuing so one
+    chatty source cannot starve the others. Per-detector concurrency caps and an
+    optional global requests-per-second budget are enforced before dispatch.
+    """
+
+    def __init__(
+        self,
+        client: IntelliOptics,
+        *,
+        max_workers: int = 8,
+        max_rps: float | None = None,
+        default_priority: int = PRIORITY_NORMAL,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._client = client
+        self._max_workers = max_workers
+        self._bucket = TokenBucket(max_rps) if max_rps else None
+        self._default_priority = default_priority
+
+        self._cond = threading.Condition()
+        self._classes: dict[int, _PriorityClass] = {}
+        self._detector_priority: dict[str, int] = {}
+        self._detector_caps: dict[str, int] = {}
+        self._source_weights: dict[Hashable, float] = {}
+        self._in_flight: collections.Counter[str] = collections.Counter()
+        self._active = 0
+        self._wait_by_priority: dict[int, _WaitStats] = collections.defaultdict(_WaitStats)
+        self._wait_by_detector: dict[str, _WaitStats] = collections.defaultdict(_WaitStats)
+        self._dispatched = 0
+        self._running = True
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="intellioptics-sched")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="intellioptics-sched-dispatch", daemon=True)
+        self._dispatcher.start()
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+    def configure_detector(
+        self,
+        detector: Detector | str,
+        *,
+        priority: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        """Assign a priority class and/or concurrency cap to ``detector``."""
+
+        detector_id = _detector_identifier(detector)
+        if detector_id is None:
+            raise ValueError("detector is required")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        with self._cond:
+            if priority is not None:
+                self._detector_priority[detector_id] = priority
+            if max_concurrency is not None:
+                self._detector_caps[detector_id] = max_concurrency
+            self._cond.notify_all()
+
+    def configure_source(self, source: Hashable, *, weight: float) -> None:
+        """Set the fair-share ``weight`` of a camera source (default ``1.0``)."""
+
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        with self._cond:
+            self._source_weights[source] = weight
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        detector: Detector | str,
+        image: Any,
+        *,
+        source: Hashable = "default",
+        priority: int | None = None,
+        **submit_kwargs: Any,
+    ) -> "Future[ImageQuery]":
+        """Queue a ``submit_image_query`` call and return a future for its result."""
+
+        detector_id = _detector_identifier(detector)
+        if detector_id is None:
+            raise ValueError("detector is required")
+
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("scheduler has been shut down")
+            level = priority if priority is not None else self._detector_priority.get(detector_id, self._default_priority)
+            klass = self._classes.setdefault(level, _PriorityClass())
+            weight = self._source_weights.get(source, 1.0)
+            start = max(klass.virtual_time, klass.last_finish.get(source, 0.0))
+            finish = start + 1.0 / weight
+            klass.last_finish[source] = finish
+            job = _Job(detector_id, source, level, start, finish, time.monotonic(), image, submit_kwargs)
+            klass.queues.setdefault(source, collections.deque()).append(job)
+            self._cond.notify_all()
+        return job.future
+
+    def _eligible(self, job: _Job) -> bool:
+        cap = self._detector_caps.get(job.detector_id)
+        return cap is None or self._in_flight[job.detector_id] < cap
+
+    def _select(self) -> _Job | None:
+        """Pop the next job: best priority class first, then the smallest finish tag."""
+
+        for level in sorted(self._classes):
+            klass = self._classes[level]
+            best: tuple[Deque[_Job], _Job] | None = None
+            for queue in klass.queues.values():
+                for job in queue:
+                    if self._eligible(job):
+                        if best is None or job.finish_tag < best[1].finish_tag:
+                            best = (queue, job)
+                        break
+            if best is not None:
+                queue, job = best
+                queue.remove(job)
+                if not queue:
+                    del klass.queues[job.source]
+                klass.virtual_time = max(klass.virtual_time, job.start_tag)
+                return job
+        return None
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running and not self._has_jobs():
+                        return
+                    job = self._select() if self._active < self._max_workers else None
+                    if job is not None:
+                        break
+                    self._cond.wait()
+                self._active += 1
+                self._in_flight[job.detector_id] += 1
+            # Spend a token only once there is a job to send, so an idle dispatcher holds none.
+            if self._bucket is not None:
+                self._bucket.acquire()
+            with self._cond:
+                self._dispatched += 1
+                waited = time.monotonic() - job.enqueued_at
+                self._wait_by_priority[job.priority].add(waited)
+                self._wait_by_detector[job.detector_id].add(waited)
+            try:
+                self._executor.submit(self._run, job)
+            except RuntimeError:
+                # ``shutdown(wait=False)`` closed the executor after this job was selected.
+                job.future.cancel()
+                self._finish(job)
+
+    def _has_jobs(self) -> bool:
+        return any(klass.queues for klass in self._classes.values())
+
+    def _run(self, job: _Job) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            self._finish(job)
+            return
+        try:
+            result = self._client.submit_image_query(job.detector_id, job.image, **job.kwargs)
+        except BaseException as exc:
+            job.future.set_exception(exc)
+        else:
+            job.future.set_result(result)
+        finally:
+            self._finish(job)
+
+    def _finish(self, job: _Job) -> None:
+        with self._cond:
+            self._active -= 1
+            self._in_flight[job.detector_id] -= 1
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Observability and lifecycle
+    # ------------------------------------------------------------------
+    def stats(self) -> dict[str, Any]:
+        """Return queue depths, in-flight counts and wait-time summaries."""
+
+        with self._cond:
+            by_priority: dict[int, int] = {}
+            by_source: collections.Counter[Hashable] = collections.Counter()
+            by_detector: collections.Counter[str] = collections.Counter()
+            for level, klass in self._classes.items():
+                for source, queue in klass.queues.items():
+                    by_priority[level] = by_priority.get(level, 0) + len(queue)
+                    by_source[source] += len(queue)
+                    for job in queue:
+                        by_detector[job.detector_id] += 1
+            return {
+                "queued": sum(by_priority.values()),
+                "active": self._active,
+                "dispatched": self._dispatched,
+                "queue_depth": {
+                    "priority": by_priority,
+                    "source": dict(by_source),
+                    "detector": dict(by_detector),
+                },
+                "in_flight": {key: value for key, value in self._in_flight.items() if value},
+                "wait_seconds": {
+                    "priority": {level: stats.summary() for level, stats in self._wait_by_priority.items()},
+                    "detector": {det: stats.summary() for det, stats in self._wait_by_detector.items()},
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs; with ``wait`` the queued jobs are drained first."""
+
+        with self._cond:
+            self._running = False
+            if not wait:
+                for klass in self._classes.values():
+                    for queue in klass.queues.values():
+                        for job in queue:
+                            job.future.cancel()
+                    klass.queues.clear()
+            self._cond.notify_all()
+        if wait:
+            self._dispatcher.join()
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "SubmissionScheduler":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
@@ -0,0 +1,508 @@
+"""In-memory stand-in for the IntelliOptics API, for benchmarks and offline tests.
+
+The server implements the routes in ``spec/openapi.json`` (plus the paths the
+SDK clients call) on top of :class:`http.server.ThreadingHTTPServer` with
+HTTP/1.1 keep-alive, so both clients can drive it at thousands of requests per
+second from the same machine::
+
+    with LocalServer(latency=(0.005, 0.050), confident_after=0.5) as server:
+        client = IntelliOptics(endpoint=server.url, api_token="local")
+        ...
+
+It can also be started from a shell with ``python -m intellioptics._server``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import email.parser
+import email.policy
+import itertools
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Mapping, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from ._ratelimit import TokenBucket
+
+
+LatencySpec = Union[float, Tuple[float, float], Callable[[], float], None]
+
+_JSON = "application/json"
+_LABELS = ("YES", "NO")
+
+
+def _latency_sampler(spec: LatencySpec, rng: random.Random) -> Callable[[], float]:
+    """Turn a latency spec into a sampler.
+
+    A number is a constant delay, a ``(median, p99)`` pair is a log-normal
+    distribution with those quantiles, and a callable is used as-is.
+    """
+
+    if spec is None:
+        return lambda: 0.0
+    if callable(spec):
+        return spec
+    if isinstance(spec, tuple):
+        median, p99 = spec
+        if median <= 0 or p99 < median:
+            raise ValueError("latency tuple must be (median, p99) with 0 < median <= p99")
+        mu = math.log(median)
+        sigma = (math.log(p99) - mu) / 2.326  # z-score of the 99th percentile
+        return lambda: rng.lognormvariate(mu, sigma)
+    delay = float(spec)
+    return lambda: delay
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class _State:
+    """Detectors, image queries and labels held in memory."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.detectors: dict[str, dict[str, Any]] = {}
+        self.queries: dict[str, dict[str, Any]] = {}
+        self.images: dict[str, bytes] = {}
+        self.labels: list[dict[str, Any]] = []
+        self.feedback: list[dict[str, Any]] = []
+
+
+class LocalServer:
+    """Serve an in-memory IntelliOptics API on ``host``/``port`` (``0`` picks a free port).
+
+    ``latency`` delays every response except ``/healthz`` (see
+    :func:`_latency_sampler`); ``error_rate`` is the fraction of requests
+    answered with ``503``; ``throttle_rps`` answers requests beyond that rate
+    with ``429`` and ``Retry-After``. New image queries start ``PENDING`` at
+    ``initial_confidence`` and turn ``DONE`` at ``confidence`` after
+    ``confident_after`` seconds; a submission's ``wait`` holds the response
+    until then, as the hosted API does. When ``api_token`` is set, requests
+    without the matching bearer token get ``401``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: LatencySpec = None,
+        error_rate: float = 0.0,
+        throttle_rps: float | None = None,
+        confident_after: float = 0.0,
+        confidence: float = 0.95,
+        initial_confidence: float = 0.5,
+        api_token: str | None = None,
+        seed: int | None = None,
+    ) -> None:
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._latency = _latency_sampler(latency, self._rng)
+        self.error_rate = error_rate
+        self.confident_after = confident_after
+        self.confidence = confidence
+        self.initial_confidence = initial_confidence
+        self.api_token = api_token
+        self._throttle = TokenBucket(throttle_rps) if throttle_rps else None
+        self._state = _State()
+        self._ids = itertools.count(1)
+        self._counters: collections.Counter[str] = collections.Counter()
+        self._counter_lock = threading.Lock()
+
+        handler = type("_BoundHandler", (_Handler,), {"server_state": self})
+        self._httpd = _Server((host, port), handler)
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, args=(0.05,), name="intellioptics-local-server", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "LocalServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, int]:
+        """Return request counts keyed by ``"METHOD route status"``."""
+
+        with self._counter_lock:
+            return dict(self._counters)
+
+    # ------------------------------------------------------------------
+    # Behaviour knobs used by the handler
+    # ------------------------------------------------------------------
+    def _random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _sample_latency(self) -> float:
+        with self._rng_lock:
+            return max(0.0, self._latency())
+
+    def _count(self, method: str, route: str, status: int) -> None:
+        with self._counter_lock:
+            self._counters[f"{method} {route} {status}"] += 1
+
+    # ------------------------------------------------------------------
+    # Domain operations
+    # ------------------------------------------------------------------
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}_{next(self._ids):06d}{uuid.uuid4().hex[:8]}"
+
+    def create_detector(self, body: Mapping[str, Any]) -> dict[str, Any]:
+        detector = {
+            "id": self._new_id("det"),
+            "name": body.get("name") or "detector",
+            "query": body.get("query") or body.get("name") or "",
+            "group_name": body.get("group_name"),
+            "mode": body.get("mode") or "BINARY",
+            "confidence_threshold": body.get("confidence_threshold", 0.9),
+            "patience_time": body.get("patience_time", 30.0),
+            "metadata": _decode_metadata(body.get("metadata")),
+            "labels": list(body.get("labels") or []),
+            "type": "detector",
+            "created_at": _now_iso(),
+        }
+        with self._state.lock:
+            self._state.detectors[detector["id"]] = detector
+        return detector
+
+    def create_image_query(self, fields: Mapping[str, Any], image: bytes | None) -> tuple[int, dict[str, Any]]:
+        detector_id = fields.get("detector_id")
+        if not detector_id:
+            return 422, _validation_error("detector_id", "field required")
+        query_id = fields.get("image_query_id") or self._new_id("iq")
+        with self._rng_lock:
+            label = self._rng.choice(_LABELS)
+        record = {
+            "id": query_id,
+            "detector_id": detector_id,
+            "created_at": _now_iso(),
+            "created_monotonic": time.monotonic(),
+            "confidence_threshold": _as_float(fields.get("confidence_threshold")) or 0.9,
+            "patience_time": _as_float(fields.get("patience_time")) or 30.0,
+            "metadata": _decode_metadata(fields.get("metadata")),
+            "inspection_id": fields.get("inspection_id"),
+            "label": label,
+        }
+        with self._state.lock:
+            if query_id in self._state.queries:
+                return 409, {"detail": f"image query {query_id} already exists"}
+            self._state.queries[query_id] = record
+            if image:
+                self._state.images[query_id] = image
+
+        wait = _as_float(fields.get("wait")) or 0.0
+        if wait > 0 and self.confident_after > 0:
+            time.sleep(min(wait, self.confident_after))
+        return 200, self._render(record)
+
+    def get_image_query(self, query_id: str) -> dict[str, Any] | None:
+        with self._state.lock:
+            record = self._state.queries.get(query_id)
+        return None if record is None else self._render(record)
+
+    def _render(self, record: Mapping[str, Any]) -> dict[str, Any]:
+        age = time.monotonic() - record["created_monotonic"]
+        done = age >= self.confident_after
+        confidence = self.confidence if done else self.initial_confidence
+        return {
+            "id": record["id"],
+            "image_query_id": record["id"],
+            "detector_id": record["detector_id"],
+            "created_at": record["created_at"],
+            "status": "DONE" if done else "PENDING",
+            "done_processing": done,
+            "answer": record["label"],
+            "label": record["label"],
+            "confidence": confidence,
+            "confidence_threshold": record["confidence_threshold"],
+            "patience_time": record["patience_time"],
+            "metadata": record["metadata"],
+            "result_type": "binary_classification",
+            "latency_ms": int(age * 1000),
+            "model_version": "local",
+        }
+
+
+def _as_float(value: Any) -> float | None:
+    if value in (None, "", "null"):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _decode_metadata(value: Any) -> Any:
+    if isinstance(value, (bytes, str)) and value:
+        try:
+            return json.loads(value)
+        except ValueError:
+            return {"value": value if isinstance(value, str) else value.decode("utf-8", "replace")}
+    return value or None
+
+
+def _validation_error(field: str, message: str) -> dict[str, Any]:
+    return {"detail": [{"loc": ["body", field], "msg": message, "type": "value_error"}]}
+
+
+def _parse_multipart(content_type: str, body: bytes) -> tuple[dict[str, Any], bytes | None]:
+    header = f"Content-Type: {content_type}\r\n\r\n".encode("latin-1")
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(header + body)
+    fields: dict[str, Any] = {}
+    image: bytes | None = None
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True) or b""
+        if name == "image":
+            image = payload
+        elif name:
+            fields[name] = payload.decode("utf-8", "replace")
+    return fields, image
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_state: LocalServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # silence per-request logging
+        pass
+
+    # ------------------------------------------------------------------
+    # Plumbing
+    # ------------------------------------------------------------------
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(
+        self,
+        status: int,
+        payload: Any,
+        route: str,
+        *,
+        content_type: str = _JSON,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        # Count first: a client may read stats() as soon as it has the response.
+        self.server_state._count(self.command, route, status)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self) -> None:
+        server = self.server_state
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        body = self._read_body()
+
+        if path == "/healthz":
+            self._send(200, {"status": "ok"}, "/healthz")
+            return
+        if server.api_token is not None and self.headers.get("Authorization") != f"Bearer {server.api_token}":
+            self._send(401, {"detail": "invalid token"}, path)
+            return
+        if server._throttle is not None:
+            wait = server._throttle.try_acquire()
+            if wait:
+                self._send(429, {"detail": "rate limited"}, path, headers={"Retry-After": f"{wait:.3f}"})
+                return
+        delay = server._sample_latency()
+        if delay:
+            time.sleep(delay)
+        if server.error_rate and server._random() < server.error_rate:
+            self._send(503, {"detail": "injected failure"}, path)
+            return
+
+        route, status, payload = self._route(self.command, path, query, body)
+        if isinstance(payload, bytes):
+            self._send(status, payload, route, content_type="image/jpeg")
+        else:
+            self._send(status, payload, route)
+
+    def _route(self, method: str, path: str, query: Mapping[str, str], body: bytes) -> tuple[str, int, Any]:
+        server = self.server_state
+        state = server._state
+        segments = path.strip("/").split("/")
+
+        if method == "GET" and path == "/v1/users/me":
+            return path, 200, {"id": "local-user", "email": "local@example.com", "name": "Local User", "roles": []}
+
+        if path == "/v1/detectors":
+            if method == "POST":
+                return path, 200, server.create_detector(_json_body(body))
+            if method == "GET":
+                with state.lock:
+                    detectors = list(state.detectors.values())
+                return path, 200, _page(detectors, query)
+
+        if len(segments) == 3 and segments[:2] == ["v1", "detectors"] and method == "GET":
+            with state.lock:
+                detector = state.detectors.get(segments[2])
+            if detector is None:
+                return "/v1/detectors/{id}", 404, {"detail": "detector not found"}
+            return "/v1/detectors/{id}", 200, detector
+
+        if method == "POST" and path == "/v1/image-queries":
+            content_type = self.headers.get("Content-Type", "")
+            if content_type.startswith("multipart/"):
+                fields, image = _parse_multipart(content_type, body)
+            else:
+                fields, image = {**query, **_json_body(body)}, None
+            status, payload = server.create_image_query(fields, image)
+            return path, status, payload
+
+        if method == "POST" and path in ("/v1/image-queries/json", "/v1/image-queries-json"):
+            fields = _json_body(body)
+            image = fields.pop("image", None)
+            status, payload = server.create_image_query(fields, image.encode() if isinstance(image, str) else None)
+            return "/v1/image-queries/json", status, payload
+
+        if method == "GET" and path == "/v1/image-queries":
+            with state.lock:
+                records = list(state.queries.values())
+            if query.get("detector_id"):
+                records = [record for record in records if record["detector_id"] == query["detector_id"]]
+            return path, 200, _page([server._render(record) for record in records], query)
+
+        if method == "GET" and len(segments) in (3, 4) and segments[:2] == ["v1", "image-queries"]:
+            if len(segments) == 4 and segments[3] == "image":
+                with state.lock:
+                    image = state.images.get(segments[2])
+                if image is None:
+                    return "/v1/image-queries/{id}/image", 404, {"detail": "image not found"}
+                return "/v1/image-queries/{id}/image", 200, image
+            payload = server.get_image_query(segments[2])
+            if payload is None:
+                return "/v1/image-queries/{id}", 404, {"detail": "image query not found"}
+            return "/v1/image-queries/{id}", 200, payload
+
+        if method == "POST" and path == "/v1/feedback":
+            feedback = _json_body(body)
+            if not (feedback.get("iq_id") or feedback.get("image_query_id")):
+                return path, 422, _validation_error("iq_id", "field required")
+            with state.lock:
+                state.feedback.append(feedback)
+            return path, 200, {"status": "ok"}
+
+        if method == "POST" and path == "/v1/labels":
+            label = _json_body(body)
+            if not label.get("image_query_id") or "label" not in label:
+                return path, 422, _validation_error("label", "image_query_id and label are required")
+            record = {**label, "id": server._new_id("lbl"), "created_at": _now_iso()}
+            with state.lock:
+                state.labels.append(record)
+            return path, 200, record
+
+        return path, 404, {"detail": f"{method} {path} is not implemented by the local server"}
+
+    def do_GET(self) -> None:
+        self._dispatch()
+
+    def do_POST(self) -> None:
+        self._dispatch()
+
+
+def _json_body(body: bytes) -> dict[str, Any]:
+    if not body:
+        return {}
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _page(items: list[dict[str, Any]], query: Mapping[str, str]) -> dict[str, Any]:
+    page = max(1, int(query.get("page") or 1))
+    page_size = max(1, int(query.get("page_size") or 10))
+    start = (page - 1) * page_size
+    results = items[start : start + page_size]
+    has_next = start + page_size < len(items)
+    return {
+        "count": len(items),
+        "next": f"?page={page + 1}&page_size={page_size}" if has_next else None,
+        "previous": f"?page={page - 1}&page_size={page_size}" if page > 1 else None,
+        "results": results,
+        "items": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover - manual entry point
+    parser = argparse.ArgumentParser(description="Run a local in-memory IntelliOptics API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, nargs="+", help="constant seconds, or MEDIAN P99")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rps", type=float)
+    parser.add_argument("--confident-after", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    latency: LatencySpec = None
+    if args.latency:
+        latency = args.latency[0] if len(args.latency) == 1 else (args.latency[0], args.latency[1])
+    server = LocalServer(
+        args.host,
+        args.port,
+        latency=latency,
+        error_rate=args.error_rate,
+        throttle_rps=args.throttle_rps,
+        confident_after=args.confident_after,
+        seed=args.seed,
+    )
+    print(f"IntelliOptics local server listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,390 @@
+"""Soak testing: run a long mixed workload and watch for memory, fd and connection growth."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from io import BytesIO
+from typing import Any, Callable, Iterator
+
+from .client import AsyncIntelliOptics, ExperimentalApi, IntelliOptics
+
+try:  # pragma: no cover - optional dependency
+    import psutil
+except Exception:  # pragma: no cover - psutil is optional
+    psutil = None  # type: ignore[assignment]
+
+
+TARGETS = ("sync", "async", "experimental")
+_MB = 1024 * 1024
+# One frame per trace keeps tracemalloc's overhead tolerable and is all ``lineno`` stats need.
+_TRACE_FRAMES = 1
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+
+@dataclass(frozen=True)
+class SoakThresholds:
+    """Allowed growth between the start (after warm-up) and the end of a soak run."""
+
+    rss_mb: float = 32.0
+    traced_mb: float = 8.0
+    fds: int = 8
+    connections: int = 10
+
+
+@dataclass
+class SoakSample:
+    elapsed: float
+    iterations: int
+    rss: int | None
+    traced: int
+    fds: int | None
+    connections: int | None
+
+
+@dataclass
+class SoakReport:
+    target: str
+    duration: float
+    iterations: int = 0
+    errors: int = 0
+    samples: list[SoakSample] = field(default_factory=list)
+    growth: dict[str, float] = field(default_factory=dict)
+    failures: list[str] = field(default_factory=list)
+    top_allocations: list[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "passed": self.passed}
+
+    def format_table(self) -> str:
+        lines = [f"{'elapsed':>8} {'iters':>7} {'rss MB':>8} {'traced MB':>10} {'fds':>5} {'conns':>6}"]
+        for sample in self.samples:
+            lines.append(
+                f"{sample.elapsed:8.1f} {sample.iterations:7d} {_mb(sample.rss):>8} {_mb(sample.traced):>10} "
+                f"{_opt(sample.fds):>5} {_opt(sample.connections):>6}"
+            )
+        lines.append("")
+        lines.append(f"{self.target}: {self.iterations} iterations, {self.errors} errors")
+        lines += [f"growth {name}: {value:+.2f}" for name, value in self.growth.items()]
+        if self.top_allocations:
+            lines.append("top allocation growth:")
+            lines += [f"  {line}" for line in self.top_allocations]
+        lines.append("PASS" if self.passed else "FAIL: " + "; ".join(self.failures))
+        return "\n".join(lines)
+
+
+def _mb(value: int | None) -> str:
+    return "-" if value is None else f"{value / _MB:.1f}"
+
+
+def _opt(value: int | None) -> str:
+    return "-" if value is None else str(value)
+
+
+# ----------------------------------------------------------------------
+# Process probes
+# ----------------------------------------------------------------------
+def rss_bytes() -> int | None:
+    """Current resident set size of this process, or ``None`` when it cannot be read."""
+
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def open_fds() -> int | None:
+    """Number of open file descriptors (sockets included), or ``None`` when unsupported."""
+
+    for directory in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(directory))
+        except OSError:
+            continue
+    if psutil is not None and hasattr(psutil.Process, "num_handles"):
+        return psutil.Process().num_handles()
+    return None
+
+
+def open_connections(client: Any) -> int | None:
+    """Open pooled connections held by a client's HTTP layer (sync or async)."""
+
+    http = getattr(client, "_http", None)
+    if http is None and isinstance(client, ExperimentalApi):
+        http = client._http or client._async_http
+    session = getattr(http, "_session", None)
+    if session is not None:
+        return sum(_urllib3_open(pool) for pool in _urllib3_pools(session))
+    transport = getattr(getattr(http, "_client", None), "_transport", None)
+    connections = getattr(getattr(transport, "_pool", None), "connections", None)
+    return None if connections is None else len(connections)
+
+
+def _urllib3_pools(session: Any) -> Iterator[Any]:
+    for adapter in session.adapters.values():
+        unix_pool = getattr(adapter, "_unix_pool", None)
+        if unix_pool is not None:
+            yield unix_pool
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is not None:
+            yield from list(manager.pools._container.values())
+
+
+def _urllib3_open(pool: Any) -> int:
+    queue = getattr(getattr(pool, "pool", None), "queue", None) or ()
+    return sum(1 for conn in list(queue) if conn is not None and getattr(conn, "sock", None) is not None)
+
+
+# ----------------------------------------------------------------------
+# Local server in a child process, so its in-memory store does not count
+# ----------------------------------------------------------------------
+# ``-m intellioptics._server`` would warn that the package already imported the module.
+_SERVER_MAIN = "import sys; from intellioptics._server import main; main(sys.argv[1:])"
+
+
+class _ServerProcess:
+    def __init__(self, *args: str) -> None:
+        self._process = subprocess.Popen(
+            [sys.executable, "-u", "-c", _SERVER_MAIN, "--port", "0", *args],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        line = self._process.stdout.readline() if self._process.stdout else ""
+        if "http://" not in line:
+            self.stop()
+            raise RuntimeError(f"local server failed to start: {line!r}")
+        self.url = line.strip().rsplit(" ", 1)[-1]
+
+    def stop(self) -> None:
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:  # pragma: no cover - defensive
+            self._process.kill()
+        if self._process.stdout:
+            self._process.stdout.close()
+
+
+# ----------------------------------------------------------------------
+# Workloads
+# ----------------------------------------------------------------------
+def _frame() -> bytes:
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", (64, 48), color=(90, 120, 150)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def _sync_iteration(client: IntelliOptics, detector: str, image: bytes) -> None:
+    query = client.submit_image_query(detector, image, wait=0)
+    client.get_image_query(query.id)
+    client.list_image_queries(page_size=20, detector_id=detector)
+    client.submit_feedback(image_query_id=query.id, correct_label="YES")
+
+
+async def _async_iteration(client: AsyncIntelliOptics, detector: str, image: bytes) -> None:
+    query = await client.submit_image_query(detector, image, wait=0)
+    await client.get_image_query(query.id)
+    await client.list_image_queries(page_size=20, detector_id=detector)
+    await client.submit_feedback(image_query_id=query.id, correct_label="YES")
+
+
+def _experimental_iteration(api: ExperimentalApi, detector: str, image: bytes) -> None:
+    response = api.make_generic_api_request(
+        endpoint="/v1/image-queries",
+        method="POST",
+        files={"image": ("image.jpg", image, "image/jpeg")},
+        data={"detector_id": detector, "wait": "0"},
+    )
+    query_id = response.body["id"]
+    api.make_generic_api_request(endpoint=f"/v1/image-queries/{query_id}", method="GET")
+    api.make_generic_api_request(endpoint=f"/v1/image-queries?page_size=20&detector_id={detector}", method="GET")
+    api.make_generic_api_request(
+        endpoint="/v1/feedback", method="POST", body={"image_query_id": query_id, "correct_label": "YES"}
+    )
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+class _Sampler:
+    def __init__(self, report: SoakReport, interval: float, warmup: float) -> None:
+        self.report = report
+        self.interval = interval
+        self.warmup = warmup
+        self.started = time.monotonic()
+        self._next = self.started + warmup
+        self.baseline: tracemalloc.Snapshot | None = None
+
+    def due(self) -> bool:
+        return time.monotonic() >= self._next
+
+    def sample(self, client: Any) -> None:
+        if self.baseline is None:
+            self.baseline = tracemalloc.take_snapshot()
+        self.report.samples.append(
+            SoakSample(
+                elapsed=time.monotonic() - self.started,
+                iterations=self.report.iterations,
+                rss=rss_bytes(),
+                traced=tracemalloc.get_traced_memory()[0],
+                fds=open_fds(),
+                connections=open_connections(client),
+            )
+        )
+        self._next = time.monotonic() + self.interval
+
+
+def _window(values: list[float]) -> tuple[float, float]:
+    """Median of the first and of the last three samples, to ride out GC and allocator noise."""
+
+    return statistics.median(values[:3]), statistics.median(values[-3:])
+
+
+def evaluate(report: SoakReport, thresholds: SoakThresholds) -> None:
+    """Fill ``report.growth`` and ``report.failures`` from its samples."""
+
+    samples = report.samples
+    if len(samples) < 2:
+        report.failures.append("not enough samples; run longer or sample more often")
+        return
+    limits: dict[str, tuple[Callable[[SoakSample], float | None], float, float]] = {
+        "rss_mb": (lambda s: s.rss, thresholds.rss_mb, _MB),
+        "traced_mb": (lambda s: s.traced, thresholds.traced_mb, _MB),
+        "fds": (lambda s: s.fds, thresholds.fds, 1),
+    }
+    for name, (probe, limit, scale) in limits.items():
+        values = [probe(sample) for sample in samples]
+        if any(value is None for value in values):
+            continue
+        first, last = _window([float(value) for value in values])  # type: ignore[arg-type]
+        growth = (last - first) / scale
+        report.growth[name] = growth
+        if growth > limit:
+            report.failures.append(f"{name} grew by {growth:.2f} (limit {limit:g})")
+    connections = [sample.connections for sample in samples if sample.connections is not None]
+    if connections:
+        report.growth["connections_max"] = max(connections)
+        if max(connections) > thresholds.connections:
+            report.failures.append(f"{max(connections)} pooled connections open (limit {thresholds.connections})")
+
+
+def _top_allocations(baseline: tracemalloc.Snapshot | None, limit: int = 10) -> list[str]:
+    if baseline is None:
+        return []
+    filters = [tracemalloc.Filter(False, name) for name in _IGNORED_FILES]
+    current = tracemalloc.take_snapshot().filter_traces(filters)
+    stats = current.compare_to(baseline.filter_traces(filters), "lineno")
+    return [str(stat) for stat in stats[:limit] if stat.size_diff > 0]
+
+
+def run_soak(
+    target: str = "sync",
+    *,
+    duration: float = 600.0,
+    sample_interval: float = 10.0,
+    warmup: float | None = None,
+    thresholds: SoakThresholds | None = None,
+    endpoint: str | None = None,
+    api_token: str = "local",
+    recycle_every: int = 0,
+    detector: str = "det-soak",
+) -> SoakReport:
+    """Run ``target``'s mixed workload for ``duration`` seconds and judge resource growth.
+
+    Each iteration submits an image, polls it, lists recent queries and sends
+    feedback. Without ``endpoint`` a local stand-in server is started in a child
+    process. ``recycle_every`` closes and recreates the client every N
+    iterations, which catches resources that ``close()`` fails to release.
+    Samples taken during ``warmup`` (default: two intervals) are discarded.
+    """
+
+    if target not in TARGETS:
+        raise ValueError(f"target must be one of {', '.join(TARGETS)}")
+    thresholds = thresholds or SoakThresholds()
+    warmup = 2 * sample_interval if warmup is None else warmup
+    report = SoakReport(target=target, duration=duration)
+    server = _ServerProcess() if endpoint is None else None
+    url = server.url if server is not None else endpoint
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start(_TRACE_FRAMES)
+    sampler = _Sampler(report, sample_interval, warmup)
+    try:
+        if target == "async":
+            asyncio.run(_soak_async(report, sampler, url, api_token, detector, recycle_every))
+        else:
+            _soak_sync(report, sampler, target, url, api_token, detector, recycle_every)
+        report.top_allocations = _top_allocations(sampler.baseline)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+        if server is not None:
+            server.stop()
+    evaluate(report, thresholds)
+    return report
+
+
+def _soak_sync(
+    report: SoakReport, sampler: _Sampler, target: str, url: str, token: str, detector: str, recycle_every: int
+) -> None:
+    image = _frame()
+
+    def connect() -> Any:
+        if target == "experimental":
+            return ExperimentalApi(endpoint=url, api_token=token)
+        return IntelliOptics(endpoint=url, api_token=token)
+
+    iteration = _experimental_iteration if target == "experimental" else _sync_iteration
+    client = connect()
+    deadline = sampler.started + report.duration
+    try:
+        while time.monotonic() < deadline:
+            try:
+                iteration(client, detector, image)
+            except Exception:
+                report.errors += 1
+            report.iterations += 1
+            if recycle_every and report.iterations % recycle_every == 0:
+                client.close()
+                client = connect()
+            if sampler.due():
+                sampler.sample(client)
+    finally:
+        client.close()
+
+
+async def _soak_async(
+    report: SoakReport, sampler: _Sampler, url: str, token: str, detector: str, recycle_every: int
+) -> None:
+    image = _frame()
+    client = AsyncIntelliOptics(endpoint=url, api_token=token)
+    deadline = sampler.started + report.duration
+    try:
+        while time.monotonic() < deadline:
+            try:
+                await _async_iteration(client, detector, image)
+            except Exception:
+                report.errors += 1
+            report.iterations += 1
+            if recycle_every and report.iterations % recycle_every == 0:
+                await client.close()
+                client = AsyncIntelliOptics(endpoint=url, api_token=token)
+            if sampler.due():
+                sampler.sample(client)
+    finally:
+        await client.close()
@@ -0,0 +1,396 @@
+"""Durable on-disk spool for image queries submitted while the API is unreachable."""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import Any, Mapping, Union
+
+import httpx
+import requests
+
+from ._hedge import is_retryable_status
+from ._http import AsyncHttpClient, HttpClient
+from ._timing import retry_attempt
+from .errors import CircuitOpenError, IntelliOpticsClientError
+from .models import ImageQuery
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    image_query_id TEXT PRIMARY KEY,
+    detector_id TEXT,
+    form TEXT NOT NULL,
+    image_sha256 TEXT,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+"""
+
+_DRAIN_RATE_WINDOW = 60.0
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """Return ``True`` for failures that are worth replaying later.
+
+    Transport failures (DNS, connection refused, timeouts), an open circuit
+    breaker and throttling or server-side errors qualify; client errors such as
+    ``400`` do not.
+    """
+
+    if isinstance(exc, (requests.RequestException, httpx.TransportError, CircuitOpenError)):
+        return True
+    if isinstance(exc, IntelliOpticsClientError):
+        return is_retryable_status(exc.status_code)
+    return False
+
+
+def new_image_query_id() -> str:
+    return f"iq_{uuid.uuid4().hex}"
+
+
+class SubmissionSpool:
+    """Record undeliverable image queries on disk and replay them later.
+
+    Submissions are stored in a SQLite database inside ``directory`` while the
+    JPEG payloads live next to it, content-addressed by their SHA-256 digest so
+    repeated frames are only written once. Every spooled submission carries a
+    pre-assigned ``image_query_id`` so the eventual server-side query matches
+    the placeholder handed back to the caller.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, PathLike[str]],
+        *,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_age: float = 24 * 3600.0,
+        concurrency: int = 4,
+        drain_interval: float = 5.0,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.concurrency = concurrency
+        self.drain_interval = drain_interval
+
+        self._blob_dir = self.directory / "images"
+        self._blob_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.directory / "spool.db"), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+        self._counters = {"spooled": 0, "delivered": 0, "failed_attempts": 0, "rejected": 0, "expired": 0, "evicted": 0}
+        self._delivered_at: collections.deque[float] = collections.deque()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    # ------------------------------------------------------------------
+    # Storage helpers
+    # ------------------------------------------------------------------
+    def _blob_path(self, digest: str) -> Path:
+        return self._blob_dir / digest[:2] / f"{digest}.jpg"
+
+    def _stored_bytes(self) -> int:
+        row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        return int(row[0])
+
+    def _delete_entry(self, image_query_id: str) -> None:
+        row = self._db.execute(
+            "SELECT image_sha256 FROM submissions WHERE image_query_id = ?", (image_query_id,)
+        ).fetchone()
+        self._db.execute("DELETE FROM submissions WHERE image_query_id = ?", (image_query_id,))
+        digest = row[0] if row else None
+        if digest is None:
+            return
+        still_used = self._db.execute(
+            "SELECT 1 FROM submissions WHERE image_sha256 = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if still_used is None:
+            self._db.execute("DELETE FROM blobs WHERE sha256 = ?", (digest,))
+            self._blob_path(digest).unlink(missing_ok=True)
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.max_age
+        rows = self._db.execute("SELECT image_query_id FROM submissions WHERE created_at < ?", (cutoff,)).fetchall()
+        for (image_query_id,) in rows:
+            self._delete_entry(image_query_id)
+            self._counters["expired"] += 1
+
+    def _make_room(self, incoming: int) -> None:
+        if incoming > self.max_bytes:
+            raise IntelliOpticsClientError("Image is larger than the spool quota")
+        while self._stored_bytes() + incoming > self.max_bytes:
+            row = self._db.execute(
+                "SELECT image_query_id FROM submissions ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return
+            self._delete_entry(row[0])
+            self._counters["evicted"] += 1
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def record(
+        self,
+        form: Mapping[str, Any],
+        files: Mapping[str, tuple[str, bytes, str]] | None,
+        error: BaseException | None = None,
+    ) -> ImageQuery:
+        """Persist a multipart submission and return a ``SPOOLED`` placeholder query."""
+
+        stored_form = dict(form)
+        image_query_id = stored_form.get("image_query_id") or new_image_query_id()
+        stored_form["image_query_id"] = image_query_id
+        # Replays happen in the background, so never hold the connection open.
+        stored_form["wait"] = 0.0
+
+        payload = files["image"][1] if files and "image" in files else None
+        digest = hashlib.sha256(payload).hexdigest() if payload is not None else None
+
+        with self._lock:
+            self._expire()
+            if digest is not None:
+                known = self._db.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (digest,)).fetchone()
+                if known is None:
+                    self._make_room(len(payload))  # type: ignore[arg-type]
+                    path = self._blob_path(digest)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = path.with_suffix(".tmp")
+                    tmp.write_bytes(payload)  # type: ignore[arg-type]
+                    tmp.replace(path)
+                    self._db.execute("INSERT INTO blobs (sha256, size) VALUES (?, ?)", (digest, len(payload)))  # type: ignore[arg-type]
+            self._db.execute(
+                "INSERT OR REPLACE INTO submissions (image_query_id, detector_id, form, image_sha256, created_at, last_error)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    image_query_id,
+                    stored_form.get("detector_id"),
+                    json.dumps(stored_form),
+                    digest,
+                    time.time(),
+                    repr(error) if error is not None else None,
+                ),
+            )
+            self._counters["spooled"] += 1
+
+        return ImageQuery(id=image_query_id, detector_id=stored_form.get("detector_id"), status="SPOOLED")
+
+    async def arecord(
+        self,
+        form: Mapping[str, Any],
+        files: Mapping[str, tuple[str, bytes, str]] | None,
+        error: BaseException | None = None,
+    ) -> ImageQuery:
+        """:meth:`record` on a worker thread, keeping hashing and disk writes off the event loop."""
+
+        return await asyncio.to_thread(self.record, form, files, error)
+
+    # ------------------------------------------------------------------
+    # Draining
+    # ------------------------------------------------------------------
+    def _claim(self, limit: int) -> list[tuple[str, dict[str, Any], dict[str, tuple[str, bytes, str]] | None, int]]:
+        with self._lock:
+            self._expire()
+            rows = self._db.execute(
+                "SELECT image_query_id, form, image_sha256, attempts FROM submissions ORDER BY created_at LIMIT ?",
+                (limit,),
+            ).fetchall()
+        batch = []
+        for image_query_id, form, digest, attempts in rows:
+            files = None
+            if digest is not None:
+                try:
+                    files = {"image": ("image.jpg", self._blob_path(digest).read_bytes(), "image/jpeg")}
+                except FileNotFoundError:
+                    with self._lock:
+                        self._delete_entry(image_query_id)
+                        self._counters["rejected"] += 1
+                    continue
+            batch.append((image_query_id, json.loads(form), files, attempts))
+        return batch
+
+    def _settle(self, image_query_id: str, error: BaseException | None) -> bool:
+        """Update bookkeeping for one replay; return ``False`` if the service is still down."""
+
+        with self._lock:
+            if error is None or (isinstance(error, IntelliOpticsClientError) and error.status_code == 409):
+                # 409 means an earlier attempt reached the server after all.
+                self._delete_entry(image_query_id)
+                self._counters["delivered"] += 1
+                self._delivered_at.append(time.monotonic())
+                return True
+            if is_retryable_error(error):
+                self._db.execute(
+                    "UPDATE submissions SET attempts = attempts + 1, last_error = ? WHERE image_query_id = ?",
+                    (repr(error), image_query_id),
+                )
+                self._counters["failed_attempts"] += 1
+                return False
+            self._delete_entry(image_query_id)
+            self._counters["rejected"] += 1
+            return True
+
+    def _settle_batch(
+        self, batch: list[tuple[str, Any, Any, int]], outcomes: list[BaseException | None]
+    ) -> tuple[int, bool]:
+        """Settle one replayed batch; returns how many were delivered and whether the service looked healthy."""
+
+        delivered = 0
+        healthy = True
+        for (image_query_id, *_), error in zip(batch, outcomes):
+            healthy = self._settle(image_query_id, error) and healthy
+            if error is None:
+                delivered += 1
+        return delivered, healthy
+
+    def drain(self, http: HttpClient, *, max_items: int | None = None) -> int:
+        """Replay spooled submissions until the spool is empty or the service fails again.
+
+        Returns the number of submissions delivered during this call.
+        """
+
+        delivered = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="intellioptics-spool") as pool:
+            while max_items is None or delivered < max_items:
+                limit = self.concurrency if max_items is None else min(self.concurrency, max_items - delivered)
+                batch = self._claim(limit)
+                if not batch:
+                    break
+
+                def replay(entry: tuple[str, dict[str, Any], Any, int]) -> BaseException | None:
+                    _, form, files, attempts = entry
+                    try:
+                        with retry_attempt(attempts + 1):
+                            http.post_json("/v1/image-queries", data=form, files=files)
+                    except Exception as exc:
+                        return exc
+                    return None
+
+                settled, healthy = self._settle_batch(batch, list(pool.map(replay, batch)))
+                delivered += settled
+                if not healthy:
+                    break
+        return delivered
+
+    async def adrain(self, http: AsyncHttpClient, *, max_items: int | None = None) -> int:
+        """Async counterpart of :meth:`drain`; SQLite and blob reads run on worker threads."""
+
+        delivered = 0
+        while max_items is None or delivered < max_items:
+            limit = self.concurrency if max_items is None else min(self.concurrency, max_items - delivered)
+            batch = await asyncio.to_thread(self._claim, limit)
+            if not batch:
+                break
+
+            async def replay(entry: tuple[str, dict[str, Any], Any, int]) -> BaseException | None:
+                _, form, files, attempts = entry
+                try:
+                    with retry_attempt(attempts + 1):
+                        await http.post_json("/v1/image-queries", data=form, files=files)
+                except Exception as exc:
+                    return exc
+                return None
+
+            outcomes = await asyncio.gather(*(replay(entry) for entry in batch))
+            settled, healthy = await asyncio.to_thread(self._settle_batch, batch, outcomes)
+            delivered += settled
+            if not healthy:
+                break
+        return delivered
+
+    def start_draining(self, http: HttpClient) -> None:
+        """Drain in a daemon thread every ``drain_interval`` seconds until :meth:`stop`."""
+
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def loop() -> None:
+            while not self._stop.is_set():
+                try:
+                    self.drain(http)
+                except Exception:  # pragma: no cover - keep the drain thread alive
+                    pass
+                self._stop.wait(self.drain_interval)
+
+        self._thread = threading.Thread(target=loop, name="intellioptics-spool-drain", daemon=True)
+        self._thread.start()
+
+    def start_draining_async(self, http: AsyncHttpClient) -> None:
+        """Drain from an asyncio task on the running loop until :meth:`astop`."""
+
+        if self._task is not None:
+            return
+
+        async def loop() -> None:
+            while True:
+                try:
+                    await self.adrain(http)
+                except Exception:  # pragma: no cover - keep the drain task alive
+                    pass
+                await asyncio.sleep(self.drain_interval)
+
+        self._task = asyncio.get_running_loop().create_task(loop())
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def astop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def close(self) -> None:
+        self.stop()
+        with self._lock:
+            self._db.close()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def pending(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM submissions").fetchone()[0])
+
+    def drain_rate(self) -> float:
+        """Delivered submissions per second over the last minute."""
+
+        with self._lock:
+            cutoff = time.monotonic() - _DRAIN_RATE_WINDOW
+            while self._delivered_at and self._delivered_at[0] < cutoff:
+                self._delivered_at.popleft()
+            return len(self._delivered_at) / _DRAIN_RATE_WINDOW
+
+    def stats(self) -> dict[str, Any]:
+        rate = self.drain_rate()
+        with self._lock:
+            return {
+                **self._counters,
+                "pending": self.pending(),
+                "bytes": self._stored_bytes(),
+                "drain_rate": rate,
+            }
@@ -0,0 +1,421 @@
+"""Per-request timing records for the HTTP layer."""
+
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Iterator, Mapping, MutableMapping
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:  # pragma: no cover - optional dependency
+    from opentelemetry import trace as otel_trace
+except Exception:  # pragma: no cover - OpenTelemetry is optional
+    otel_trace = None  # type: ignore[assignment]
+
+
+@dataclass
+class RequestTiming:
+    """Timing and size details for one HTTP attempt.
+
+    Phase durations are in seconds and are ``None`` when the transport does not
+    expose them: ``requests`` cannot separate DNS from TCP connect, and phases
+    are only present on attempts that opened a new connection. ``attempt`` is
+    ``1`` for the original request and ``2`` for its hedge; ``retry`` counts
+    earlier deliveries of the same submission (spool replays).
+    """
+
+    method: str
+    path: str
+    url: str
+    started_at: float
+    total: float = 0.0
+    status_code: int | None = None
+    error: str | None = None
+    encode: float | None = None
+    dns: float | None = None
+    connect: float | None = None
+    tls: float | None = None
+    upload: float | None = None
+    server: float | None = None
+    download: float | None = None
+    request_bytes: int | None = None
+    response_bytes: int | None = None
+    attempt: int = 1
+    hedge: bool = False
+    retry: int = 0
+    traceparent: str | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+RequestHook = Callable[[RequestTiming], Any]
+
+
+# ----------------------------------------------------------------------
+# Encode time handed from the client to the next request on this context
+# ----------------------------------------------------------------------
+_pending_encode: ContextVar[float | None] = ContextVar("intellioptics_pending_encode", default=None)
+
+
+def note_encode_time(seconds: float) -> None:
+    """Attribute ``seconds`` of image encoding to the next request made on this context."""
+
+    _pending_encode.set((_pending_encode.get() or 0.0) + seconds)
+
+
+def take_encode_time() -> float | None:
+    value = _pending_encode.get()
+    if value is not None:
+        _pending_encode.set(None)
+    return value
+
+
+@contextmanager
+def encode_scope() -> Iterator[None]:
+    """Drop encode time noted inside the block that no request took, so an aborted submit cannot leak it."""
+
+    try:
+        yield
+    finally:
+        _pending_encode.set(None)
+
+
+_retry: ContextVar[int] = ContextVar("intellioptics_retry", default=0)
+
+
+@contextmanager
+def retry_attempt(number: int) -> Iterator[None]:
+    """Mark requests made inside the block as retry ``number`` of an earlier request."""
+
+    token = _retry.set(number)
+    try:
+        yield
+    finally:
+        _retry.reset(token)
+
+
+_collected: ContextVar[list[RequestTiming] | None] = ContextVar("intellioptics_collected", default=None)
+
+
+@contextmanager
+def collect_timings() -> Iterator[list[RequestTiming]]:
+    """Collect the :class:`RequestTiming` of every request made inside the block."""
+
+    records: list[RequestTiming] = []
+    token = _collected.set(records)
+    try:
+        yield records
+    finally:
+        _collected.reset(token)
+
+
+def request_hook(on_request: RequestHook | None) -> RequestHook | None:
+    """Return the hook for a request about to be sent, including any active collector."""
+
+    records = _collected.get()
+    if records is None:
+        return on_request
+    if on_request is None:
+        return records.append
+
+    def hook(timing: RequestTiming) -> None:
+        records.append(timing)
+        on_request(timing)
+
+    return hook
+
+
+# ----------------------------------------------------------------------
+# W3C trace context
+# ----------------------------------------------------------------------
+def make_traceparent() -> str:
+    """Return a ``traceparent`` for the active OpenTelemetry span, or a fresh random one."""
+
+    if otel_trace is not None:
+        context = otel_trace.get_current_span().get_span_context()
+        if context.is_valid:
+            return f"00-{context.trace_id:032x}-{os.urandom(8).hex()}-{context.trace_flags:02x}"
+    return f"00-{os.urandom(16).hex()}-{os.urandom(8).hex()}-01"
+
+
+# ----------------------------------------------------------------------
+# requests/urllib3 instrumentation
+# ----------------------------------------------------------------------
+_active_phases: ContextVar[MutableMapping[str, float] | None] = ContextVar("intellioptics_phases", default=None)
+
+
+class _TimedConnectionMixin:
+    """Write connect/TLS/upload/server phases into the active phase mapping."""
+
+    def _new_conn(self):  # type: ignore[no-untyped-def]
+        started = time.perf_counter()
+        sock = super()._new_conn()  # type: ignore[misc]
+        phases = _active_phases.get()
+        if phases is not None:
+            phases["connect"] = time.perf_counter() - started
+        return sock
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()  # type: ignore[misc]
+        phases = _active_phases.get()
+        if phases is not None:
+            now = time.perf_counter()
+            phases["connected_at"] = now
+            if "connect" in phases and isinstance(self, HTTPSConnection):
+                phases["tls"] = max(0.0, now - started - phases["connect"])
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        started = time.perf_counter()
+        super().request(*args, **kwargs)  # type: ignore[misc]
+        phases = _active_phases.get()
+        if phases is not None:
+            # Plain HTTP connects lazily inside ``request``; only count the send itself.
+            phases["upload"] = time.perf_counter() - max(started, phases.get("connected_at", started))
+
+    def getresponse(self):  # type: ignore[no-untyped-def]
+        started = time.perf_counter()
+        response = super().getresponse()  # type: ignore[misc]
+        phases = _active_phases.get()
+        if phases is not None:
+            now = time.perf_counter()
+            phases["server"] = now - started
+            phases["headers_at"] = now
+        return response
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+def instrument_adapter(adapter: Any) -> None:
+    """Make a :class:`requests.adapters.HTTPAdapter` report connection phases."""
+
+    manager = getattr(adapter, "poolmanager", None)
+    if manager is not None:
+        manager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+
+def timed_send(record: RequestTiming, send: Callable[[], Any]) -> Any:
+    """Run a ``requests`` send while collecting urllib3 phase timings into ``record``."""
+
+    phases: dict[str, float] = {}
+    token = _active_phases.set(phases)
+    started = time.perf_counter()
+    try:
+        return send()
+    finally:
+        finished = time.perf_counter()
+        _active_phases.reset(token)
+        record.total = finished - started
+        for name in ("connect", "tls", "upload", "server"):
+            if name in phases:
+                setattr(record, name, max(0.0, phases[name]))
+        if "headers_at" in phases:
+            record.download = finished - phases["headers_at"]
+
+
+# ----------------------------------------------------------------------
+# httpx/httpcore instrumentation
+# ----------------------------------------------------------------------
+_HTTPCORE_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.connect_unix_socket": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "upload",
+    "http11.send_request_body": "upload",
+    "http2.send_request_headers": "upload",
+    "http2.send_request_body": "upload",
+    "http11.receive_response_headers": "server",
+    "http2.receive_response_headers": "server",
+    "http11.receive_response_body": "download",
+    "http2.receive_response_body": "download",
+}
+
+
+def httpcore_trace(record: RequestTiming) -> Callable[[str, Mapping[str, Any]], Any]:
+    """Build an async ``extensions={"trace": ...}`` callback that fills ``record``'s phases."""
+
+    started: dict[str, float] = {}
+
+    async def trace(event: str, info: Mapping[str, Any]) -> None:
+        name, _, stage = event.rpartition(".")
+        phase = _HTTPCORE_PHASES.get(name)
+        if phase is None:
+            return
+        if stage == "started":
+            started[name] = time.perf_counter()
+        elif stage in ("complete", "failed") and name in started:
+            elapsed = time.perf_counter() - started.pop(name)
+            setattr(record, phase, (getattr(record, phase) or 0.0) + elapsed)
+
+    return trace
+
+
+# ----------------------------------------------------------------------
+# Wrapping transport sends
+# ----------------------------------------------------------------------
+def _content_length(headers: Mapping[str, str]) -> int | None:
+    value = headers.get("Content-Length") or headers.get("content-length")
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _attempt_factory(method: str, path: str, url: str, traceparent: str | None) -> Callable[[], RequestTiming]:
+    encode = take_encode_time()
+    retry = _retry.get()
+    numbers = itertools.count(1)
+
+    def new_record() -> RequestTiming:
+        number = next(numbers)
+        return RequestTiming(
+            method=method.upper(),
+            path=path,
+            url=url,
+            started_at=time.time(),
+            encode=encode if number == 1 else None,
+            attempt=number,
+            hedge=number > 1,
+            retry=retry,
+            traceparent=traceparent,
+        )
+
+    return new_record
+
+
+def _response_bytes(response: Any, stream: bool) -> int | None:
+    # A streamed body has not been read yet; only its declared length is known.
+    return _content_length(response.headers) if stream else len(response.content)
+
+
+def instrument_send(
+    hook: RequestHook,
+    send: Callable[[], Any],
+    *,
+    method: str,
+    path: str,
+    url: str,
+    traceparent: str | None,
+    stream: bool = False,
+) -> Callable[[], Any]:
+    """Wrap a ``requests`` send so every attempt (including hedges) reports a record to ``hook``."""
+
+    new_record = _attempt_factory(method, path, url, traceparent)
+
+    def attempt() -> Any:
+        record = new_record()
+        try:
+            response = timed_send(record, send)
+        except Exception as exc:
+            record.error = type(exc).__name__
+            hook(record)
+            raise
+        record.status_code = response.status_code
+        record.request_bytes = _content_length(response.request.headers)
+        record.response_bytes = _response_bytes(response, stream)
+        hook(record)
+        return response
+
+    return attempt
+
+
+def instrument_send_async(
+    hook: RequestHook,
+    send: Callable[..., Awaitable[Any]],
+    *,
+    method: str,
+    path: str,
+    url: str,
+    traceparent: str | None,
+    stream: bool = False,
+) -> Callable[[], Awaitable[Any]]:
+    """Async :func:`instrument_send`; phases come from httpcore's ``trace`` extension."""
+
+    new_record = _attempt_factory(method, path, url, traceparent)
+
+    async def attempt() -> Any:
+        record = new_record()
+        started = time.perf_counter()
+        try:
+            response = await send(extensions={"trace": httpcore_trace(record)})
+        except Exception as exc:
+            record.total = time.perf_counter() - started
+            record.error = type(exc).__name__
+            hook(record)
+            raise
+        record.total = time.perf_counter() - started
+        record.status_code = response.status_code
+        record.request_bytes = _content_length(response.request.headers)
+        record.response_bytes = _response_bytes(response, stream)
+        hook(record)
+        return response
+
+    return attempt
+
+
+# ----------------------------------------------------------------------
+# Exporters
+# ----------------------------------------------------------------------
+
+class OpenTelemetryExporter:
+    """Request hook that turns each :class:`RequestTiming` into an OpenTelemetry span.
+
+    Requires the ``opentelemetry-api`` package; spans are emitted through
+    ``tracer`` (default: the global tracer provider).
+    """
+
+    def __init__(self, tracer: Any | None = None) -> None:
+        if otel_trace is None:
+            raise RuntimeError("opentelemetry-api is required for OpenTelemetryExporter")
+        self._tracer = tracer or otel_trace.get_tracer("intellioptics")
+
+    def __call__(self, record: RequestTiming) -> None:
+        start_ns = int(record.started_at * 1e9)
+        attributes: dict[str, Any] = {
+            "http.request.method": record.method,
+            "url.full": record.url,
+            "intellioptics.attempt": record.attempt,
+            "intellioptics.hedge": record.hedge,
+            "intellioptics.retry": record.retry,
+        }
+        if record.status_code is not None:
+            attributes["http.response.status_code"] = record.status_code
+        if record.error is not None:
+            attributes["error.type"] = record.error
+        if record.request_bytes is not None:
+            attributes["http.request.body.size"] = record.request_bytes
+        if record.response_bytes is not None:
+            attributes["http.response.body.size"] = record.response_bytes
+        for phase in ("encode", "dns", "connect", "tls", "upload", "server", "download"):
+            value = getattr(record, phase)
+            if value is not None:
+                attributes[f"intellioptics.phase.{phase}"] = value
+        span = self._tracer.start_span(
+            f"{record.method} {record.path}",
+            kind=otel_trace.SpanKind.CLIENT,
+            start_time=start_ns,
+            attributes=attributes,
+        )
+        span.end(end_time=start_ns + int(record.total * 1e9))
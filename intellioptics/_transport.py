@@ -0,0 +1,83 @@
+"""Transports for talking to an IntelliOptics-compatible service over a Unix socket."""
+
+from __future__ import annotations
+
+import socket
+from typing import Any
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+
+UNIX_SCHEME = "unix://"
+# Requests over a Unix socket still need an HTTP URL; the host only fills the ``Host`` header.
+UNIX_BASE_URL = "http://localhost"
+
+
+def split_unix_endpoint(base_url: str) -> tuple[str, str | None]:
+    """Return ``(http_base_url, socket_path)``; ``socket_path`` is ``None`` for TCP endpoints."""
+
+    if base_url.startswith(UNIX_SCHEME):
+        return UNIX_BASE_URL, base_url[len(UNIX_SCHEME):]
+    return base_url.rstrip("/"), None
+
+
+class _UnixHTTPConnection(HTTPConnection):
+    def __init__(self, socket_path: str, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+
+class _UnixHTTPConnectionPool(HTTPConnectionPool):
+    def __init__(self, socket_path: str, **kwargs: Any) -> None:
+        super().__init__("localhost", **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> _UnixHTTPConnection:
+        self.num_connections += 1
+        return _UnixHTTPConnection(
+            self.socket_path,
+            host=self.host,
+            port=self.port,
+            timeout=self.timeout.connect_timeout,
+            **self.conn_kw,
+        )
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """:mod:`requests` adapter that sends every request to ``socket_path``.
+
+    Mirrors ``httpx.HTTPTransport(uds=...)`` for the synchronous client. One
+    keep-alive pool of up to ``pool_maxsize`` connections is shared by all
+    requests routed through the adapter.
+    """
+
+    def __init__(self, socket_path: str, *, pool_maxsize: int = 10, **kwargs: Any) -> None:
+        self.socket_path = socket_path
+        super().__init__(pool_maxsize=pool_maxsize, **kwargs)
+        self._unix_pool = _UnixHTTPConnectionPool(socket_path, maxsize=pool_maxsize)
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):  # type: ignore[override]
+        return self._unix_pool
+
+    def get_connection(self, url, proxies=None):  # type: ignore[override]
+        return self._unix_pool
+
+    def request_url(self, request, proxies):  # type: ignore[override]
+        return request.path_url
+
+    def close(self) -> None:
+        self._unix_pool.close()
+        super().close()
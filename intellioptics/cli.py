@@ -7,7 +7,10 @@ import os
 
 import typer
 
-from .client import IntelliOptics
+from ._bench import BenchConfig, load_corpus, run_bench
+from ._server import LocalServer
+from ._soak import SoakThresholds, run_soak
+from .client import AsyncIntelliOptics, IntelliOptics
 
 app = typer.Typer(add_completion=False)
 
@@ -55,5 +58,104 @@ def whoami() -> None:
     typer.echo(json.dumps(payload, indent=2))
 
 
+@app.command()
+def bench(
+    detector: str = typer.Option("det-bench", help="Detector id to submit to."),
+    mode: str = typer.Option("threads", help="sync, threads or async."),
+    concurrency: int = typer.Option(4, help="Worker threads or tasks."),
+    duration: float = typer.Option(10.0, help="Seconds to keep submitting."),
+    rate: float = typer.Option(0.0, help="Target submissions per second across workers; 0 runs closed-loop."),
+    images: str = typer.Option("", help="Image file or directory to cycle through; default is synthetic frames."),
+    wait: float = typer.Option(0.0, help="Server-side wait sent with each submission."),
+    confident: bool = typer.Option(False, help="Poll each query until it is confident and time it."),
+    timeout: float = typer.Option(30.0, help="Per-query budget when --confident is set."),
+    local: bool = typer.Option(False, help="Run against an in-process LocalServer instead of the endpoint."),
+    local_latency: float = typer.Option(0.0, help="Response delay of the local server, in seconds."),
+    local_confident_after: float = typer.Option(0.0, help="Seconds until local answers become confident."),
+    json_output: bool = typer.Option(False, "--json", help="Print the report as JSON instead of a table."),
+) -> None:
+    """Generate load against the configured endpoint (or a local server) and report latency."""
+
+    try:
+        config = BenchConfig(
+            detector=detector,
+            images=load_corpus(images or None),
+            mode=mode,
+            concurrency=concurrency,
+            duration=duration,
+            rate=rate,
+            wait=wait,
+            confident=confident,
+            timeout=timeout,
+        )
+    except (OSError, ValueError) as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=2)
+
+    server = LocalServer(latency=local_latency or None, confident_after=local_confident_after) if local else None
+    if server is not None:
+        server.start()
+        endpoint, api_token = server.url, "local"
+    else:
+        api_token = os.getenv("INTELLIOPTICS_API_TOKEN") or os.getenv("INTELLIOOPTICS_API_TOKEN")
+        if not api_token:
+            typer.echo("INTELLIOPTICS_API_TOKEN environment variable is required (or pass --local)", err=True)
+            raise typer.Exit(code=1)
+        endpoint = os.getenv("INTELLIOPTICS_ENDPOINT")
+    disable_tls = os.getenv("DISABLE_TLS_VERIFY") == "1"
+
+    def client_factory(*, on_request, async_):  # type: ignore[no-untyped-def]
+        client_cls = AsyncIntelliOptics if async_ else IntelliOptics
+        return client_cls(
+            endpoint=endpoint,
+            api_token=api_token,
+            disable_tls_verification=disable_tls,
+            on_request=on_request,
+        )
+
+    try:
+        report = run_bench(config, client_factory)
+    finally:
+        if server is not None:
+            server.stop()
+
+    typer.echo(json.dumps(report.as_dict(), indent=2) if json_output else report.format_table())
+
+
+@app.command()
+def soak(
+    target: str = typer.Option("sync", help="sync (IntelliOptics), async (AsyncIntelliOptics) or experimental."),
+    duration: float = typer.Option(600.0, help="Seconds to run the workload."),
+    interval: float = typer.Option(10.0, help="Seconds between resource samples."),
+    warmup: float = typer.Option(-1.0, help="Seconds before the first sample; default is two intervals."),
+    recycle_every: int = typer.Option(0, help="Close and recreate the client every N iterations."),
+    max_rss_mb: float = typer.Option(32.0, help="Allowed RSS growth in MiB."),
+    max_traced_mb: float = typer.Option(8.0, help="Allowed growth of tracemalloc-traced memory in MiB."),
+    max_fds: int = typer.Option(8, help="Allowed growth in open file descriptors."),
+    max_connections: int = typer.Option(10, help="Allowed open pooled connections."),
+    json_output: bool = typer.Option(False, "--json", help="Print the report as JSON instead of a table."),
+) -> None:
+    """Run a long mixed workload against a local server and fail on memory, fd or connection growth."""
+
+    try:
+        report = run_soak(
+            target,
+            duration=duration,
+            sample_interval=interval,
+            warmup=None if warmup < 0 else warmup,
+            recycle_every=recycle_every,
+            thresholds=SoakThresholds(
+                rss_mb=max_rss_mb, traced_mb=max_traced_mb, fds=max_fds, connections=max_connections
+            ),
+        )
+    except ValueError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=2)
+
+    typer.echo(json.dumps(report.as_dict(), indent=2) if json_output else report.format_table())
+    if not report.passed:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":  # pragma: no cover
     app()
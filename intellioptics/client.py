@@ -3,16 +3,32 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import time
+from contextvars import ContextVar
 from os import PathLike
 from pathlib import Path
-from typing import Any, Iterable, Mapping, Sequence, Union
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Mapping, Sequence, Union
 
+import httpx
+from requests.adapters import HTTPAdapter
+
+from . import _json
+from ._circuit import CircuitBreaker
+from ._deadline import Timeouts, deadline, remaining_budget
+from ._detector_index import DEFAULT_TTL, DetectorIndex
+from ._decode import construct_image_query, construct_image_query_page
+from ._hedge import HedgePolicy
 from ._http import AsyncHttpClient, HttpClient
 from ._img import to_jpeg_bytes
-from .errors import ApiTokenError, ExperimentalFeatureUnavailable, IntelliOpticsClientError
+from ._jsonstream import AsyncItemStream, ItemStream
+from ._metrics import MetricsRegistry
+from ._paging import FetchPage, FetchPageAsync, Page, afetch_all, aiter_items, fetch_all, iter_items
+from ._profiling import ProfileOption, resolve_profiler
+from ._ratelimit import RateLimiter
+from ._spool import SubmissionSpool, is_retryable_error, new_image_query_id
+from ._timing import RequestHook, RequestTiming, collect_timings, encode_scope, note_encode_time
+from .errors import ApiTokenError, DeadlineExceeded, ExperimentalFeatureUnavailable, IntelliOpticsClientError
 from .models import (
     Action,
     ActionList,
@@ -23,12 +39,15 @@ from .models import (
     FeedbackIn,
     HTTPResponse,
     ImageQuery,
+    ImageQueryRecord,
     ModeEnum,
     PaginatedDetectorList,
     PaginatedImageQueryList,
+    PaginatedRuleList,
     PayloadTemplate,
     ROI,
     QueryResult,
+    QueryTiming,
     Rule,
     SnoozeTimeUnitEnum,
     UserIdentity,
@@ -37,6 +56,15 @@ from .models import (
 
 
 ImageArg = Union[str, bytes, PathLike[str], Any]
+# ``raw=`` values: ``False`` for models, ``True``/``"dict"`` for normalized dicts, ``"record"`` for slotted records.
+RawOption = Union[bool, str, None]
+RawImageQuery = Union[Dict[str, Any], ImageQueryRecord]
+
+# Page size of the listing that fills the detector name index.
+_DETECTOR_INDEX_PAGE_SIZE = 100
+
+# Set by ``ask_confident`` so time-to-confident includes the submission, not just the polling.
+_confidence_clock: ContextVar[float | None] = ContextVar("intellioptics_confidence_clock", default=None)
 
 
 def _detector_identifier(detector: Detector | str | None) -> str | None:
@@ -49,6 +77,23 @@ def _detector_identifier(detector: Detector | str | None) -> str | None:
     raise TypeError("detector must be a Detector or string identifier")
 
 
+_RAW_MODES: dict[Any, str | None] = {False: None, True: "dict", "dict": "dict", "record": "record"}
+
+
+def _raw_mode(option: RawOption, default: str | None = None) -> str | None:
+    """Resolve a ``raw=`` option to ``None`` (models), ``"dict"`` or ``"record"``; ``None`` means ``default``."""
+
+    if option is None:
+        return default
+    if isinstance(option, (bool, str)) and option in _RAW_MODES:
+        return _RAW_MODES[option]
+    raise ValueError("raw must be True, False, 'dict' or 'record'")
+
+
+def _detector_mode(detector: Detector | str | None) -> ModeEnum | str | None:
+    return detector.mode if isinstance(detector, Detector) else None
+
+
 def _serialize_model(model: Any) -> dict[str, Any]:
     if hasattr(model, "model_dump"):
         data = model.model_dump()  # type: ignore[call-arg]
@@ -61,13 +106,17 @@ def _serialize_model(model: Any) -> dict[str, Any]:
     return {k: v for k, v in data.items() if v is not None}
 
 
+def _copy_model(model: Any) -> Any:
+    return model.model_copy() if hasattr(model, "model_copy") else model.copy()
+
+
 def _dump_metadata(metadata: Mapping[str, Any] | str | None) -> str | None:
     if metadata is None:
         return None
     if isinstance(metadata, str):
         return metadata
     if isinstance(metadata, Mapping):
-        return json.dumps(metadata)
+        return _json.dumps_str(metadata)
     raise TypeError("metadata must be a mapping or string")
 
 
@@ -79,6 +128,22 @@ def _serialize_wait(wait: bool | float | None) -> str | float | None:
     return wait
 
 
+def _clip_to_deadline(
+    wait: bool | float | None, request_timeout: float | None
+) -> tuple[bool | float | None, float | None]:
+    """Bound the server-side ``wait``/``request_timeout`` fields by the active deadline."""
+
+    budget = remaining_budget()
+    if budget is None:
+        return wait, request_timeout
+    if budget <= 0:
+        raise DeadlineExceeded("Image query not submitted: deadline exceeded")
+    if wait is not None and not isinstance(wait, bool):
+        wait = min(float(wait), budget)
+    request_timeout = budget if request_timeout is None else min(request_timeout, budget)
+    return wait, request_timeout
+
+
 def _build_image_query_request(
     detector: Detector | str | None,
     image: ImageArg | None,
@@ -109,13 +174,100 @@ def _build_image_query_request(
 
     files: dict[str, tuple[str, bytes, str]] | None = None
     if image is not None:
+        started = time.perf_counter()
         payload = to_jpeg_bytes(image)
+        note_encode_time(time.perf_counter() - started)
         files = {"image": ("image.jpg", payload, "image/jpeg")}
 
     form = {key: value for key, value in form.items() if value is not None}
     return form, files
 
 
+def _record_submission(metrics: MetricsRegistry | None, detector_id: str | None) -> None:
+    if metrics is not None:
+        metrics.inc("intellioptics_submissions_total", detector=detector_id)
+
+
+def _record_wait(
+    metrics: MetricsRegistry | None, query: ImageQuery | None, polls: int, confident_since: float | None
+) -> None:
+    if metrics is None:
+        return
+    detector_id = query.detector_id if query is not None else None
+    metrics.observe("intellioptics_polls_per_query", polls, detector=detector_id)
+    if confident_since is not None:
+        metrics.observe(
+            "intellioptics_time_to_confident_seconds", time.monotonic() - confident_since, detector=detector_id
+        )
+
+
+def _record_index_lookup(metrics: MetricsRegistry | None, hit: bool) -> None:
+    if metrics is not None:
+        name = "intellioptics_cache_hits_total" if hit else "intellioptics_cache_misses_total"
+        metrics.inc(name, cache="detector_name")
+
+
+def _detector_from_index(item: Mapping[str, Any] | None, name: str, raw: str | None) -> Detector | dict[str, Any]:
+    if item is None:
+        raise IntelliOpticsClientError(f"Detector named '{name}' was not found")
+    return dict(item) if raw is not None else Detector(**item)
+
+
+def _check_existing_detector(
+    existing: Detector,
+    query: str,
+    group_name: str | None,
+    confidence_threshold: float | None,
+    metadata: Mapping[str, Any] | str | None,
+) -> None:
+    mismatches: list[str] = []
+    if existing.query != query:
+        mismatches.append("query")
+    if group_name is not None and existing.group_name != group_name:
+        mismatches.append("group_name")
+    if confidence_threshold is not None and existing.confidence_threshold != confidence_threshold:
+        mismatches.append("confidence_threshold")
+    if metadata is not None and existing.metadata != metadata:
+        mismatches.append("metadata")
+    if mismatches:
+        details = ", ".join(mismatches)
+        raise ValueError(f"Existing detector has different configuration for: {details}")
+
+
+def _with_server_timing(timing: QueryTiming, query: ImageQuery) -> QueryTiming:
+    extra = getattr(query.result, "extra", None) or {}
+    latency_ms = extra.get("latency_ms")
+    if isinstance(latency_ms, (int, float)):
+        timing.server_latency = latency_ms / 1000.0
+    timing.model_version = extra.get("model_version") or timing.model_version
+    return timing
+
+
+def _attach_submit_timing(query: Any, records: Sequence[RequestTiming]) -> Any:
+    if not isinstance(query, ImageQuery):  # raw responses carry no timing
+        return query
+    record = records[0] if records else None
+    timing = QueryTiming(
+        encode=record.encode if record is not None else None,
+        upload=record.upload if record is not None else None,
+        submit=record.total if record is not None else None,
+    )
+    query._timing = _with_server_timing(timing, query)
+    return query
+
+
+def _attach_wait_timing(
+    query: ImageQuery | None, submitted: ImageQuery | str, polls: int, polling: float
+) -> None:
+    if query is None:
+        return
+    base = submitted.timing if isinstance(submitted, ImageQuery) else None
+    timing = _copy_model(base) if base is not None else QueryTiming()
+    timing.polls += polls
+    timing.polling += polling
+    query._timing = _with_server_timing(timing, query)
+
+
 def _resolve_status(payload: Mapping[str, Any]) -> str:
     status = payload.get("status")
     if isinstance(status, str) and status:
@@ -130,88 +282,199 @@ def _resolve_status(payload: Mapping[str, Any]) -> str:
     return "PENDING"
 
 
-def _normalize_image_query_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
-    result_block = payload.get("result")
-    if not isinstance(result_block, Mapping):
-        result_block = {}
-
-    label = payload.get("label") or result_block.get("label") or payload.get("answer")
-    confidence = payload.get("confidence", result_block.get("confidence"))
-
-    result: dict[str, Any] = dict(result_block)
-    if label is not None:
-        result.setdefault("label", label)
-    if confidence is not None:
-        result.setdefault("confidence", confidence)
-
-    if "count" not in result and payload.get("count") is not None:
-        result["count"] = payload["count"]
-
-    extra: dict[str, Any] = {}
-    raw_extra = payload.get("extra")
-    if isinstance(raw_extra, Mapping):
-        extra.update(raw_extra)
-
-    for key in ("latency_ms", "model_version", "done_processing"):
-        value = payload.get(key)
-        if value is not None:
-            extra.setdefault(key, value)
+_RESULT_EXTRA_KEYS = ("latency_ms", "model_version", "done_processing")
 
-    for key, value in result.items():
-        if key not in {"label", "confidence", "count"} and isinstance(value, Mapping):
-            # nested mappings are included as-is; skip copying to extra
-            continue
 
+def _normalize_image_query_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """Map a wire-format image query onto ``ImageQuery`` fields in one pass over ``payload``."""
+
+    get = payload.get
+    result_block = get("result")
+    result: dict[str, Any] = dict(result_block) if isinstance(result_block, Mapping) else {}
+
+    label = get("label") or result.get("label") or get("answer")
+    if label is not None and "label" not in result:
+        result["label"] = label
+    confidence = get("confidence", result.get("confidence"))
+    if confidence is not None and "confidence" not in result:
+        result["confidence"] = confidence
+    if "count" not in result:
+        count = get("count")
+        if count is not None:
+            result["count"] = count
+
+    raw_extra = get("extra")
+    extra: dict[str, Any] = dict(raw_extra) if isinstance(raw_extra, Mapping) else {}
+    for key in _RESULT_EXTRA_KEYS:
+        value = get(key)
+        if value is not None and key not in extra:
+            extra[key] = value
     if extra:
         existing_extra = result.get("extra")
         if isinstance(existing_extra, Mapping):
-            merged = dict(existing_extra)
-            merged.update(extra)
-            result["extra"] = merged
-        else:
-            result["extra"] = extra
-
-    metadata = payload.get("metadata")
-    if isinstance(metadata, str):
+            extra = {**existing_extra, **extra}
+        result["extra"] = extra
+
+    data: dict[str, Any] = {}
+    value = get("id") or get("image_query_id")
+    if value is not None:
+        data["id"] = value
+    value = get("detector_id")
+    if value is not None:
+        data["detector_id"] = value
+    value = get("confidence_threshold")
+    data["confidence_threshold"] = 0.9 if value is None else value
+    value = get("patience_time")
+    data["patience_time"] = 30.0 if value is None else value
+    value = get("created_at")
+    if value is not None:
+        data["created_at"] = value
+    value = get("done_processing")
+    data["done_processing"] = False if value is None else value
+    value = get("metadata")
+    if isinstance(value, str):
         try:
-            metadata = json.loads(metadata)
+            value = _json.loads(value)
         except Exception:  # pragma: no cover - defensive
             pass
+    if value is not None:
+        data["metadata"] = value
+    value = get("query") or get("prompt")
+    if value is not None:
+        data["query"] = value
+    if result:
+        data["result"] = result
+    for key in ("result_type", "text", "type"):
+        value = get(key)
+        if value is not None:
+            data[key] = value
+    value = get("rois")
+    if isinstance(value, Iterable):
+        data["rois"] = list(value)
+    data["status"] = _resolve_status(payload)
+    return data
+
+
+def _parse_image_query(
+    payload: Mapping[str, Any], trusted: bool, mode: ModeEnum | str | None = None, raw: str | None = None
+) -> ImageQuery | RawImageQuery:
+    """Build an ``ImageQuery``; ``mode`` (the detector's) picks the result model when ``result_type`` is absent.
+
+    ``raw`` returns the normalized dict (``"dict"``) or an ``ImageQueryRecord`` (``"record"``) instead.
+    """
+
+    data = _normalize_image_query_payload(payload)
+    if raw == "dict":
+        return data
+    if raw == "record":
+        return ImageQueryRecord(**data)
+    if trusted:
+        return construct_image_query(data, mode)
+    if mode is None or not hasattr(ImageQuery, "model_validate"):
+        return ImageQuery(**data)  # pydantic v1 has no validation context; the union picks the result
+    return ImageQuery.model_validate(data, context={"mode": mode})
+
+
+def _image_query_params(page: int, page_size: int, detector_id: str | None) -> dict[str, Any] | None:
+    params = {"page": page, "page_size": page_size, "detector_id": detector_id}
+    return {key: value for key, value in params.items() if value is not None} or None
+
+
+def _image_query_converter(trusted: bool, raw: str | None) -> Any:
+    return lambda item: _parse_image_query(item, trusted, raw=raw)
+
+
+def _parse_image_query_page(
+    payload: Any, trusted: bool, raw: str | None = None
+) -> PaginatedImageQueryList | dict[str, Any]:
+    if not isinstance(payload, Mapping):
+        items = _coerce_image_query_items(payload)
+        payload = {"count": len(items), "results": items, "next": None, "previous": None}
+
+    raw_items = payload.get("results")
+    if not isinstance(raw_items, Iterable):
+        raw_items = _coerce_image_query_items(payload)
+
+    results = [_parse_image_query(item, trusted, raw=raw) for item in _coerce_image_query_items(raw_items)]
+    count = payload.get("count", len(results))
+    if raw is not None:
+        return {"count": count, "next": payload.get("next"), "previous": payload.get("previous"), "results": results}
+    if trusted:
+        return construct_image_query_page(count, payload.get("next"), payload.get("previous"), results)
+    return PaginatedImageQueryList(
+        count=count, next=payload.get("next"), previous=payload.get("previous"), results=results
+    )
+
+
+def _parse_detector_page(payload: Any, raw: str | None = None) -> PaginatedDetectorList | dict[str, Any]:
+    if not isinstance(payload, Mapping):
+        items = payload if isinstance(payload, Sequence) else []
+        payload = {"count": len(items), "results": items, "next": None, "previous": None}
+
+    items = payload.get("results")
+    if not isinstance(items, Sequence):
+        items = payload.get("items")
+    if not isinstance(items, Sequence):
+        items = []
+
+    data = {
+        "count": payload.get("count", len(items)),
+        "next": payload.get("next"),
+        "previous": payload.get("previous"),
+        "results": list(items),
+    }
+    return data if raw is not None else PaginatedDetectorList(**data)
 
-    rois = payload.get("rois")
-    if not isinstance(rois, Iterable):
-        rois = None
 
-    confidence_threshold = payload.get("confidence_threshold")
-    if confidence_threshold is None:
-        confidence_threshold = 0.9
+def _parse_rule_page(payload: Any) -> PaginatedRuleList:
+    if not isinstance(payload, Mapping):
+        items = payload if isinstance(payload, Sequence) else []
+        payload = {"count": len(items), "results": items, "next": None, "previous": None}
+    return PaginatedRuleList(**payload)
 
-    patience_time = payload.get("patience_time")
-    if patience_time is None:
-        patience_time = 30.0
 
-    done_processing = payload.get("done_processing")
-    if done_processing is None:
-        done_processing = False
+def _page_contents(page: Any) -> Page:
+    """The items, ``next`` link and ``count`` of a parsed page, model or ``raw`` dict."""
 
-    data: dict[str, Any] = {
-        "id": payload.get("id") or payload.get("image_query_id"),
-        "detector_id": payload.get("detector_id"),
-        "confidence_threshold": confidence_threshold,
-        "patience_time": patience_time,
-        "created_at": payload.get("created_at"),
-        "done_processing": done_processing,
-        "metadata": metadata,
-        "query": payload.get("query") or payload.get("prompt"),
-        "result": result or None,
-        "result_type": payload.get("result_type"),
-        "rois": list(rois) if rois is not None else None,
-        "text": payload.get("text"),
-        "type": payload.get("type"),
-        "status": _resolve_status(payload),
+    if isinstance(page, Mapping):
+        return page["results"], page["next"], page["count"]
+    return page.results, page.next, page.count
+
+
+def _parse_query_result(payload: Any, image_query_id: str, raw: str | None = None) -> QueryResult | dict[str, Any]:
+    normalized = _normalize_image_query_payload(payload)
+    result_block = normalized.get("result")
+    if not isinstance(result_block, Mapping):
+        result_block = {}
+
+    extra: dict[str, Any] = {}
+    raw_extra = result_block.get("extra")
+    if isinstance(raw_extra, Mapping):
+        extra.update(raw_extra)
+
+    for key, value in result_block.items():
+        if key not in {"label", "confidence", "extra"} and value is not None:
+            extra.setdefault(key, value)
+
+    detector_id = normalized.get("detector_id")
+    if detector_id is not None:
+        extra.setdefault("detector_id", detector_id)
+
+    data = {
+        "id": normalized.get("id", image_query_id),
+        "status": normalized.get("status", "PENDING"),
+        "label": result_block.get("label"),
+        "confidence": result_block.get("confidence"),
+        "result_type": normalized.get("result_type"),
+        "extra": extra or None,
     }
+    return data if raw is not None else QueryResult(**data)
 
-    return {key: value for key, value in data.items() if value is not None or key == "status"}
+
+def _spooled(query: ImageQuery, raw: str | None) -> ImageQuery | RawImageQuery:
+    if raw is None:
+        return query
+    return _parse_image_query({"id": query.id, "detector_id": query.detector_id, "status": query.status}, False, raw=raw)
 
 
 def _coerce_image_query_items(payload: Any) -> list[Mapping[str, Any]]:
@@ -256,8 +519,8 @@ def _parse_jsonish(data: Mapping[str, Any] | str | None) -> Mapping[str, Any]:
         if not data.strip():
             return {}
         try:
-            loaded = json.loads(data)
-        except json.JSONDecodeError as exc:  # pragma: no cover - defensive
+            loaded = _json.loads(data)
+        except ValueError as exc:  # pragma: no cover - defensive
             raise ValueError("Expected valid JSON string") from exc
         if not isinstance(loaded, Mapping):
             raise ValueError("JSON string must decode to an object")
@@ -371,7 +634,19 @@ class IntelliOptics:
         api_token: str | None = None,
         *,
         disable_tls_verification: bool | None = None,
-        timeout: float = 30.0,
+        timeout: float | Timeouts = 30.0,
+        spool: SubmissionSpool | None = None,
+        rate_limiter: RateLimiter | Mapping[str, float] | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        transport: HTTPAdapter | None = None,
+        on_request: RequestHook | None = None,
+        traceparent: bool = False,
+        metrics: MetricsRegistry | None = None,
+        profile: ProfileOption = None,
+        trusted_responses: bool = False,
+        raw: RawOption = False,
+        detector_index_ttl: float | None = DEFAULT_TTL,
     ) -> None:
         token = api_token or os.getenv("INTELLIOPTICS_API_TOKEN") or os.getenv("INTELLIOOPTICS_API_TOKEN")
         if not token:
@@ -381,14 +656,46 @@ class IntelliOptics:
         disable_env = os.getenv("DISABLE_TLS_VERIFY") == "1"
         verify = not (disable_tls_verification or disable_env)
 
-        self._http = HttpClient(base_url=base_url, api_token=token, verify=verify, timeout=timeout)
+        self._http = HttpClient(
+            base_url=base_url,
+            api_token=token,
+            verify=verify,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            hedge_policy=hedge_policy,
+            transport=transport,
+            on_request=on_request,
+            traceparent=traceparent,
+            metrics=metrics,
+        )
+        self._spool = spool
+        self.metrics = metrics
+        self._trusted_responses = trusted_responses
+        self._raw = _raw_mode(raw)
+        self._detector_index = DetectorIndex(detector_index_ttl)
         self.experimental = ExperimentalApi(sync_client=self)
+        self._profiler = resolve_profiler(profile)
+        if self._profiler is not None:
+            self._profiler.instrument(self)
+            self._profiler.instrument(self.experimental)
+        if spool is not None:
+            spool.start_draining(self._http)
 
     # ------------------------------------------------------------------
     # Lifecycle helpers
     # ------------------------------------------------------------------
     def close(self) -> None:
+        if self._spool is not None:
+            self._spool.stop()
         self._http.close()
+        if self._profiler is not None:
+            self._profiler.flush()
+
+    def warmup(self, connections: int = 1, *, keepalive_interval: float | None = None) -> int:
+        """Pre-establish ``connections`` pooled connections via ``/healthz`` (see :meth:`HttpClient.warmup`)."""
+
+        return self._http.warmup(connections, keepalive_interval=keepalive_interval)
 
     def __enter__(self) -> "IntelliOptics":  # pragma: no cover - convenience
         return self
@@ -437,29 +744,55 @@ class IntelliOptics:
 
         serialized = {key: value for key, value in payload.items() if value is not None}
         data = self._http.post_json("/v1/detectors", json=serialized)
-        return Detector(**data)
+        detector = Detector(**data)
+        self._detector_index.add(data)
+        return detector
 
-    def list_detectors(self, page: int = 1, page_size: int = 10) -> PaginatedDetectorList:
+    def list_detectors(
+        self, page: int = 1, page_size: int = 10, *, raw: RawOption = None
+    ) -> PaginatedDetectorList | dict[str, Any]:
         params = {"page": page, "page_size": page_size}
         payload = self._http.get_json("/v1/detectors", params=params)
+        return _parse_detector_page(payload, _raw_mode(raw, self._raw))
 
-        if not isinstance(payload, Mapping):
-            items = payload if isinstance(payload, Sequence) else []
-            payload = {"count": len(items), "results": items, "next": None, "previous": None}
-
-        items = payload.get("results")
-        if not isinstance(items, Sequence):
-            items = payload.get("items")
-        if not isinstance(items, Sequence):
-            items = []
-
-        data = {
-            "count": payload.get("count", len(items)),
-            "next": payload.get("next"),
-            "previous": payload.get("previous"),
-            "results": list(items),
-        }
-        return PaginatedDetectorList(**data)
+    def iter_detectors(
+        self, *, page_size: int = 50, prefetch: int = 1, raw: RawOption = None
+    ) -> Iterator[Detector | dict[str, Any]]:
+        """Yield every detector across pages, lazily.
+
+        ``next`` links are followed as the caller reaches the end of each page,
+        with up to ``prefetch`` pages fetched ahead on a background thread
+        (``0`` disables prefetching).
+        """
+
+        return iter_items(self._detector_pages(raw), {"page": 1, "page_size": page_size}, prefetch)
+
+    def fetch_all_detectors(
+        self,
+        *,
+        page_size: int = 100,
+        max_workers: int = 8,
+        ordered: bool = True,
+        retries: int = 2,
+        raw: RawOption = None,
+    ) -> Iterator[Detector | dict[str, Any]]:
+        """Yield every detector, requesting pages in parallel; see :meth:`fetch_all_image_queries`."""
+
+        return fetch_all(
+            self._detector_pages(raw),
+            {"page": 1, "page_size": page_size},
+            max_workers=max_workers,
+            ordered=ordered,
+            retries=retries,
+        )
+
+    def _detector_pages(self, raw: RawOption) -> FetchPage:
+        raw_mode = _raw_mode(raw, self._raw)
+
+        def fetch(params: Mapping[str, Any]) -> Page:
+            return _page_contents(_parse_detector_page(self._http.get_json("/v1/detectors", params=params), raw_mode))
+
+        return fetch
 
     def create_binary_detector(
         self,
@@ -542,11 +875,13 @@ class IntelliOptics:
         response = self._http.post_json("/v1/detector-groups", json=serialized)
         return DetectorGroup(**response)
 
-    def list_detector_groups(self) -> list[DetectorGroup]:
+    def list_detector_groups(self, *, raw: RawOption = None) -> list[DetectorGroup] | list[dict[str, Any]]:
         payload = self._http.get_json("/v1/detector-groups")
         groups = payload if isinstance(payload, Sequence) else payload.get("results") if isinstance(payload, Mapping) else []
         if not isinstance(groups, Sequence):
             groups = []
+        if _raw_mode(raw, self._raw) is not None:
+            return [dict(group) for group in groups]
         return [DetectorGroup(**group) for group in groups]
 
     def delete_detector(self, detector: Detector | str) -> None:
@@ -554,6 +889,7 @@ class IntelliOptics:
         if detector_id is None:
             raise ValueError("detector is required")
         self._http.delete(f"/v1/detectors/{detector_id}")
+        self._detector_index.discard(detector_id)
 
     def create_roi(
         self,
@@ -563,17 +899,41 @@ class IntelliOptics:
     ) -> ROI:
         return ROI(label=label, top_left=tuple(top_left), bottom_right=tuple(bottom_right))
 
-    def get_detector_by_name(self, name: str) -> Detector:
-        page = 1
-        while True:
-            detectors = self.list_detectors(page=page, page_size=50)
-            for detector in detectors.results:
-                if detector.name == name:
-                    return detector
-            if not detectors.next:
-                break
-            page += 1
-        raise IntelliOpticsClientError(f"Detector named '{name}' was not found")
+    def get_detector_by_name(
+        self, name: str, *, raw: RawOption = None, refresh: bool = False
+    ) -> Detector | dict[str, Any]:
+        """Return the detector called ``name``, answered from the detector index.
+
+        The index is filled by one parallel listing of every detector (see
+        :meth:`fetch_all_detectors`) and reused for ``detector_index_ttl``
+        seconds. A name missing from a fresh index re-lists once before
+        :class:`IntelliOpticsClientError` is raised, so detectors created
+        elsewhere are still found. ``refresh=True`` re-lists first.
+        """
+
+        index = self._detector_index
+        generation = index.generation
+        item = index.get(name) if not refresh and index.is_fresh() else None
+        _record_index_lookup(self.metrics, item is not None)
+        if item is None:
+            self._refresh_detector_index(generation)
+            item = index.get(name)
+        return _detector_from_index(item, name, _raw_mode(raw, self._raw))
+
+    def refresh_detector_index(self) -> int:
+        """Re-list every detector into the name index now; returns how many it holds."""
+
+        return self._refresh_detector_index(None)
+
+    def _refresh_detector_index(self, seen: int | None) -> int:
+        index = self._detector_index
+        with index.refresh_lock:
+            # Another thread re-listed while this one waited; its listing is recent enough.
+            if seen is not None and index.generation != seen:
+                return len(index)
+            pages = self._detector_pages(True)
+            params = {"page": 1, "page_size": _DETECTOR_INDEX_PAGE_SIZE}
+            return index.replace(fetch_all(pages, params))
 
     def get_or_create_detector(
         self,
@@ -586,23 +946,12 @@ class IntelliOptics:
         metadata: Mapping[str, Any] | str | None = None,
     ) -> Detector:
         try:
-            existing = self.get_detector_by_name(name)
+            existing = self.get_detector_by_name(name, raw=False)
         except IntelliOpticsClientError:
             existing = None
 
         if existing is not None:
-            mismatches: list[str] = []
-            if existing.query != query:
-                mismatches.append("query")
-            if group_name is not None and existing.group_name != group_name:
-                mismatches.append("group_name")
-            if confidence_threshold is not None and existing.confidence_threshold != confidence_threshold:
-                mismatches.append("confidence_threshold")
-            if metadata is not None and existing.metadata != metadata:
-                mismatches.append("metadata")
-            if mismatches:
-                details = ", ".join(mismatches)
-                raise ValueError(f"Existing detector has different configuration for: {details}")
+            _check_existing_detector(existing, query, group_name, confidence_threshold, metadata)
             return existing
 
         return self.create_detector(
@@ -614,9 +963,9 @@ class IntelliOptics:
             metadata=metadata,
         )
 
-    def get_detector(self, detector_id: str) -> Detector:
+    def get_detector(self, detector_id: str, *, raw: RawOption = None) -> Detector | dict[str, Any]:
         payload = self._http.get_json(f"/v1/detectors/{detector_id}")
-        return Detector(**payload)
+        return dict(payload) if _raw_mode(raw, self._raw) is not None else Detector(**payload)
 
     def submit_image_query(
         self,
@@ -632,25 +981,39 @@ class IntelliOptics:
         inspection_id: str | None = None,
         image_query_id: str | None = None,
         request_timeout: float | None = None,
-    ) -> ImageQuery:
+        raw: RawOption = None,
+    ) -> ImageQuery | RawImageQuery:
         if want_async and wait not in (0, 0.0, False, None):
             raise ValueError("wait must be 0 when want_async=True")
-
-        form, files = _build_image_query_request(
-            detector,
-            image,
-            wait=wait,
-            patience_time=patience_time,
-            confidence_threshold=confidence_threshold,
-            human_review=human_review,
-            metadata=metadata,
-            inspection_id=inspection_id,
-            image_query_id=image_query_id,
-            want_async=want_async,
-            request_timeout=request_timeout,
-        )
-        payload = self._http.post_json("/v1/image-queries", data=form, files=files)
-        return ImageQuery(**_normalize_image_query_payload(payload))
+        raw_mode = _raw_mode(raw, self._raw)
+        if self._spool is not None and image_query_id is None:
+            image_query_id = new_image_query_id()
+        wait, request_timeout = _clip_to_deadline(wait, request_timeout)
+
+        with encode_scope():
+            form, files = _build_image_query_request(
+                detector,
+                image,
+                wait=wait,
+                patience_time=patience_time,
+                confidence_threshold=confidence_threshold,
+                human_review=human_review,
+                metadata=metadata,
+                inspection_id=inspection_id,
+                image_query_id=image_query_id,
+                want_async=want_async,
+                request_timeout=request_timeout,
+            )
+            _record_submission(self.metrics, form.get("detector_id"))
+            try:
+                with collect_timings() as records:
+                    payload = self._http.post_json("/v1/image-queries", data=form, files=files)
+            except Exception as exc:
+                if self._spool is None or not is_retryable_error(exc):
+                    raise
+                return _spooled(self._spool.record(form, files, exc), raw_mode)
+        query = _parse_image_query(payload, self._trusted_responses, _detector_mode(detector), raw_mode)
+        return _attach_submit_timing(query, records)
 
     def submit_image_query_json(
         self,
@@ -666,8 +1029,11 @@ class IntelliOptics:
         inspection_id: str | None = None,
         image_query_id: str | None = None,
         request_timeout: float | None = None,
-    ) -> ImageQuery:
+        raw: RawOption = None,
+    ) -> ImageQuery | RawImageQuery:
         detector_id = _detector_identifier(detector)
+        raw_mode = _raw_mode(raw, self._raw)
+        wait, request_timeout = _clip_to_deadline(wait, request_timeout)
         payload: dict[str, Any] = {
             "detector_id": detector_id,
             "image": image,
@@ -682,12 +1048,15 @@ class IntelliOptics:
             "request_timeout": request_timeout,
         }
         serialized = {key: value for key, value in payload.items() if value is not None}
-        response = self._http.post_json("/v1/image-queries-json", json=serialized)
-        return ImageQuery(**_normalize_image_query_payload(response))
+        _record_submission(self.metrics, detector_id)
+        with collect_timings() as records:
+            response = self._http.post_json("/v1/image-queries-json", json=serialized)
+        query = _parse_image_query(response, self._trusted_responses, _detector_mode(detector), raw_mode)
+        return _attach_submit_timing(query, records)
 
-    def get_image_query(self, image_query_id: str) -> ImageQuery:
+    def get_image_query(self, image_query_id: str, *, raw: RawOption = None) -> ImageQuery | RawImageQuery:
         payload = self._http.get_json(f"/v1/image-queries/{image_query_id}")
-        return ImageQuery(**_normalize_image_query_payload(payload))
+        return _parse_image_query(payload, self._trusted_responses, raw=_raw_mode(raw, self._raw))
 
     def get_image(self, image_query_id: str) -> bytes:
         response = self._http.request_raw("GET", f"/v1/image-queries/{image_query_id}/image")
@@ -699,60 +1068,82 @@ class IntelliOptics:
         page: int = 1,
         page_size: int = 10,
         detector_id: str | None = None,
-    ) -> PaginatedImageQueryList:
-        params = {"page": page, "page_size": page_size, "detector_id": detector_id}
-        params = {key: value for key, value in params.items() if value is not None}
-        payload = self._http.get_json("/v1/image-queries", params=params or None)
-
-        if not isinstance(payload, Mapping):
-            items = _coerce_image_query_items(payload)
-            payload = {"count": len(items), "results": items, "next": None, "previous": None}
-
-        raw_items = payload.get("results")
-        if not isinstance(raw_items, Iterable):
-            raw_items = _coerce_image_query_items(payload)
-
-        normalized_items = [
-            ImageQuery(**_normalize_image_query_payload(item)) for item in _coerce_image_query_items(raw_items)
-        ]
-
-        data = {
-            "count": payload.get("count", len(normalized_items)),
-            "next": payload.get("next"),
-            "previous": payload.get("previous"),
-            "results": normalized_items,
-        }
-        return PaginatedImageQueryList(**data)
+        raw: RawOption = None,
+    ) -> PaginatedImageQueryList | dict[str, Any]:
+        params = _image_query_params(page, page_size, detector_id)
+        payload = self._http.get_json("/v1/image-queries", params=params)
+        return _parse_image_query_page(payload, self._trusted_responses, _raw_mode(raw, self._raw))
 
-    def get_result(self, image_query_id: str) -> QueryResult:
-        payload = self._http.get_json(f"/v1/image-queries/{image_query_id}")
-        normalized = _normalize_image_query_payload(payload)
-        result_block = normalized.get("result")
-        if not isinstance(result_block, Mapping):
-            result_block = {}
-
-        extra: dict[str, Any] = {}
-        raw_extra = result_block.get("extra")
-        if isinstance(raw_extra, Mapping):
-            extra.update(raw_extra)
-
-        for key, value in result_block.items():
-            if key not in {"label", "confidence", "extra"} and value is not None:
-                extra.setdefault(key, value)
-
-        detector_id = normalized.get("detector_id")
-        if detector_id is not None:
-            extra.setdefault("detector_id", detector_id)
-
-        return QueryResult(
-            id=normalized.get("id", image_query_id),
-            status=normalized.get("status", "PENDING"),
-            label=result_block.get("label"),
-            confidence=result_block.get("confidence"),
-            result_type=normalized.get("result_type"),
-            extra=extra or None,
+    def iter_image_queries(
+        self,
+        *,
+        page_size: int = 50,
+        detector_id: str | None = None,
+        prefetch: int = 1,
+        raw: RawOption = None,
+    ) -> Iterator[ImageQuery | RawImageQuery]:
+        """Yield every image query across pages, lazily; prefetching works as in :meth:`iter_detectors`."""
+
+        params = _image_query_params(1, page_size, detector_id) or {}
+        return iter_items(self._image_query_pages(raw), params, prefetch)
+
+    def fetch_all_image_queries(
+        self,
+        *,
+        page_size: int = 100,
+        detector_id: str | None = None,
+        max_workers: int = 8,
+        ordered: bool = True,
+        retries: int = 2,
+        raw: RawOption = None,
+    ) -> Iterator[ImageQuery | RawImageQuery]:
+        """Yield every image query, requesting pages in parallel.
+
+        The first page's ``count`` tells how many pages follow; those are
+        fetched on up to ``max_workers`` threads. ``ordered=True`` yields them
+        in page order, ``ordered=False`` as they arrive. A page failing with a
+        throttling, server or transport error is retried ``retries`` times.
+        """
+
+        return fetch_all(
+            self._image_query_pages(raw),
+            _image_query_params(1, page_size, detector_id) or {},
+            max_workers=max_workers,
+            ordered=ordered,
+            retries=retries,
         )
 
+    def _image_query_pages(self, raw: RawOption) -> FetchPage:
+        trusted, raw_mode = self._trusted_responses, _raw_mode(raw, self._raw)
+
+        def fetch(params: Mapping[str, Any]) -> Page:
+            payload = self._http.get_json("/v1/image-queries", params=params)
+            return _page_contents(_parse_image_query_page(payload, trusted, raw_mode))
+
+        return fetch
+
+    def stream_image_queries(
+        self,
+        *,
+        page: int = 1,
+        page_size: int = 10,
+        detector_id: str | None = None,
+        raw: RawOption = None,
+    ) -> ItemStream:
+        """Like :meth:`list_image_queries`, but yield each query as soon as it is parsed from the body.
+
+        The page is never held in memory as a whole, which suits very large
+        ``page_size`` values. Pagination fields are on the returned stream.
+        """
+
+        convert = _image_query_converter(self._trusted_responses, _raw_mode(raw, self._raw))
+        params = _image_query_params(page, page_size, detector_id)
+        return self._http.stream_json("/v1/image-queries", params=params, convert=convert)
+
+    def get_result(self, image_query_id: str, *, raw: RawOption = None) -> QueryResult | dict[str, Any]:
+        payload = self._http.get_json(f"/v1/image-queries/{image_query_id}")
+        return _parse_query_result(payload, image_query_id, _raw_mode(raw, self._raw))
+
     def submit_feedback(
         self,
         feedback: FeedbackIn | Mapping[str, Any] | None = None,
@@ -840,6 +1231,7 @@ class IntelliOptics:
             f"/v1/detectors/{detector_id}",
             json={"confidence_threshold": confidence_threshold},
         )
+        self._detector_index.discard(detector_id)
 
     def update_detector_escalation_type(
         self,
@@ -857,6 +1249,7 @@ class IntelliOptics:
             f"/v1/detectors/{detector_id}",
             json={"escalation_type": escalation},
         )
+        self._detector_index.discard(detector_id)
 
     def update_detector_status(
         self,
@@ -870,6 +1263,7 @@ class IntelliOptics:
             f"/v1/detectors/{detector_id}",
             json={"enabled": bool(enabled)},
         )
+        self._detector_index.discard(detector_id)
 
     # ------------------------------------------------------------------
     # Convenience helpers
@@ -889,6 +1283,7 @@ class IntelliOptics:
             wait=wait,
             metadata=metadata,
             inspection_id=inspection_id,
+            raw=False,
         )
 
     def ask_async(
@@ -912,6 +1307,7 @@ class IntelliOptics:
             metadata=metadata,
             inspection_id=inspection_id,
             want_async=True,
+            raw=False,
         )
 
     def ask_confident(
@@ -926,23 +1322,54 @@ class IntelliOptics:
         timeout_sec: float | None = None,
         poll_interval: float = 0.5,
     ) -> ImageQuery:
-        query = self.submit_image_query(
-            detector=detector,
-            image=image,
-            wait=wait,
-            confidence_threshold=confidence_threshold,
-            metadata=metadata,
-            inspection_id=inspection_id,
-        )
-
-        threshold = confidence_threshold if confidence_threshold is not None else query.confidence_threshold or 0.9
+        # ``timeout_sec`` is the budget for the whole call: the upload, the server-side wait and
+        # every poll share it, and each HTTP request is clipped to whatever is left.
         timeout = timeout_sec if timeout_sec is not None else (wait if wait is not None else 30.0)
-        return self.wait_for_confident_result(
-            query,
-            confidence_threshold=threshold,
-            timeout_sec=timeout,
-            poll_interval=poll_interval,
-        )
+        clock = _confidence_clock.set(time.monotonic())
+        try:
+            return self._ask_confident(
+                detector, image, confidence_threshold, wait, metadata, inspection_id, timeout, poll_interval
+            )
+        finally:
+            _confidence_clock.reset(clock)
+
+    def _ask_confident(
+        self,
+        detector: Detector | str,
+        image: ImageArg,
+        confidence_threshold: float | None,
+        wait: float | None,
+        metadata: Mapping[str, Any] | str | None,
+        inspection_id: str | None,
+        timeout: float,
+        poll_interval: float,
+    ) -> ImageQuery:
+        with deadline(timeout):
+            query = self.submit_image_query(
+                detector=detector,
+                image=image,
+                wait=wait,
+                confidence_threshold=confidence_threshold,
+                metadata=metadata,
+                inspection_id=inspection_id,
+                raw=False,
+            )
+
+            threshold = confidence_threshold if confidence_threshold is not None else query.confidence_threshold or 0.9
+            return self.wait_for_confident_result(
+                query,
+                confidence_threshold=threshold,
+                timeout_sec=timeout,
+                poll_interval=poll_interval,
+            )
+
+    def _poll_within_deadline(self, query_id: str) -> ImageQuery | None:
+        """Fetch ``query_id``; return ``None`` once the deadline has run out."""
+
+        try:
+            return self.get_image_query(query_id, raw=False)
+        except DeadlineExceeded:
+            return None
 
     def wait_for_confident_result(
         self,
@@ -953,22 +1380,37 @@ class IntelliOptics:
         poll_interval: float = 0.5,
     ) -> ImageQuery:
         query_id = image_query.id if isinstance(image_query, ImageQuery) else image_query
-        deadline = time.time() + timeout_sec
-        last_query: ImageQuery | None = None
-
-        while True:
-            current = self.get_image_query(query_id)
-            last_query = current
-            result = current.result
-            result_confidence = getattr(result, "confidence", None)
-            if current.status in {"DONE", "ERROR"}:
-                if result is None or result_confidence is None or result_confidence >= confidence_threshold:
-                    return current
-            elif result_confidence is not None and result_confidence >= confidence_threshold:
-                return current
-            if time.time() >= deadline:
-                return last_query
-            time.sleep(poll_interval)
+        last_query: ImageQuery | None = image_query if isinstance(image_query, ImageQuery) else None
+        waiting_since = time.monotonic()
+        started = _confidence_clock.get() or waiting_since
+        polls = 0
+        confident = False
+
+        try:
+            # A bare id is fetched once however little budget is left, as before deadlines
+            # existed; only an enclosing deadline bounds that first fetch.
+            current = self.get_image_query(query_id, raw=False) if last_query is None else None
+            with deadline(timeout_sec - (time.monotonic() - waiting_since)) as budget:
+                while True:
+                    if current is None:
+                        current = self._poll_within_deadline(query_id)
+                        if current is None:
+                            return last_query  # type: ignore[return-value]
+                    polls += 1
+                    last_query = current
+                    result_confidence = getattr(current.result, "confidence", None)
+                    confident = result_confidence is not None and result_confidence >= confidence_threshold
+                    if confident or (
+                        current.status in {"DONE", "ERROR"} and (current.result is None or result_confidence is None)
+                    ):
+                        return current
+                    if budget.expired:
+                        return last_query
+                    time.sleep(min(poll_interval, budget.remaining()))
+                    current = None
+        finally:
+            _attach_wait_timing(last_query, image_query, polls, time.monotonic() - waiting_since)
+            _record_wait(self.metrics, last_query, polls, started if confident else None)
 
     def wait_for_ml_result(
         self,
@@ -978,17 +1420,31 @@ class IntelliOptics:
         poll_interval: float = 0.5,
     ) -> ImageQuery:
         query_id = image_query.id if isinstance(image_query, ImageQuery) else image_query
-        deadline = time.time() + timeout_sec
-        last_query: ImageQuery | None = None
+        last_query: ImageQuery | None = image_query if isinstance(image_query, ImageQuery) else None
+        waiting_since = time.monotonic()
+        polls = 0
 
-        while True:
-            current = self.get_image_query(query_id)
-            last_query = current
-            if current.result is not None:
-                return current
-            if time.time() >= deadline:
-                return last_query
-            time.sleep(poll_interval)
+        try:
+            # A bare id is fetched once however little budget is left, as before deadlines
+            # existed; only an enclosing deadline bounds that first fetch.
+            current = self.get_image_query(query_id, raw=False) if last_query is None else None
+            with deadline(timeout_sec - (time.monotonic() - waiting_since)) as budget:
+                while True:
+                    if current is None:
+                        current = self._poll_within_deadline(query_id)
+                        if current is None:
+                            return last_query  # type: ignore[return-value]
+                    polls += 1
+                    last_query = current
+                    if current.result is not None:
+                        return current
+                    if budget.expired:
+                        return last_query
+                    time.sleep(min(poll_interval, budget.remaining()))
+                    current = None
+        finally:
+            _attach_wait_timing(last_query, image_query, polls, time.monotonic() - waiting_since)
+            _record_wait(self.metrics, last_query, polls, None)
 
 
 class AsyncIntelliOptics:
@@ -1000,7 +1456,19 @@ class AsyncIntelliOptics:
         api_token: str | None = None,
         *,
         disable_tls_verification: bool | None = None,
-        timeout: float = 30.0,
+        timeout: float | Timeouts = 30.0,
+        spool: SubmissionSpool | None = None,
+        rate_limiter: RateLimiter | Mapping[str, float] | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        on_request: RequestHook | None = None,
+        traceparent: bool = False,
+        metrics: MetricsRegistry | None = None,
+        profile: ProfileOption = None,
+        trusted_responses: bool = False,
+        raw: RawOption = False,
+        detector_index_ttl: float | None = DEFAULT_TTL,
     ) -> None:
         token = api_token or os.getenv("INTELLIOPTICS_API_TOKEN") or os.getenv("INTELLIOOPTICS_API_TOKEN")
         if not token:
@@ -1010,13 +1478,46 @@ class AsyncIntelliOptics:
         disable_env = os.getenv("DISABLE_TLS_VERIFY") == "1"
         verify = not (disable_tls_verification or disable_env)
 
-        self._http = AsyncHttpClient(base_url=base_url, api_token=token, verify=verify, timeout=timeout)
+        self._http = AsyncHttpClient(
+            base_url=base_url,
+            api_token=token,
+            verify=verify,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            hedge_policy=hedge_policy,
+            transport=transport,
+            on_request=on_request,
+            traceparent=traceparent,
+            metrics=metrics,
+        )
+        self._spool = spool
+        self.metrics = metrics
+        self._trusted_responses = trusted_responses
+        self._raw = _raw_mode(raw)
+        self._detector_index = DetectorIndex(detector_index_ttl)
         self.experimental = ExperimentalApi(async_client=self)
+        self._profiler = resolve_profiler(profile)
+        if self._profiler is not None:
+            self._profiler.instrument(self)
+            self._profiler.instrument(self.experimental)
+
+    def _ensure_spool_drain(self) -> None:
+        if self._spool is not None:
+            self._spool.start_draining_async(self._http)
 
     async def close(self) -> None:
+        if self._spool is not None:
+            await self._spool.astop()
         await self._http.close()
+        if self._profiler is not None:
+            self._profiler.flush()
+
+    async def warmup(self, connections: int = 1, *, keepalive_interval: float | None = None) -> int:
+        return await self._http.warmup(connections, keepalive_interval=keepalive_interval)
 
     async def __aenter__(self) -> "AsyncIntelliOptics":  # pragma: no cover - convenience
+        self._ensure_spool_drain()
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:  # pragma: no cover - convenience
@@ -1055,33 +1556,109 @@ class AsyncIntelliOptics:
             payload["class_names"] = [class_names] if isinstance(class_names, str) else list(class_names)
         serialized = {key: value for key, value in payload.items() if value is not None}
         data = await self._http.post_json("/v1/detectors", json=serialized)
-        return Detector(**data)
+        detector = Detector(**data)
+        self._detector_index.add(data)
+        return detector
 
-    async def list_detectors(self, page: int = 1, page_size: int = 10) -> PaginatedDetectorList:
+    async def list_detectors(
+        self, page: int = 1, page_size: int = 10, *, raw: RawOption = None
+    ) -> PaginatedDetectorList | dict[str, Any]:
         params = {"page": page, "page_size": page_size}
         payload = await self._http.get_json("/v1/detectors", params=params)
+        return _parse_detector_page(payload, _raw_mode(raw, self._raw))
 
-        if not isinstance(payload, Mapping):
-            items = payload if isinstance(payload, Sequence) else []
-            payload = {"count": len(items), "results": items, "next": None, "previous": None}
-
-        items = payload.get("results")
-        if not isinstance(items, Sequence):
-            items = payload.get("items")
-        if not isinstance(items, Sequence):
-            items = []
-
-        data = {
-            "count": payload.get("count", len(items)),
-            "next": payload.get("next"),
-            "previous": payload.get("previous"),
-            "results": list(items),
-        }
-        return PaginatedDetectorList(**data)
+    def iter_detectors(
+        self, *, page_size: int = 50, prefetch: int = 1, raw: RawOption = None
+    ) -> AsyncIterator[Detector | dict[str, Any]]:
+        """Async :meth:`IntelliOptics.iter_detectors`; pages are prefetched by a task. Use ``async for``."""
+
+        return aiter_items(self._detector_pages(raw), {"page": 1, "page_size": page_size}, prefetch)
+
+    def fetch_all_detectors(
+        self,
+        *,
+        page_size: int = 100,
+        max_workers: int = 8,
+        ordered: bool = True,
+        retries: int = 2,
+        raw: RawOption = None,
+    ) -> AsyncIterator[Detector | dict[str, Any]]:
+        """Async :meth:`IntelliOptics.fetch_all_detectors`; use ``async for``."""
+
+        return afetch_all(
+            self._detector_pages(raw),
+            {"page": 1, "page_size": page_size},
+            max_workers=max_workers,
+            ordered=ordered,
+            retries=retries,
+        )
+
+    def _detector_pages(self, raw: RawOption) -> FetchPageAsync:
+        raw_mode = _raw_mode(raw, self._raw)
+
+        async def fetch(params: Mapping[str, Any]) -> Page:
+            payload = await self._http.get_json("/v1/detectors", params=params)
+            return _page_contents(_parse_detector_page(payload, raw_mode))
 
-    async def get_detector(self, detector_id: str) -> Detector:
+        return fetch
+
+    async def get_detector(self, detector_id: str, *, raw: RawOption = None) -> Detector | dict[str, Any]:
         payload = await self._http.get_json(f"/v1/detectors/{detector_id}")
-        return Detector(**payload)
+        return dict(payload) if _raw_mode(raw, self._raw) is not None else Detector(**payload)
+
+    async def get_detector_by_name(
+        self, name: str, *, raw: RawOption = None, refresh: bool = False
+    ) -> Detector | dict[str, Any]:
+        """Async :meth:`IntelliOptics.get_detector_by_name`; the index is re-listed on the loop."""
+
+        index = self._detector_index
+        generation = index.generation
+        item = index.get(name) if not refresh and index.is_fresh() else None
+        _record_index_lookup(self.metrics, item is not None)
+        if item is None:
+            await self._refresh_detector_index(generation)
+            item = index.get(name)
+        return _detector_from_index(item, name, _raw_mode(raw, self._raw))
+
+    async def refresh_detector_index(self) -> int:
+        return await self._refresh_detector_index(None)
+
+    async def _refresh_detector_index(self, seen: int | None) -> int:
+        index = self._detector_index
+        async with index.async_refresh_lock:
+            if seen is not None and index.generation != seen:
+                return len(index)
+            pages = self._detector_pages(True)
+            params = {"page": 1, "page_size": _DETECTOR_INDEX_PAGE_SIZE}
+            return index.replace([item async for item in afetch_all(pages, params)])
+
+    async def get_or_create_detector(
+        self,
+        name: str,
+        query: str,
+        *,
+        group_name: str | None = None,
+        confidence_threshold: float | None = None,
+        pipeline_config: str | None = None,
+        metadata: Mapping[str, Any] | str | None = None,
+    ) -> Detector:
+        try:
+            existing = await self.get_detector_by_name(name, raw=False)
+        except IntelliOpticsClientError:
+            existing = None
+
+        if existing is not None:
+            _check_existing_detector(existing, query, group_name, confidence_threshold, metadata)
+            return existing
+
+        return await self.create_detector(
+            name,
+            query,
+            group_name=group_name,
+            confidence_threshold=confidence_threshold,
+            pipeline_config=pipeline_config,
+            metadata=metadata,
+        )
 
     async def submit_image_query(
         self,
@@ -1097,25 +1674,40 @@ class AsyncIntelliOptics:
         inspection_id: str | None = None,
         image_query_id: str | None = None,
         request_timeout: float | None = None,
-    ) -> ImageQuery:
+        raw: RawOption = None,
+    ) -> ImageQuery | RawImageQuery:
         if want_async and wait not in (0, 0.0, False, None):
             raise ValueError("wait must be 0 when want_async=True")
-
-        form, files = _build_image_query_request(
-            detector,
-            image,
-            wait=wait,
-            patience_time=patience_time,
-            confidence_threshold=confidence_threshold,
-            human_review=human_review,
-            metadata=metadata,
-            inspection_id=inspection_id,
-            image_query_id=image_query_id,
-            want_async=want_async,
-            request_timeout=request_timeout,
-        )
-        payload = await self._http.post_json("/v1/image-queries", data=form, files=files)
-        return ImageQuery(**_normalize_image_query_payload(payload))
+        raw_mode = _raw_mode(raw, self._raw)
+        if self._spool is not None and image_query_id is None:
+            image_query_id = new_image_query_id()
+        wait, request_timeout = _clip_to_deadline(wait, request_timeout)
+
+        with encode_scope():
+            form, files = _build_image_query_request(
+                detector,
+                image,
+                wait=wait,
+                patience_time=patience_time,
+                confidence_threshold=confidence_threshold,
+                human_review=human_review,
+                metadata=metadata,
+                inspection_id=inspection_id,
+                image_query_id=image_query_id,
+                want_async=want_async,
+                request_timeout=request_timeout,
+            )
+            _record_submission(self.metrics, form.get("detector_id"))
+            self._ensure_spool_drain()
+            try:
+                with collect_timings() as records:
+                    payload = await self._http.post_json("/v1/image-queries", data=form, files=files)
+            except Exception as exc:
+                if self._spool is None or not is_retryable_error(exc):
+                    raise
+                return _spooled(await self._spool.arecord(form, files, exc), raw_mode)
+        query = _parse_image_query(payload, self._trusted_responses, _detector_mode(detector), raw_mode)
+        return _attach_submit_timing(query, records)
 
     async def submit_image_query_json(
         self,
@@ -1131,8 +1723,11 @@ class AsyncIntelliOptics:
         inspection_id: str | None = None,
         image_query_id: str | None = None,
         request_timeout: float | None = None,
-    ) -> ImageQuery:
+        raw: RawOption = None,
+    ) -> ImageQuery | RawImageQuery:
         detector_id = _detector_identifier(detector)
+        raw_mode = _raw_mode(raw, self._raw)
+        wait, request_timeout = _clip_to_deadline(wait, request_timeout)
         payload: dict[str, Any] = {
             "detector_id": detector_id,
             "image": image,
@@ -1147,12 +1742,15 @@ class AsyncIntelliOptics:
             "request_timeout": request_timeout,
         }
         serialized = {key: value for key, value in payload.items() if value is not None}
-        response = await self._http.post_json("/v1/image-queries-json", json=serialized)
-        return ImageQuery(**_normalize_image_query_payload(response))
+        _record_submission(self.metrics, detector_id)
+        with collect_timings() as records:
+            response = await self._http.post_json("/v1/image-queries-json", json=serialized)
+        query = _parse_image_query(response, self._trusted_responses, _detector_mode(detector), raw_mode)
+        return _attach_submit_timing(query, records)
 
-    async def get_image_query(self, image_query_id: str) -> ImageQuery:
+    async def get_image_query(self, image_query_id: str, *, raw: RawOption = None) -> ImageQuery | RawImageQuery:
         payload = await self._http.get_json(f"/v1/image-queries/{image_query_id}")
-        return ImageQuery(**_normalize_image_query_payload(payload))
+        return _parse_image_query(payload, self._trusted_responses, raw=_raw_mode(raw, self._raw))
 
     async def list_image_queries(
         self,
@@ -1160,60 +1758,72 @@ class AsyncIntelliOptics:
         page: int = 1,
         page_size: int = 10,
         detector_id: str | None = None,
-    ) -> PaginatedImageQueryList:
-        params = {"page": page, "page_size": page_size, "detector_id": detector_id}
-        params = {key: value for key, value in params.items() if value is not None}
-        payload = await self._http.get_json("/v1/image-queries", params=params or None)
-
-        if not isinstance(payload, Mapping):
-            items = _coerce_image_query_items(payload)
-            payload = {"count": len(items), "results": items, "next": None, "previous": None}
-
-        raw_items = payload.get("results")
-        if not isinstance(raw_items, Iterable):
-            raw_items = _coerce_image_query_items(payload)
-
-        normalized_items = [
-            ImageQuery(**_normalize_image_query_payload(item)) for item in _coerce_image_query_items(raw_items)
-        ]
-
-        data = {
-            "count": payload.get("count", len(normalized_items)),
-            "next": payload.get("next"),
-            "previous": payload.get("previous"),
-            "results": normalized_items,
-        }
-        return PaginatedImageQueryList(**data)
+        raw: RawOption = None,
+    ) -> PaginatedImageQueryList | dict[str, Any]:
+        params = _image_query_params(page, page_size, detector_id)
+        payload = await self._http.get_json("/v1/image-queries", params=params)
+        return _parse_image_query_page(payload, self._trusted_responses, _raw_mode(raw, self._raw))
 
-    async def get_result(self, image_query_id: str) -> QueryResult:
-        payload = await self._http.get_json(f"/v1/image-queries/{image_query_id}")
-        normalized = _normalize_image_query_payload(payload)
-        result_block = normalized.get("result")
-        if not isinstance(result_block, Mapping):
-            result_block = {}
-
-        extra: dict[str, Any] = {}
-        raw_extra = result_block.get("extra")
-        if isinstance(raw_extra, Mapping):
-            extra.update(raw_extra)
-
-        for key, value in result_block.items():
-            if key not in {"label", "confidence", "extra"} and value is not None:
-                extra.setdefault(key, value)
-
-        detector_id = normalized.get("detector_id")
-        if detector_id is not None:
-            extra.setdefault("detector_id", detector_id)
-
-        return QueryResult(
-            id=normalized.get("id", image_query_id),
-            status=normalized.get("status", "PENDING"),
-            label=result_block.get("label"),
-            confidence=result_block.get("confidence"),
-            result_type=normalized.get("result_type"),
-            extra=extra or None,
+    def iter_image_queries(
+        self,
+        *,
+        page_size: int = 50,
+        detector_id: str | None = None,
+        prefetch: int = 1,
+        raw: RawOption = None,
+    ) -> AsyncIterator[ImageQuery | RawImageQuery]:
+        """Async :meth:`IntelliOptics.iter_image_queries`; use ``async for``."""
+
+        params = _image_query_params(1, page_size, detector_id) or {}
+        return aiter_items(self._image_query_pages(raw), params, prefetch)
+
+    def fetch_all_image_queries(
+        self,
+        *,
+        page_size: int = 100,
+        detector_id: str | None = None,
+        max_workers: int = 8,
+        ordered: bool = True,
+        retries: int = 2,
+        raw: RawOption = None,
+    ) -> AsyncIterator[ImageQuery | RawImageQuery]:
+        """Async :meth:`IntelliOptics.fetch_all_image_queries`; ``max_workers`` bounds requests in flight."""
+
+        return afetch_all(
+            self._image_query_pages(raw),
+            _image_query_params(1, page_size, detector_id) or {},
+            max_workers=max_workers,
+            ordered=ordered,
+            retries=retries,
         )
 
+    def _image_query_pages(self, raw: RawOption) -> FetchPageAsync:
+        trusted, raw_mode = self._trusted_responses, _raw_mode(raw, self._raw)
+
+        async def fetch(params: Mapping[str, Any]) -> Page:
+            payload = await self._http.get_json("/v1/image-queries", params=params)
+            return _page_contents(_parse_image_query_page(payload, trusted, raw_mode))
+
+        return fetch
+
+    def stream_image_queries(
+        self,
+        *,
+        page: int = 1,
+        page_size: int = 10,
+        detector_id: str | None = None,
+        raw: RawOption = None,
+    ) -> AsyncItemStream:
+        """Async :meth:`IntelliOptics.stream_image_queries`; iterate the result with ``async for``."""
+
+        convert = _image_query_converter(self._trusted_responses, _raw_mode(raw, self._raw))
+        params = _image_query_params(page, page_size, detector_id)
+        return self._http.stream_json("/v1/image-queries", params=params, convert=convert)
+
+    async def get_result(self, image_query_id: str, *, raw: RawOption = None) -> QueryResult | dict[str, Any]:
+        payload = await self._http.get_json(f"/v1/image-queries/{image_query_id}")
+        return _parse_query_result(payload, image_query_id, _raw_mode(raw, self._raw))
+
     async def submit_feedback(
         self,
         feedback: FeedbackIn | Mapping[str, Any] | None = None,
@@ -1273,6 +1883,7 @@ class AsyncIntelliOptics:
             wait=wait,
             metadata=metadata,
             inspection_id=inspection_id,
+            raw=False,
         )
 
     async def ask_async(
@@ -1296,6 +1907,7 @@ class AsyncIntelliOptics:
             metadata=metadata,
             inspection_id=inspection_id,
             want_async=True,
+            raw=False,
         )
 
     async def ask_confident(
@@ -1310,23 +1922,52 @@ class AsyncIntelliOptics:
         timeout_sec: float | None = None,
         poll_interval: float = 0.5,
     ) -> ImageQuery:
-        query = await self.submit_image_query(
-            detector=detector,
-            image=image,
-            wait=wait,
-            confidence_threshold=confidence_threshold,
-            metadata=metadata,
-            inspection_id=inspection_id,
-        )
-
-        threshold = confidence_threshold if confidence_threshold is not None else query.confidence_threshold or 0.9
+        # ``timeout_sec`` is the budget for the whole call: the upload, the server-side wait and
+        # every poll share it, and each HTTP request is clipped to whatever is left.
         timeout = timeout_sec if timeout_sec is not None else (wait if wait is not None else 30.0)
-        return await self.wait_for_confident_result(
-            query,
-            confidence_threshold=threshold,
-            timeout_sec=timeout,
-            poll_interval=poll_interval,
-        )
+        clock = _confidence_clock.set(time.monotonic())
+        try:
+            return await self._ask_confident(
+                detector, image, confidence_threshold, wait, metadata, inspection_id, timeout, poll_interval
+            )
+        finally:
+            _confidence_clock.reset(clock)
+
+    async def _ask_confident(
+        self,
+        detector: Detector | str,
+        image: ImageArg,
+        confidence_threshold: float | None,
+        wait: float | None,
+        metadata: Mapping[str, Any] | str | None,
+        inspection_id: str | None,
+        timeout: float,
+        poll_interval: float,
+    ) -> ImageQuery:
+        with deadline(timeout):
+            query = await self.submit_image_query(
+                detector=detector,
+                image=image,
+                wait=wait,
+                confidence_threshold=confidence_threshold,
+                metadata=metadata,
+                inspection_id=inspection_id,
+                raw=False,
+            )
+
+            threshold = confidence_threshold if confidence_threshold is not None else query.confidence_threshold or 0.9
+            return await self.wait_for_confident_result(
+                query,
+                confidence_threshold=threshold,
+                timeout_sec=timeout,
+                poll_interval=poll_interval,
+            )
+
+    async def _poll_within_deadline(self, query_id: str) -> ImageQuery | None:
+        try:
+            return await self.get_image_query(query_id, raw=False)
+        except DeadlineExceeded:
+            return None
 
     async def wait_for_confident_result(
         self,
@@ -1337,22 +1978,37 @@ class AsyncIntelliOptics:
         poll_interval: float = 0.5,
     ) -> ImageQuery:
         query_id = image_query.id if isinstance(image_query, ImageQuery) else image_query
-        deadline = time.time() + timeout_sec
-        last_query: ImageQuery | None = None
-
-        while True:
-            current = await self.get_image_query(query_id)
-            last_query = current
-            result = current.result
-            result_confidence = getattr(result, "confidence", None)
-            if current.status in {"DONE", "ERROR"}:
-                if result is None or result_confidence is None or result_confidence >= confidence_threshold:
-                    return current
-            elif result_confidence is not None and result_confidence >= confidence_threshold:
-                return current
-            if time.time() >= deadline:
-                return last_query
-            await asyncio.sleep(poll_interval)
+        last_query: ImageQuery | None = image_query if isinstance(image_query, ImageQuery) else None
+        waiting_since = time.monotonic()
+        started = _confidence_clock.get() or waiting_since
+        polls = 0
+        confident = False
+
+        try:
+            # A bare id is fetched once however little budget is left, as before deadlines
+            # existed; only an enclosing deadline bounds that first fetch.
+            current = await self.get_image_query(query_id, raw=False) if last_query is None else None
+            with deadline(timeout_sec - (time.monotonic() - waiting_since)) as budget:
+                while True:
+                    if current is None:
+                        current = await self._poll_within_deadline(query_id)
+                        if current is None:
+                            return last_query  # type: ignore[return-value]
+                    polls += 1
+                    last_query = current
+                    result_confidence = getattr(current.result, "confidence", None)
+                    confident = result_confidence is not None and result_confidence >= confidence_threshold
+                    if confident or (
+                        current.status in {"DONE", "ERROR"} and (current.result is None or result_confidence is None)
+                    ):
+                        return current
+                    if budget.expired:
+                        return last_query
+                    await asyncio.sleep(min(poll_interval, budget.remaining()))
+                    current = None
+        finally:
+            _attach_wait_timing(last_query, image_query, polls, time.monotonic() - waiting_since)
+            _record_wait(self.metrics, last_query, polls, started if confident else None)
 
     async def wait_for_ml_result(
         self,
@@ -1362,17 +2018,31 @@ class AsyncIntelliOptics:
         poll_interval: float = 0.5,
     ) -> ImageQuery:
         query_id = image_query.id if isinstance(image_query, ImageQuery) else image_query
-        deadline = time.time() + timeout_sec
-        last_query: ImageQuery | None = None
+        last_query: ImageQuery | None = image_query if isinstance(image_query, ImageQuery) else None
+        waiting_since = time.monotonic()
+        polls = 0
 
-        while True:
-            current = await self.get_image_query(query_id)
-            last_query = current
-            if current.result is not None:
-                return current
-            if time.time() >= deadline:
-                return last_query
-            await asyncio.sleep(poll_interval)
+        try:
+            # A bare id is fetched once however little budget is left, as before deadlines
+            # existed; only an enclosing deadline bounds that first fetch.
+            current = await self.get_image_query(query_id, raw=False) if last_query is None else None
+            with deadline(timeout_sec - (time.monotonic() - waiting_since)) as budget:
+                while True:
+                    if current is None:
+                        current = await self._poll_within_deadline(query_id)
+                        if current is None:
+                            return last_query  # type: ignore[return-value]
+                    polls += 1
+                    last_query = current
+                    if current.result is not None:
+                        return current
+                    if budget.expired:
+                        return last_query
+                    await asyncio.sleep(min(poll_interval, budget.remaining()))
+                    current = None
+        finally:
+            _attach_wait_timing(last_query, image_query, polls, time.monotonic() - waiting_since)
+            _record_wait(self.metrics, last_query, polls, None)
 
 
 class ExperimentalApi:
@@ -1704,10 +2374,23 @@ class ExperimentalApi:
     def list_rules(self, page: int = 1, page_size: int = 10) -> PaginatedRuleList:
         params = {"page": page, "page_size": page_size}
         payload = self._sync_http().get_json("/v1/rules", params=params)
-        if not isinstance(payload, Mapping):
-            items = payload if isinstance(payload, Sequence) else []
-            payload = {"count": len(items), "results": items, "next": None, "previous": None}
-        return PaginatedRuleList(**payload)
+        return _parse_rule_page(payload)
+
+    def iter_rules(self, *, page_size: int = 50, prefetch: int = 1) -> Iterator[Rule]:
+        """Yield every rule, following ``next`` links and prefetching ``prefetch`` pages ahead."""
+
+        http = self._sync_http()
+
+        def fetch(params: Mapping[str, Any]) -> Page:
+            return _page_contents(_parse_rule_page(http.get_json("/v1/rules", params=params)))
+
+        return iter_items(fetch, {"page": 1, "page_size": page_size}, prefetch)
+
+    def stream_rules(self, page: int = 1, page_size: int = 10) -> ItemStream:
+        """Like :meth:`list_rules`, but yield each :class:`Rule` as soon as it is parsed from the body."""
+
+        params = {"page": page, "page_size": page_size}
+        return self._sync_http().stream_json("/v1/rules", params=params, convert=lambda item: Rule(**item))
 
     def make_action(self, channel: str, recipient: str, include_image: bool) -> Action:
         return Action(channel=channel.upper(), recipient=recipient, include_image=include_image)
@@ -1737,4 +2420,7 @@ class ExperimentalApi:
         if detector_id is None:
             raise ValueError("detector is required")
         self._sync_http().patch_json(f"/v1/detectors/{detector_id}", json={"name": name})
+        for client in (self._sync_client, self._async_client):
+            if client is not None:
+                client._detector_index.discard(detector_id)
 
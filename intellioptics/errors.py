@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+
 class ApiTokenError(Exception):
     """Raised when the SDK cannot resolve a usable API token."""
 
@@ -5,6 +8,10 @@ class ApiTokenError(Exception):
 class IntelliOpticsClientError(Exception):
     """Base error type for HTTP and SDK level failures."""
 
+    def __init__(self, message: str, *, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
 
 class ExperimentalFeatureUnavailable(IntelliOpticsClientError):
     """Raised when an experimental helper is accessed but not implemented by the backend."""
@@ -13,3 +20,11 @@ class ExperimentalFeatureUnavailable(IntelliOpticsClientError):
         details = message or f"Experimental feature '{feature}' is not available on this server version."
         super().__init__(details)
         self.feature = feature
+
+
+class CircuitOpenError(IntelliOpticsClientError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+
+class DeadlineExceeded(IntelliOpticsClientError):
+    """Raised when the caller's end-to-end time budget is used up."""
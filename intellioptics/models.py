@@ -7,12 +7,13 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 try:  # pragma: no cover - pydantic v2
-    from pydantic import ConfigDict
+    from pydantic import ConfigDict, ValidationError, ValidationInfo, model_validator
 except ImportError:  # pragma: no cover - pydantic v1 fallback
     ConfigDict = None  # type: ignore[assignment]
+    model_validator = None  # type: ignore[assignment]
 
 
 class _BaseModel(BaseModel):
@@ -113,6 +114,34 @@ class BoundingBoxResult(_BaseModel):
     rois: List[ROI] | None = None
 
 
+_RESULT_MODELS: Dict[str, type] = {
+    "BINARY": BinaryClassificationResult,
+    "BINARY_CLASSIFICATION": BinaryClassificationResult,
+    "COUNTING": CountingResult,
+    "COUNT": CountingResult,
+    "MULTICLASS": MultiClassificationResult,
+    "MULTI_CLASSIFICATION": MultiClassificationResult,
+    "MULTICLASS_CLASSIFICATION": MultiClassificationResult,
+    "TEXT": TextRecognitionResult,
+    "TEXT_RECOGNITION": TextRecognitionResult,
+    "BOUNDING_BOX": BoundingBoxResult,
+    "BOUNDING_BOXES": BoundingBoxResult,
+}
+
+
+def _result_model_for(kind: Any) -> Optional[type]:
+    """The result model for a ``result_type`` or detector mode, or ``None`` when it is unknown."""
+
+    if isinstance(kind, Enum):
+        kind = kind.value
+    if not isinstance(kind, str):
+        return None
+    model = _RESULT_MODELS.get(kind)
+    if model is None:
+        model = _RESULT_MODELS.get(kind.strip().upper().replace("-", "_").replace(" ", "_"))
+    return model
+
+
 class Detector(_BaseModel):
     id: str
     name: str
@@ -142,6 +171,54 @@ class PaginatedDetectorList(_BaseModel):
     results: List[Detector] = Field(default_factory=list)
 
 
+class QueryTiming(_BaseModel):
+    """Where the time went for one image query, in seconds.
+
+    ``encode`` and ``upload`` come from the submission request (``submit`` is
+    that request's total time); ``server_latency`` and ``model_version`` are
+    reported by the service; ``polling``/``polls`` cover the client waiting for
+    a confident answer. Fields are ``None`` when the step did not happen or the
+    transport could not measure it.
+    """
+
+    encode: Optional[float] = None
+    upload: Optional[float] = None
+    submit: Optional[float] = None
+    server_latency: Optional[float] = None
+    model_version: Optional[str] = None
+    polling: float = 0.0
+    polls: int = 0
+
+    @property
+    def total(self) -> float:
+        """Client-side wall time: encoding, the submission request and polling."""
+
+        return (self.encode or 0.0) + (self.submit or 0.0) + self.polling
+
+    @classmethod
+    def summarize(cls, items: Iterable["ImageQuery | QueryTiming"]) -> Dict[str, Dict[str, float]]:
+        """Aggregate timings (or queries carrying them) into count/mean/p50/p95/max per phase."""
+
+        timings = [item if isinstance(item, QueryTiming) else item.timing for item in items]
+        summary: Dict[str, Dict[str, float]] = {}
+        for phase in ("encode", "upload", "submit", "server_latency", "polling", "polls", "total"):
+            values = sorted(
+                float(getattr(timing, phase))
+                for timing in timings
+                if timing is not None and getattr(timing, phase) is not None
+            )
+            if not values:
+                continue
+            summary[phase] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": values[(len(values) - 1) // 2],
+                "p95": values[min(len(values) - 1, int(0.95 * len(values)))],
+                "max": values[-1],
+            }
+        return summary
+
+
 class ImageQuery(_BaseModel):
     id: str
     detector_id: Optional[str] = None
@@ -165,6 +242,39 @@ class ImageQuery(_BaseModel):
     type: ImageQueryTypeEnum | str | None = ImageQueryTypeEnum.IMAGE_QUERY
     status: str = "PENDING"
 
+    _timing: Optional[QueryTiming] = PrivateAttr(default=None)
+
+    if model_validator is not None:  # pragma: no branch
+
+        @model_validator(mode="before")
+        @classmethod
+        def _parse_result_by_type(cls, data: Any, info: ValidationInfo) -> Any:
+            """Parse ``result`` as the model named by ``result_type`` instead of trying each union member.
+
+            Without a ``result_type``, a detector ``mode`` passed in the validation
+            context is used. Unknown types, and results that do not fit the named
+            model, are left to the union.
+            """
+
+            if not isinstance(data, dict) or type(data.get("result")) is not dict:
+                return data
+            model = _result_model_for(data.get("result_type"))
+            if model is None and info.context:
+                model = _result_model_for(info.context.get("mode"))
+            if model is None:
+                return data
+            try:
+                result = model.model_validate(data["result"])
+            except ValidationError:
+                return data
+            return {**data, "result": result}
+
+    @property
+    def timing(self) -> Optional[QueryTiming]:
+        """Latency breakdown recorded by the client that returned this query, if any."""
+
+        return self._timing
+
 
 class PaginatedImageQueryList(_BaseModel):
     count: int
@@ -173,6 +283,90 @@ class PaginatedImageQueryList(_BaseModel):
     results: List[ImageQuery] = Field(default_factory=list)
 
 
+class ImageQueryRecord:
+    """A slotted image query holding the normalized response as-is, without validation.
+
+    Returned by the clients with ``raw="record"``. It takes far less memory
+    than an :class:`ImageQuery` or a dict, which suits large caches: ``result``
+    stays a plain dict and ``created_at`` the server's timestamp string. Call
+    :meth:`to_model` to get a validated :class:`ImageQuery`.
+    """
+
+    __slots__ = (
+        "id",
+        "detector_id",
+        "confidence_threshold",
+        "patience_time",
+        "created_at",
+        "done_processing",
+        "metadata",
+        "query",
+        "result",
+        "result_type",
+        "rois",
+        "text",
+        "type",
+        "status",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        detector_id: Optional[str] = None,
+        confidence_threshold: Optional[float] = 0.9,
+        patience_time: Optional[float] = 30.0,
+        created_at: Any = None,
+        done_processing: Optional[bool] = False,
+        metadata: Optional[Dict[str, Any]] = None,
+        query: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+        result_type: Optional[str] = None,
+        rois: Optional[List[Any]] = None,
+        text: Optional[str] = None,
+        type: Optional[str] = None,
+        status: str = "PENDING",
+    ) -> None:
+        self.id = id
+        self.detector_id = detector_id
+        self.confidence_threshold = confidence_threshold
+        self.patience_time = patience_time
+        self.created_at = created_at
+        self.done_processing = done_processing
+        self.metadata = metadata
+        self.query = query
+        self.result = result
+        self.result_type = result_type
+        self.rois = rois
+        self.text = text
+        self.type = type
+        self.status = status
+
+    @property
+    def label(self) -> Any:
+        return self.result.get("label") if isinstance(self.result, dict) else None
+
+    @property
+    def confidence(self) -> Optional[float]:
+        return self.result.get("confidence") if isinstance(self.result, dict) else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The normalized payload this record was built from (``None`` fields omitted)."""
+
+        data = {name: getattr(self, name) for name in self.__slots__}
+        return {key: value for key, value in data.items() if value is not None or key == "status"}
+
+    def to_model(self) -> ImageQuery:
+        return ImageQuery(**self.to_dict())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ImageQueryRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ImageQueryRecord(id={self.id!r}, status={self.status!r}, result={self.result!r})"
+
+
 class QueryResult(_BaseModel):
     id: str
     status: str
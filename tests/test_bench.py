@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from intellioptics import IntelliOptics, LocalServer, cli
+from intellioptics._bench import BenchConfig, load_corpus, run_bench
+
+
+@pytest.mark.parametrize("mode", ["sync", "threads", "async"])
+def test_bench_cli_reports_json_against_local_server(mode: str) -> None:
+    result = CliRunner().invoke(
+        cli.app,
+        [
+            "bench", "--local", "--mode", mode, "--duration", "0.5",
+            "--confident", "--local-confident-after", "0.05", "--json",
+        ],
+    )
+
+    assert result.exit_code == 0, result.stderr
+    report = json.loads(result.stdout)
+    assert report["mode"] == mode and report["requests"] > 0
+    assert report["succeeded"] == report["requests"]
+    assert report["latency"]["p50"] <= report["latency"]["p99"] <= report["latency"]["max"]
+    assert report["time_to_confident"]["p50"] >= 0.05
+    assert report["sent_bytes_per_second"] > 0
+
+
+def test_rate_limits_submissions_and_errors_are_broken_down() -> None:
+    with LocalServer(error_rate=0.5, seed=3) as server:
+        config = BenchConfig(detector="det-1", images=load_corpus(count=2), concurrency=4, duration=0.5, rate=40)
+
+        def factory(*, on_request, async_):  # type: ignore[no-untyped-def]
+            return IntelliOptics(endpoint=server.url, api_token="t", on_request=on_request)
+
+        report = run_bench(config, factory)
+
+    assert 15 <= report.requests <= 21
+    assert report.errors["HTTP 503"] > 0
+    assert report.succeeded + report.errors["HTTP 503"] == report.requests
+    assert "error HTTP 503" in report.format_table()
+
+
+def test_corpus_from_directory(tmp_path) -> None:
+    for index, frame in enumerate(load_corpus(count=3, size=(16, 16))):
+        (tmp_path / f"{index}.jpg").write_bytes(frame)
+    (tmp_path / "notes.txt").write_text("skip me")
+
+    assert len(load_corpus(str(tmp_path))) == 3
+    with pytest.raises(ValueError):
+        BenchConfig(detector="d", images=[], mode="threads")
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+
+from benchmarks import fixtures
+from benchmarks.__main__ import BASELINES, compare
+from benchmarks.cases import CASES
+
+
+def test_every_case_runs_once() -> None:
+    names = [case.name for case in CASES]
+    assert len(names) == len(set(names))
+    for case in CASES:
+        func = case.setup()
+        if func is not None:
+            func()
+
+
+def test_fixtures_are_deterministic() -> None:
+    first = fixtures.image_query_page.__wrapped__(5)
+    second = fixtures.image_query_page.__wrapped__(5)
+    assert first == second
+    assert fixtures.pil_image.__wrapped__("vga").tobytes() == fixtures.pil_image("vga").tobytes()
+
+
+def test_baselines_cover_cases_and_compare_flags_regressions() -> None:
+    stored = json.loads(BASELINES.read_text())["cases"]
+    # numpy and msgspec are optional and absent where the baselines were recorded.
+    optional = ("numpy", "msgspec")
+    assert {case.name for case in CASES if not any(name in case.name for name in optional)} <= set(stored)
+
+    results = {"fast": {"best": 1.0}, "slow": {"best": 1.5}, "new": {"best": 9.0}}
+    assert compare(results, {"fast": 1.0, "slow": 1.0}, tolerance=0.25) == ["slow"]
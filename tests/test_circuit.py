@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from intellioptics import CircuitBreaker, CircuitState, LocalServer
+from intellioptics._http import AsyncHttpClient, HttpClient
+from intellioptics.errors import CircuitOpenError, IntelliOpticsClientError
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.005)
+
+
+def test_opens_after_consecutive_failures_and_fails_fast() -> None:
+    transitions: list[tuple[CircuitState, CircuitState]] = []
+    breaker = CircuitBreaker(failure_threshold=2, on_state_change=lambda old, new: transitions.append((old, new)))
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    assert transitions == [(CircuitState.CLOSED, CircuitState.OPEN)]
+    assert breaker.metrics()["rejected"] == 1
+
+
+def test_healthy_probe_half_opens_and_trial_success_closes() -> None:
+    probe = Mock(side_effect=[False, True])
+    breaker = CircuitBreaker(failure_threshold=1, probe_interval=0.01)
+    breaker.attach_probe(probe)
+
+    breaker.record_failure()
+    _wait_for(lambda: breaker.state is CircuitState.HALF_OPEN)
+
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # only one trial request at a time
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    metrics = breaker.metrics()
+    assert metrics["probes"] == 2
+    assert metrics["probe_failures"] == 1
+
+
+def test_failed_trial_reopens() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.metrics()["opened"] == 2
+
+
+def test_http_client_counts_timeouts_and_server_errors() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, probe_interval=60)
+    client = HttpClient("https://api.example.com", "token", circuit_breaker=breaker)
+    client._session = Mock(headers={})
+    client._session.request.side_effect = [
+        requests.Timeout("slow"),
+        Mock(ok=False, status_code=503, text="down", headers={}),
+    ]
+
+    with pytest.raises(requests.Timeout):
+        client.get_json("/v1/detectors")
+    with pytest.raises(IntelliOpticsClientError):
+        client.get_json("/v1/detectors")
+    with pytest.raises(CircuitOpenError):
+        client.get_json("/v1/detectors")
+
+    assert client._session.request.call_count == 2
+
+
+def test_half_open_trial_slot_is_released_when_the_request_is_cancelled() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    with LocalServer(latency=0.5) as server:
+
+        async def run() -> None:
+            client = AsyncHttpClient(server.url, "t", circuit_breaker=breaker)
+            try:
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(client.get_json("/v1/detectors"), 0.1)
+                assert breaker.state is CircuitState.HALF_OPEN
+                await client.get_json("/v1/detectors")  # the slot is free for the next trial
+            finally:
+                await client.close()
+
+        asyncio.run(run())
+
+    assert breaker.state is CircuitState.CLOSED
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.HALF_OPEN
+    client = HttpClient("https://api.example.com", "token", circuit_breaker=breaker)
+    client._session = Mock(headers={})
+    client._session.request.side_effect = KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        client.get_json("/v1/detectors")
+    assert breaker.before_request() is not None
+
+
+def test_late_release_cannot_free_a_slot_in_a_newer_half_open_window() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0, half_open_max_calls=2)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.HALF_OPEN
+    stale = breaker.before_request()
+    breaker.record_failure()  # another trial failed: re-open, then half-open again
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    breaker.before_request()
+    breaker.before_request()
+    breaker.release_trial(stale)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
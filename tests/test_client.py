@@ -8,9 +8,11 @@ import pytest
 from PIL import Image
 
 from intellioptics import AsyncIntelliOptics, ExperimentalApi, IntelliOptics
+from intellioptics._detector_index import DetectorIndex
 from intellioptics.errors import ApiTokenError
 from intellioptics.models import (
     ChannelEnum,
+    CountingResult,
     Detector,
     ImageQuery,
     ModeEnum,
@@ -35,6 +37,12 @@ def _make_async_client() -> tuple[AsyncIntelliOptics, Any]:
     http.delete = AsyncMock()
     http.request_raw = AsyncMock()
     client._http = http  # type: ignore[attr-defined]
+    client._spool = None  # type: ignore[attr-defined]
+    client.metrics = None
+    client._profiler = None
+    client._trusted_responses = False
+    client._raw = None
+    client._detector_index = DetectorIndex()
     client.experimental = ExperimentalApi(async_client=client)
     return client, http
 
@@ -74,7 +82,7 @@ def test_create_detector_builds_payload() -> None:
     assert args == ("/v1/detectors",)
     assert kwargs["json"]["name"] == "Inspector"
     assert kwargs["json"]["mode"] == "BINARY"
-    assert kwargs["json"]["metadata"] == "{\"team\": \"qa\"}"
+    assert kwargs["json"]["metadata"] == '{"team":"qa"}'
     assert detector.id == "det-123"
 
 
@@ -121,7 +129,7 @@ def test_submit_image_query_includes_optional_fields() -> None:
     assert form["patience_time"] == 45.0
     assert form["confidence_threshold"] == 0.9
     assert form["human_review"] == "ALWAYS"
-    assert form["metadata"] == "{\"source\": \"field\"}"
+    assert form["metadata"] == '{"source":"field"}'
     assert form["inspection_id"] == "insp-7"
     assert form["image_query_id"] == "iq-custom"
     assert form["want_async"] == "true"
@@ -151,6 +159,17 @@ def test_submit_image_query_json_payload() -> None:
     assert payload["human_review"] == "DEFAULT"
 
 
+def test_submit_image_query_parses_result_with_detector_mode() -> None:
+    client = _make_client()
+    client._http.post_json.return_value = {"id": "iq-7", "status": "DONE", "label": "person", "confidence": 0.9}
+    detector = Detector(id="det-3", name="People", query="How many people?", mode=ModeEnum.COUNTING)
+
+    query = client.submit_image_query(detector, _sample_jpeg_bytes())
+
+    assert type(query.result) is CountingResult
+    assert query.result.label == "person"
+
+
 def test_submit_image_query_defaults_match_docs() -> None:
     client = _make_client()
     client._http.post_json.return_value = {"id": "iq-default", "status": "PENDING", "detector_id": "det-1"}
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from intellioptics import CircuitBreaker, CircuitState, IntelliOptics, LocalServer, Timeouts, deadline
+from intellioptics._deadline import remaining_budget
+from intellioptics._http import AsyncHttpClient, HttpClient
+from intellioptics._ratelimit import RateLimiter
+from intellioptics.errors import DeadlineExceeded
+
+
+def _make_client() -> IntelliOptics:
+    client = IntelliOptics(endpoint="https://api.example.com", api_token="token")
+    client._http = Mock()
+    return client
+
+
+def test_nested_deadlines_only_shorten_the_budget() -> None:
+    assert remaining_budget() is None
+    with deadline(1.0):
+        with deadline(60.0) as inner:
+            assert inner.remaining() <= 1.0
+        with deadline(0.5):
+            assert remaining_budget() <= 0.5
+        assert 0.5 < remaining_budget() <= 1.0
+    assert remaining_budget() is None
+
+
+def test_submit_clips_wait_and_request_timeout_to_deadline() -> None:
+    client = _make_client()
+    client._http.post_json.return_value = {"id": "iq-1", "detector_id": "det-1", "status": "PENDING"}
+
+    with deadline(2.0):
+        client.submit_image_query_json("det-1", image="abc", wait=30.0, request_timeout=10.0)
+
+    payload = client._http.post_json.call_args.kwargs["json"]
+    assert 0 < payload["wait"] <= 2.0
+    assert 0 < payload["request_timeout"] <= 2.0
+
+
+def test_http_timeouts_are_clipped_per_phase() -> None:
+    client = HttpClient("https://api.example.com", "token", timeout=Timeouts(connect=3.0, read=20.0))
+    client._session = Mock(headers={})
+    client._session.request.return_value = Mock(ok=True, status_code=200, headers={})
+
+    client.request_raw("GET", "/v1/detectors")
+    assert client._session.request.call_args.kwargs["timeout"] == (3.0, 20.0)
+
+    with deadline(5.0):
+        client.request_raw("GET", "/v1/detectors")
+    connect, read = client._session.request.call_args.kwargs["timeout"]
+    assert connect == 3.0
+    assert 0 < read <= 5.0
+
+
+def test_exhausted_deadline_fails_before_and_during_requests() -> None:
+    client = HttpClient("https://api.example.com", "token", timeout=30.0)
+    client._session = Mock(headers={})
+
+    with deadline(0.0):
+        with pytest.raises(DeadlineExceeded):
+            client.request_raw("GET", "/v1/detectors")
+    client._session.request.assert_not_called()
+
+    client._session.request.side_effect = requests.ReadTimeout("slow")
+    with deadline(1.0):
+        with pytest.raises(DeadlineExceeded):
+            client.request_raw("GET", "/v1/detectors")
+
+
+def test_deadline_during_a_half_open_trial_does_not_wedge_the_breaker() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    with LocalServer(latency=0.5) as server:
+        client = HttpClient(server.url, "t", circuit_breaker=breaker)
+        with deadline(0.1):
+            with pytest.raises(DeadlineExceeded):
+                client.get_json("/v1/detectors")
+        assert breaker.state is CircuitState.HALF_OPEN and breaker.metrics()["failures"] == 1
+        client.get_json("/v1/detectors")
+        client.close()
+        assert breaker.state is CircuitState.CLOSED
+
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+        breaker.record_failure()
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        async def run() -> None:
+            async_client = AsyncHttpClient(server.url, "t", circuit_breaker=breaker)
+            try:
+                with deadline(0.1):
+                    with pytest.raises(DeadlineExceeded):
+                        await async_client.get_json("/v1/detectors")
+                await async_client.get_json("/v1/detectors")
+            finally:
+                await async_client.close()
+
+        asyncio.run(run())
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_wait_for_result_returns_last_answer_when_budget_runs_out() -> None:
+    client = _make_client()
+    pending = {"id": "iq-1", "detector_id": "det-1", "status": "PENDING"}
+    client._http.get_json.side_effect = [pending, DeadlineExceeded("out of time")]
+
+    started = time.monotonic()
+    result = client.wait_for_ml_result("iq-1", timeout_sec=0.2, poll_interval=0.05)
+
+    assert result.id == "iq-1"
+    assert result.status == "PENDING"
+    assert time.monotonic() - started < 1.0
+
+
+def test_rate_limit_wait_is_bounded_by_the_deadline() -> None:
+    limiter = RateLimiter({"management": 0.5}, burst={"management": 1})
+    client = HttpClient("https://api.example.com", "token", rate_limiter=limiter)
+    client._session = Mock(headers={})
+    client._session.request.return_value = Mock(ok=True, status_code=200, headers={})
+    client.request_raw("GET", "/v1/detectors")  # spends the only token; the next is 2s away
+
+    started = time.monotonic()
+    with deadline(0.5):
+        with pytest.raises(DeadlineExceeded):
+            client.request_raw("GET", "/v1/detectors")
+    assert time.monotonic() - started < 0.25
+    assert client._session.request.call_count == 1
+
+    async def run() -> None:
+        async_client = AsyncHttpClient("https://api.example.com", "token", rate_limiter=limiter)
+        try:
+            with deadline(0.5):
+                await async_client.request_raw("GET", "/v1/detectors")
+        finally:
+            await async_client.close()
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+    assert time.monotonic() - started < 0.25
+
+
+def test_wait_for_result_fetches_a_bare_id_once_with_no_budget_left() -> None:
+    client = IntelliOptics(endpoint="https://api.example.com", api_token="token")
+    client._http._session = Mock(headers={})
+    client._http._session.request.return_value = Mock(
+        ok=True,
+        status_code=200,
+        headers={"Content-Type": "application/json"},
+        content=b'{"id": "iq-1", "detector_id": "det-1", "status": "PENDING"}',
+    )
+
+    assert client.wait_for_ml_result("iq-1", timeout_sec=0).status == "PENDING"
+    assert client.wait_for_confident_result("iq-1", timeout_sec=0).status == "PENDING"
+    assert client._http._session.request.call_count == 2
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from pydantic import ValidationError
+
+from benchmarks import fixtures
+from intellioptics import IntelliOptics
+from intellioptics._decode import construct_image_query
+from intellioptics.client import _normalize_image_query_payload
+from intellioptics.models import CountingResult, ImageQuery, ModeEnum
+
+
+def _assert_identical(fast: ImageQuery, slow: ImageQuery) -> None:
+    assert fast == slow
+    assert fast.model_fields_set == slow.model_fields_set
+    assert fast.model_dump_json() == slow.model_dump_json()
+    assert type(fast.result) is type(slow.result)
+    for name in ImageQuery.model_fields:
+        assert type(getattr(fast, name)) is type(getattr(slow, name)), name
+
+
+_ROIS = [{"label": "car", "top_left": [0.1, 0.2], "bottom_right": [0.3, 0.4], "confidence": 0.8}]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        fixtures.image_query_payload(7, random.Random(fixtures.SEED)),
+        {"id": "iq_1", "status": "DONE", "result": {"label": "YES", "confidence": 1}},
+        {"image_query_id": "iq_2", "count": 4, "answer": "YES", "confidence_threshold": 1, "patience_time": 5},
+        {"id": "iq_3", "result": {"text": "ABC123", "confidence": 0.7}, "type": "IMAGE_QUERY"},
+        {"id": "iq_4", "result": {"label": "cat", "probabilities": {"cat": 0.9}}, "rois": []},
+        {"id": "iq_5", "result": {"count": True, "probabilities": {"a": 1.0}}},  # smart union picks via lax mode
+        {"id": "iq_6", "created_at": "2024-06-01T12:00:00Z", "metadata": {"line": 2}, "text": "t"},
+        {"id": "iq_7", "result_type": "COUNTING", "result": {"label": "person", "confidence": 0.5}},
+        {"id": "iq_8", "result_type": "COUNTING", "result": {"count": "many", "text": "many"}},
+        {"id": "iq_9", "status": "DONE", "latency_ms": 12, "result": {"label": "car", "confidence": 0.9, "rois": _ROIS}},
+        {"id": "iq_10", "result": {"label": "car", "confidence": 0.9, "source": "ALGORITHM", "rois": _ROIS}},
+    ],
+)
+def test_trusted_construction_matches_validation(payload) -> None:
+    normalized = _normalize_image_query_payload(payload)
+
+    _assert_identical(construct_image_query(normalized), ImageQuery(**normalized))
+
+
+def test_result_layouts_follow_the_member_smart_union_picks_for_each_payload() -> None:
+    # Smart mode counts the fields set on nested ROIs, so the same keys can pick different members.
+    layout = {"label": "car", "source": "ALGORITHM", "human_reviewed": False}
+    for rois in ([], _ROIS, [], _ROIS * 2):
+        normalized = _normalize_image_query_payload({"id": "iq_1", "result": {**layout, "rois": rois}})
+        _assert_identical(construct_image_query(normalized), ImageQuery(**normalized))
+
+
+def test_trusted_construction_uses_detector_mode_like_validation() -> None:
+    normalized = _normalize_image_query_payload({"id": "iq_1", "result": {"label": "person", "confidence": 0.5}})
+
+    fast = construct_image_query(normalized, ModeEnum.COUNTING)
+
+    assert type(fast.result) is CountingResult
+    _assert_identical(fast, ImageQuery.model_validate(normalized, context={"mode": ModeEnum.COUNTING}))
+
+
+def test_trusted_construction_still_rejects_bad_payloads() -> None:
+    for payload in ({"status": "DONE"}, {"id": "iq_1", "patience_time": 7200}, {"id": "iq_1", "created_at": "soon"}):
+        with pytest.raises(ValidationError):
+            construct_image_query(_normalize_image_query_payload(payload))
+
+
+def test_trusted_responses_list_matches_default() -> None:
+    page = fixtures.image_query_page(50)
+    pages = []
+    for trusted in (False, True):
+        client = IntelliOptics(endpoint="http://decode.invalid", api_token="t", trusted_responses=trusted)
+        client._http.get_json = lambda path, **_: page  # type: ignore[method-assign]
+        pages.append(client.list_image_queries(page_size=50))
+        client.close()
+
+    slow, fast = pages
+    assert fast.model_dump() == slow.model_dump() and fast.count == 50
+    for fast_query, slow_query in zip(fast.results, slow.results):
+        _assert_identical(fast_query, slow_query)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from intellioptics import AsyncIntelliOptics, IntelliOptics, LocalServer, MetricsRegistry
+from intellioptics._detector_index import DetectorIndex
+from intellioptics.errors import IntelliOpticsClientError
+from intellioptics.models import Detector
+
+LISTINGS = "GET /v1/detectors 200"
+
+
+def _listings(server: LocalServer) -> int:
+    return server.stats().get(LISTINGS, 0)
+
+
+def test_index_expires_after_ttl_and_tracks_changes() -> None:
+    now = [0.0]
+    index = DetectorIndex(ttl=10, clock=lambda: now[0])
+    assert not index.is_fresh()
+
+    assert index.replace([{"id": "d1", "name": "door"}, {"id": "d2", "name": "gate"}, "junk"]) == 2
+    assert index.is_fresh() and index.generation == 1
+    index.add({"id": "d3", "name": "dock"})
+    index.discard("d2")
+    assert index.get("dock") == {"id": "d3", "name": "dock"} and index.get("gate") is None
+
+    now[0] = 10.0
+    assert not index.is_fresh()
+    assert DetectorIndex(ttl=None, clock=lambda: now[0]).replace([]) == 0
+    with pytest.raises(ValueError):
+        DetectorIndex(ttl=-1)
+
+
+def test_get_detector_by_name_lists_once_then_answers_from_the_index() -> None:
+    metrics = MetricsRegistry()
+    with LocalServer() as server:
+        with IntelliOptics(endpoint=server.url, api_token="t") as other:
+            for index in range(130):
+                other.create_detector(f"det-{index}", "Is it open?")
+
+            with IntelliOptics(endpoint=server.url, api_token="t", metrics=metrics) as client:
+                before = _listings(server)
+                first = client.get_detector_by_name("det-128")
+                assert _listings(server) - before == 2  # 130 detectors in pages of 100
+                assert client.get_detector_by_name("det-3", raw=True)["name"] == "det-3"
+                assert _listings(server) - before == 2
+
+                # Created elsewhere after the index was filled: a miss re-lists once.
+                other.create_detector("late", "Is it late?")
+                assert client.get_detector_by_name("late").name == "late"
+                with pytest.raises(IntelliOpticsClientError):
+                    client.get_detector_by_name("missing")
+                assert _listings(server) - before == 6
+
+                client.get_detector_by_name("det-0", refresh=True)
+                assert client.refresh_detector_index() == 131
+                assert _listings(server) - before == 10
+
+    assert isinstance(first, Detector) and first.name == "det-128"
+    assert metrics.counter_value("intellioptics_cache_hits_total", cache="detector_name") == 1
+    assert metrics.counter_value("intellioptics_cache_misses_total", cache="detector_name") == 4
+
+
+def test_duplicate_names_resolve_to_the_first_in_listing_order() -> None:
+    pages = {
+        1: [{"id": "a", "name": "dup"}, {"id": "b", "name": "solo"}],
+        2: [{"id": "c", "name": "dup"}, {"id": "d", "name": "other"}],
+    }
+
+    def payload(page: int) -> dict:
+        return {"count": 4, "next": "?page=2" if page == 1 else None, "previous": None, "results": pages[page]}
+
+    # Page 1 answers last, so an unordered merge would see the second "dup" first.
+    def get_json(path, *, params=None, **_):
+        time.sleep(0.05 if int(params["page"]) == 1 else 0)
+        return payload(int(params["page"]))
+
+    async def aget_json(path, *, params=None, **_):
+        await asyncio.sleep(0.05 if int(params["page"]) == 1 else 0)
+        return payload(int(params["page"]))
+
+    client = IntelliOptics(endpoint="http://index.invalid", api_token="t")
+    client._http.get_json = get_json  # type: ignore[method-assign]
+    assert client.get_detector_by_name("dup", raw=True)["id"] == "a"
+    client._detector_index.add({"id": "e", "name": "dup"})
+    assert client.get_detector_by_name("dup", raw=True)["id"] == "a"
+    client.close()
+
+    async def run() -> str:
+        async_client = AsyncIntelliOptics(endpoint="http://index.invalid", api_token="t")
+        async_client._http.get_json = aget_json  # type: ignore[method-assign]
+        try:
+            return (await async_client.get_detector_by_name("dup", raw=True))["id"]
+        finally:
+            await async_client.close()
+
+    assert asyncio.run(run()) == "a"
+
+
+def test_get_or_create_detector_reuses_the_index_across_threads() -> None:
+    with LocalServer() as server:
+        with IntelliOptics(endpoint=server.url, api_token="t", detector_index_ttl=None) as client:
+            client.create_detector("door", "Is the door open?")
+            before = _listings(server)
+            barrier = threading.Barrier(8)
+            found: list[Detector] = []
+
+            def lookup() -> None:
+                barrier.wait()
+                found.append(client.get_or_create_detector("door", "Is the door open?"))
+
+            threads = [threading.Thread(target=lookup) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            created = client.get_or_create_detector("gate", "Is the gate shut?", confidence_threshold=0.8)
+            assert client.get_or_create_detector("gate", "Is the gate shut?").id == created.id
+            with pytest.raises(ValueError, match="query"):
+                client.get_or_create_detector("gate", "Is the gate open?")
+            stats = server.stats()
+
+    assert {detector.name for detector in found} == {"door"}
+    assert stats[LISTINGS] - before == 2  # one shared by the threads, one before creating "gate"
+    assert stats["POST /v1/detectors 200"] == 2
+
+
+def test_async_client_looks_detectors_up_by_name() -> None:
+    with LocalServer() as server:
+
+        async def run() -> tuple[list, Detector, Detector]:
+            async with AsyncIntelliOptics(endpoint=server.url, api_token="t") as client:
+                for index in range(5):
+                    await client.create_detector(f"det-{index}", "Is it open?")
+                client._detector_index.invalidate()
+                found = await asyncio.gather(*(client.get_detector_by_name(f"det-{i}") for i in range(5)))
+                created = await client.get_or_create_detector("new", "Is it new?")
+                again = await client.get_or_create_detector("new", "Is it new?")
+                with pytest.raises(IntelliOpticsClientError):
+                    await client.get_detector_by_name("missing")
+                return found, created, again
+
+        found, created, again = asyncio.run(run())
+        stats = server.stats()
+
+    assert [detector.name for detector in found] == [f"det-{index}" for index in range(5)]
+    assert again.id == created.id
+    assert stats[LISTINGS] == 3  # one shared by the gathered lookups, one per unknown name
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from intellioptics import AsyncIntelliOptics, IntelliOptics, LocalServer
+from intellioptics._paging import afetch_all, fetch_all
+from intellioptics.errors import IntelliOpticsClientError
+
+
+class _Pages:
+    """Fake list endpoint: ``total`` items, ``size`` per page whatever ``page_size`` asks for."""
+
+    def __init__(self, total: int, size: int, *, delay: float = 0.0, count: bool = True) -> None:
+        self.total, self.size, self.delay, self.count = total, size, delay, count
+        self.failures: dict[int, list[Exception]] = {}
+        self.requested: list[int] = []
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def page(self, params) -> tuple:
+        page = int(params["page"])
+        with self._lock:
+            self.requested.append(page)
+            failures = self.failures.get(page)
+            if failures:
+                raise failures.pop(0)
+        items = list(range((page - 1) * self.size, min(page * self.size, self.total)))
+        link = f"?page={page + 1}" if page * self.size < self.total else None
+        return items, link, self.total if self.count else None
+
+    def __call__(self, params) -> tuple:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            # Later pages answer faster, so unordered mode sees them first.
+            time.sleep(self.delay / int(params["page"]))
+            return self.page(params)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_fetch_all_fans_out_with_bounded_parallelism_in_page_order() -> None:
+    pages = _Pages(100, 10, delay=0.2)
+
+    started = time.perf_counter()
+    items = list(fetch_all(pages, {"page": 1, "page_size": 10}, max_workers=4))
+    elapsed = time.perf_counter() - started
+
+    assert items == list(range(100))
+    assert sorted(pages.requested) == list(range(1, 11)) and pages.peak <= 4
+    assert elapsed < 0.45  # serially: 0.2 + 0.1 + 0.067 + ... ~= 0.59
+
+
+def test_fetch_all_unordered_yields_pages_as_they_arrive() -> None:
+    pages = _Pages(60, 10, delay=0.2)
+
+    items = list(fetch_all(pages, {"page": 1}, max_workers=5, ordered=False))
+
+    assert sorted(items) == list(range(60)) and items != list(range(60))
+    assert items[:10] == list(range(10))
+
+
+def test_fetch_all_sizes_pages_by_the_first_page_and_falls_back_to_next_links() -> None:
+    capped = _Pages(35, 10)
+    assert list(fetch_all(capped, {"page": 1, "page_size": 100})) == list(range(35))
+    assert sorted(capped.requested) == [1, 2, 3, 4]
+
+    uncounted = _Pages(35, 10, count=False)
+    assert list(fetch_all(uncounted, {"page": 1}, max_workers=3)) == list(range(35))
+    assert uncounted.requested == [1, 2, 3, 4]
+
+
+def test_fetch_all_retries_transient_page_failures_only() -> None:
+    pages = _Pages(30, 10)
+    pages.failures[2] = [
+        IntelliOpticsClientError("busy", status_code=503),
+        IntelliOpticsClientError("slow down", status_code=429),
+    ]
+    assert list(fetch_all(pages, {"page": 1}, retries=2, backoff=0)) == list(range(30))
+    assert pages.requested.count(2) == 3
+
+    pages = _Pages(30, 10)
+    pages.failures[3] = [IntelliOpticsClientError("busy", status_code=503)] * 2
+    with pytest.raises(IntelliOpticsClientError):
+        list(fetch_all(pages, {"page": 1}, retries=1, backoff=0))
+
+    pages = _Pages(30, 10)
+    pages.failures[2] = [IntelliOpticsClientError("bad", status_code=400)]
+    with pytest.raises(IntelliOpticsClientError):
+        list(fetch_all(pages, {"page": 1}, retries=5, backoff=0))
+    assert pages.requested.count(2) == 1
+
+    with pytest.raises(ValueError):
+        fetch_all(pages, {}, max_workers=0)
+
+
+def test_afetch_all_fans_out_on_the_loop() -> None:
+    sync_pages = _Pages(50, 10)
+    sync_pages.failures[4] = [IntelliOpticsClientError("busy", status_code=502)]
+    active = peak = 0
+
+    async def fetch(params):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            await asyncio.sleep(0.02 / int(params["page"]))
+            return sync_pages.page(params)
+        finally:
+            active -= 1
+
+    async def run(ordered: bool) -> list:
+        return [item async for item in afetch_all(fetch, {"page": 1}, max_workers=3, ordered=ordered, backoff=0)]
+
+    assert asyncio.run(run(True)) == list(range(50))
+    assert sorted(asyncio.run(run(False))) == list(range(50))
+    assert peak == 3
+
+
+def test_clients_fetch_all_image_queries_and_detectors() -> None:
+    image = Image.new("RGB", (8, 8))
+    with LocalServer() as server:
+        with IntelliOptics(endpoint=server.url, api_token="t") as client:
+            for index in range(4):
+                client.create_detector(f"det-{index}", "Is it open?")
+            for index in range(23):
+                client.submit_image_query(f"det-{index % 2}", image, wait=0)
+            expected = [query.id for query in client.iter_image_queries(page_size=50, detector_id="det-0")]
+            fetched = [query.id for query in client.fetch_all_image_queries(page_size=5, detector_id="det-0")]
+            detectors = [d["name"] for d in client.fetch_all_detectors(page_size=3, raw=True, ordered=False)]
+
+        async def run() -> list:
+            async with AsyncIntelliOptics(endpoint=server.url, api_token="t") as async_client:
+                queries = async_client.fetch_all_image_queries(page_size=4, max_workers=2, ordered=False)
+                return [query.id async for query in queries]
+
+        async_ids = asyncio.run(run())
+
+    assert len(expected) == 12 and fetched == expected
+    assert sorted(detectors) == [f"det-{index}" for index in range(4)]
+    assert len(async_ids) == 23
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from intellioptics import HedgePolicy
+from intellioptics._hedge import hedged_call, hedged_call_async
+from intellioptics._http import HttpClient
+
+
+def _trained_policy(latency: float = 0.01, **kwargs) -> HedgePolicy:
+    policy = HedgePolicy(min_samples=5, **kwargs)
+    for _ in range(5):
+        policy._observe("poll", latency)
+    return policy
+
+
+def test_policy_learns_delay_and_budget_caps_hedges() -> None:
+    policy = HedgePolicy(min_samples=3, budget=0.5)
+    assert policy.hedge_delay("poll") is None
+    for value in (0.01, 0.02, 0.5):
+        policy._observe("poll", value)
+    assert policy.hedge_delay("poll") == 0.5
+
+    policy._begin("poll")
+    assert not policy._try_spend()  # half a token earned so far
+    policy._begin("poll")
+    assert policy._try_spend()
+    assert not policy._try_spend()
+
+
+def test_slow_primary_is_hedged_and_loser_discarded() -> None:
+    policy = _trained_policy(budget=1.0)
+    calls = iter([0.5, 0.0])
+    discarded: list[str] = []
+    release = threading.Event()
+
+    def send() -> str:
+        delay = next(calls)
+        if delay:
+            release.wait(delay)
+            return "slow"
+        return "fast"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert hedged_call(policy, "poll", send, executor=executor, discard=discarded.append) == "fast"
+        release.set()
+
+    assert discarded == ["slow"]
+    stats = policy.stats()
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+    assert stats["win_rate"] == 1.0
+
+
+def test_async_hedge_cancels_the_loser() -> None:
+    policy = _trained_policy(budget=1.0)
+    started: list[asyncio.Task] = []
+
+    async def send() -> str:
+        started.append(asyncio.current_task())
+        if len(started) == 1:
+            await asyncio.sleep(5)
+            return "slow"
+        return "fast"
+
+    async def run() -> None:
+        begun = time.monotonic()
+        assert await hedged_call_async(policy, "poll", send) == "fast"
+        assert time.monotonic() - begun < 1.0
+        await asyncio.sleep(0)
+        assert started[0].cancelled()
+
+    asyncio.run(run())
+    assert policy.stats()["hedge_rate"] == 1.0
+
+
+def test_http_client_hedges_only_gets() -> None:
+    policy = Mock(spec=HedgePolicy)
+    client = HttpClient("https://api.example.com", "token", hedge_policy=policy)
+    client._session = Mock(headers={})
+    client._session.request.return_value = Mock(ok=True, status_code=200, headers={})
+    policy._begin.return_value = None
+
+    client.request_raw("POST", "/v1/image-queries")
+    policy._begin.assert_not_called()
+    client.request_raw("GET", "/v1/image-queries/iq-1")
+    policy._begin.assert_called_once_with("poll")
+    client.close()
+
+
+def test_retryable_status_does_not_beat_a_slower_success() -> None:
+    policy = _trained_policy(budget=1.0)
+    answers = iter([(0.2, 200), (0.0, 503)])
+    discarded: list[int] = []
+
+    def send() -> int:
+        delay, status = next(answers)
+        time.sleep(delay)
+        return status
+
+    def usable(status: int) -> bool:
+        return status != 503
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert hedged_call(policy, "poll", send, executor=executor, discard=discarded.append, usable=usable) == 200
+        assert discarded == [503]
+        answers = iter([(0.05, 429), (0.0, 503)])
+        assert hedged_call(policy, "poll", send, executor=executor, usable=usable) == 429
+
+    async def asend() -> int:
+        delay, status = next(answers)
+        await asyncio.sleep(delay)
+        return status
+
+    answers = iter([(0.2, 200), (0.0, 503)])
+    assert asyncio.run(hedged_call_async(policy, "poll", asend, usable=usable)) == 200
+    assert policy.stats()["hedge_wins"] == 0
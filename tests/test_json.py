@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import datetime
+import enum
+import json
+from unittest.mock import Mock
+
+import httpx
+import pytest
+import requests
+
+from benchmarks import fixtures
+from intellioptics import _json
+from intellioptics._http import AsyncHttpClient, HttpClient
+from intellioptics.client import _dump_metadata, _parse_jsonish
+
+
+@pytest.fixture(params=["orjson", "msgspec", "json"])
+def codec(request):
+    if request.param not in _json.available_codecs():
+        pytest.skip(f"{request.param} is not installed")
+    previous = _json.use_codec(request.param)
+    yield _json.get_codec()
+    _json.use_codec(previous)
+
+
+def test_codecs_agree_with_stdlib(codec) -> None:
+    page = fixtures.image_query_page(20)
+    odd = {"big": 2**70, "unicode": "ü€", 3: [1.5, None, True], "nested": {"a": []}}
+
+    for document in (page, odd):
+        encoded = codec.dumps(document)
+        assert encoded == json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode()
+        assert _json.loads(encoded) == json.loads(encoded)
+    assert _json.loads('{"x": NaN}')["x"] != 0.0  # stdlib-only literal still decodes
+    with pytest.raises(json.JSONDecodeError):
+        _json.loads(b'{"x": ')
+
+    assert _dump_metadata({"cam": 3}) == '{"cam":3}'
+    assert _parse_jsonish('{"label": "YES"}') == {"label": "YES"}
+    with pytest.raises(ValueError):
+        _parse_jsonish("{oops")
+
+
+def test_non_finite_floats_encode_as_stdlib_literals(codec) -> None:
+    document = {"x": float("nan"), "bounds": [float("-inf"), 1.5, None], "y": float("inf")}
+
+    assert codec.dumps(document) == b'{"x":NaN,"bounds":[-Infinity,1.5,null],"y":Infinity}'
+    assert codec.dumps({"x": None, "y": 0.25}) == b'{"x":null,"y":0.25}'
+
+
+class _Label(str, enum.Enum):
+    YES = "YES"
+
+
+@dataclasses.dataclass
+class _Point:
+    x: int
+
+
+def test_types_outside_json_follow_stdlib(codec) -> None:
+    assert codec.dumps({"label": _Label.YES}) == b'{"label":"YES"}'
+    stamp = {"at": datetime.datetime(2024, 5, 1, 12, 0)}
+    if codec.name == "msgspec":  # documented: msgspec encodes these itself
+        assert codec.dumps(stamp) == b'{"at":"2024-05-01T12:00:00"}'
+        return
+    for value in (stamp, {"point": _Point(1)}, {"day": datetime.date(2024, 5, 1)}):
+        with pytest.raises(TypeError):
+            codec.dumps(value)
+
+
+def test_unknown_codec_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        _json.use_codec("yaml")
+    assert _json.available_codecs()[-1] == "json"
+
+
+def test_transports_send_and_read_bodies_with_the_codec(codec) -> None:
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.headers["content-type"], request.content))
+        return httpx.Response(200, content=request.content, headers={"Content-Type": "application/json"})
+
+    async def run() -> object:
+        client = AsyncHttpClient("https://edge.local", "token", transport=httpx.MockTransport(handler))
+        try:
+            return await client.post_json("/v1/detectors", json={"name": "door", "metadata": "{}"})
+        finally:
+            await client.close()
+
+    assert asyncio.run(run()) == {"name": "door", "metadata": "{}"}
+    assert seen == [("application/json", b'{"name":"door","metadata":"{}"}')]
+
+    client = HttpClient("https://edge.local", "token")
+    client._session = Mock(headers={})
+    client._session.request.return_value = Mock(ok=True, status_code=204, headers={})
+    client.post_json("/v1/labels", json={"label": "YES"}, headers={"content-type": "application/json+v2"})
+    kwargs = client._session.request.call_args.kwargs
+    assert kwargs["data"] == b'{"label":"YES"}' and "json" not in kwargs
+    assert kwargs["headers"]["content-type"] == "application/json+v2" and "Content-Type" not in kwargs["headers"]
+    client.close()
+
+
+def test_request_bodies_refuse_non_finite_floats(codec) -> None:
+    assert _json.dumps_strict({"label": "NaN", "x": 0.25}) == b'{"label":"NaN","x":0.25}'
+    with pytest.raises(ValueError):
+        _json.dumps_strict({"bounds": [1.0, float("inf")]})
+
+    sent = []
+    client = HttpClient("https://edge.local", "token")
+    client._session = Mock(headers={})
+    client._session.request.side_effect = lambda *args, **kwargs: sent.append(kwargs)
+    with pytest.raises(requests.exceptions.InvalidJSONError):
+        client.post_json("/v1/detectors", json={"confidence_threshold": float("nan")})
+    client.close()
+
+    async def run() -> None:
+        client = AsyncHttpClient("https://edge.local", "token", transport=httpx.MockTransport(sent.append))
+        try:
+            await client.post_json("/v1/detectors", json={"confidence_threshold": float("nan")})
+        finally:
+            await client.close()
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert sent == []
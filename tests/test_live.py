@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from io import BytesIO
+from unittest.mock import Mock
+
+from PIL import Image
+
+from intellioptics import AsyncIntelliOptics, AsyncLiveSubmitter, IntelliOptics, LiveSubmitter, LocalServer
+from intellioptics import _live
+from intellioptics.models import ImageQuery
+
+
+def _make_client() -> IntelliOptics:
+    client = IntelliOptics(endpoint="https://api.example.com", api_token="token")
+    client._http = Mock()
+    client._http.post_json.return_value = {"id": "iq-live", "status": "PENDING"}
+    return client
+
+
+def _jpeg() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (4, 4)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def test_only_latest_frame_per_source_is_submitted() -> None:
+    client = _make_client()
+    submitter = LiveSubmitter(client, max_age=5.0)
+
+    submitter.offer("det-1", b"old", source="cam-1")
+    submitter.offer("det-1", _jpeg(), source="cam-1")
+    submitter.offer("det-1", _jpeg(), source="cam-2")
+
+    results = submitter.process_pending()
+
+    assert [type(item) for item in results] == [ImageQuery, ImageQuery]
+    assert client._http.post_json.call_count == 2
+    assert submitter.stats() == {"offered": 3, "submitted": 2, "superseded": 1, "stale": 0, "errors": 0}
+
+
+def test_stale_frames_are_dropped_before_encode() -> None:
+    client = _make_client()
+    submitter = LiveSubmitter(client, max_age=1.0)
+
+    # Not a decodable image: encoding it would raise, so it must be dropped first.
+    submitter.offer("det-1", b"not-an-image", captured_at=time.time() - 5)
+
+    assert submitter.process_pending() == []
+    client._http.post_json.assert_not_called()
+    assert submitter.stats()["stale"] == 1
+
+
+def test_time_budget_derived_from_remaining_freshness() -> None:
+    client = _make_client()
+    submitter = LiveSubmitter(client, max_age=2.0)
+
+    submitter.offer("det-1", _jpeg(), captured_at=time.time() - 0.5)
+    submitter.process_pending()
+
+    form = client._http.post_json.call_args.kwargs["data"]
+    assert 0 < form["request_timeout"] <= 1.5
+    assert form["patience_time"] == form["request_timeout"]
+    assert 0 < form["wait"] <= 1.5
+
+
+def test_background_workers_submit_and_export_per_source_counters() -> None:
+    client = _make_client()
+    seen: list[str] = []
+
+    with LiveSubmitter(client, max_age=5.0, on_result=lambda det, src, iq: seen.append(src)) as submitter:
+        submitter.offer("det-1", _jpeg(), source="cam-9")
+        deadline = time.time() + 2
+        while not seen and time.time() < deadline:
+            time.sleep(0.01)
+
+    assert seen == ["cam-9"]
+    stats = submitter.stats(per_source=True)
+    assert stats["sources"][("det-1", "cam-9")]["submitted"] == 1
+
+
+def test_async_submitter_encodes_off_the_loop_and_reports_encode_time(monkeypatch) -> None:
+    encoders: list[threading.Thread] = []
+    real_encode = _live.to_jpeg_bytes
+
+    def encode(image):
+        encoders.append(threading.current_thread())
+        return real_encode(image)
+
+    monkeypatch.setattr(_live, "to_jpeg_bytes", encode)
+    timings = []
+    with LocalServer() as server:
+
+        async def run() -> list[ImageQuery]:
+            async with AsyncIntelliOptics(endpoint=server.url, api_token="t", on_request=timings.append) as client:
+                detector = await client.create_detector("door", "Is the door open?")
+                submitter = AsyncLiveSubmitter(client, max_age=5.0)
+                submitter.offer(detector, Image.new("RGB", (64, 64)))
+                return await submitter.process_pending()
+
+        results = asyncio.run(run())
+
+    assert len(results) == 1 and len(encoders) == 1
+    assert encoders[0] is not threading.main_thread()
+    upload = next(timing for timing in timings if timing.path == "/v1/image-queries")
+    assert upload.encode is not None and upload.encode > 0
+
+
+def test_worker_errors_without_on_error_are_logged(caplog) -> None:
+    client = _make_client()
+    client._http.post_json.side_effect = RuntimeError("boom")
+
+    with caplog.at_level(logging.ERROR, logger="intellioptics._live"):
+        with LiveSubmitter(client, max_age=5.0) as submitter:
+            submitter.offer("det-1", _jpeg(), source="cam-3")
+            deadline = time.time() + 2
+            while not caplog.records and time.time() < deadline:
+                time.sleep(0.01)
+
+    assert submitter.stats()["errors"] == 1
+    assert "det-1" in caplog.records[0].getMessage() and "cam-3" in caplog.records[0].getMessage()
+    assert caplog.records[0].exc_info[0] is RuntimeError
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from intellioptics import AsyncIntelliOptics, IntelliOptics, LocalServer
+from intellioptics.errors import IntelliOpticsClientError
+
+
+def _jpeg() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (4, 4), color=(10, 20, 30)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture()
+def server():
+    with LocalServer(confident_after=0.2, seed=7, api_token="local") as running:
+        yield running
+
+
+def test_sync_client_round_trip(server: LocalServer) -> None:
+    client = IntelliOptics(endpoint=server.url, api_token="local")
+    try:
+        detector = client.create_detector("Door", "Is the door open?")
+        assert client.get_detector(detector.id).name == "Door"
+
+        image = _jpeg()
+        query = client.submit_image_query(detector, image, wait=0, metadata={"line": 3})
+        assert query.status == "PENDING"
+        assert query.metadata == {"line": 3}
+        assert client.get_image(query.id) == image
+
+        final = client.wait_for_confident_result(query, confidence_threshold=0.9, timeout_sec=2, poll_interval=0.05)
+        assert final.status == "DONE"
+        assert final.result.confidence == pytest.approx(0.95)
+        assert client.list_image_queries(detector_id=detector.id).count == 1
+        client.add_label(query, "YES")
+    finally:
+        client.close()
+    assert server.stats()["POST /v1/labels 200"] == 1
+
+
+def test_wait_holds_until_confident(server: LocalServer) -> None:
+    client = IntelliOptics(endpoint=server.url, api_token="local")
+    try:
+        query = client.submit_image_query("det-x", _jpeg(), wait=5)
+    finally:
+        client.close()
+    assert query.status == "DONE"
+
+
+def test_throttling_errors_and_auth() -> None:
+    with LocalServer(throttle_rps=1, error_rate=0.0) as server:
+        client = IntelliOptics(endpoint=server.url, api_token="anything")
+        try:
+            client.whoami()
+            with pytest.raises(IntelliOpticsClientError) as exc:
+                client.whoami()
+            assert exc.value.status_code == 429
+        finally:
+            client.close()
+
+    with LocalServer(error_rate=1.0, api_token="secret") as server:
+        client = IntelliOptics(endpoint=server.url, api_token="wrong")
+        try:
+            with pytest.raises(IntelliOpticsClientError) as exc:
+                client.whoami()
+            assert exc.value.status_code == 401
+        finally:
+            client.close()
+
+
+def test_async_client_and_latency(server: LocalServer) -> None:
+    async def run() -> float:
+        async with AsyncIntelliOptics(endpoint=server.url, api_token="local") as client:
+            detector = await client.create_detector("Async", "ok?")
+            started = time.monotonic()
+            results = await asyncio.gather(
+                *(client.submit_image_query(detector, _jpeg(), wait=0) for _ in range(20))
+            )
+            assert len({result.id for result in results}) == 20
+            return time.monotonic() - started
+
+    server_latency = LocalServer(latency=0.05)
+    assert server_latency._sample_latency() == 0.05
+    server_latency.stop()
+    assert asyncio.run(run()) < 2.0
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from PIL import Image
+
+from intellioptics import IntelliOptics, LocalServer, MetricsRegistry, RequestTiming
+from intellioptics._metrics import Histogram, route_template
+
+
+def test_histogram_quantiles_stay_within_relative_error() -> None:
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(-3, 1) for _ in range(20_000))
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.04)
+    assert histogram.count == len(values)
+    assert histogram.summary()["max"] == values[-1]
+
+
+def test_route_template_collapses_ids() -> None:
+    assert route_template("/v1/image-queries/iq-12ab") == "/v1/image-queries/{id}"
+    assert route_template("/v1/detectors/det_9/metrics?x=1") == "/v1/detectors/{id}/metrics"
+    assert route_template("http://host:80/v1/image-queries") == "/v1/image-queries"
+
+
+def test_record_request_and_prometheus_text() -> None:
+    metrics = MetricsRegistry()
+    metrics.record_request(
+        RequestTiming(
+            method="POST",
+            path="/v1/image-queries",
+            url="",
+            started_at=0.0,
+            total=0.25,
+            status_code=503,
+            request_bytes=1024,
+            encode=0.01,
+        )
+    )
+
+    labels = {"endpoint": "/v1/image-queries", "method": "POST", "status": "503"}
+    assert metrics.counter_value("intellioptics_requests_total", **labels) == 1
+    assert metrics.counter_value("intellioptics_request_errors_total", **labels) == 1
+    assert metrics.counter_value("intellioptics_uploaded_bytes_total", endpoint="/v1/image-queries") == 1024
+    assert metrics.histogram("intellioptics_encode_seconds")["count"] == 1
+
+    text = metrics.to_prometheus()
+    assert "# TYPE intellioptics_requests_total counter" in text
+    assert 'intellioptics_requests_total{endpoint="/v1/image-queries",method="POST",status="503"} 1' in text
+    assert "# TYPE intellioptics_request_seconds summary" in text
+    assert 'intellioptics_request_seconds_count{endpoint="/v1/image-queries",method="POST"} 1' in text
+
+
+def test_client_records_submissions_polls_and_time_to_confident() -> None:
+    metrics = MetricsRegistry()
+    with LocalServer(confident_after=0.2) as server:
+        client = IntelliOptics(endpoint=server.url, api_token="t", metrics=metrics)
+        try:
+            query = client.ask_confident(
+                "det-1", Image.new("RGB", (8, 8)), wait=0, timeout_sec=5, poll_interval=0.05
+            )
+        finally:
+            client.close()
+
+    assert query.result.confidence >= 0.9
+    assert metrics.counter_value("intellioptics_submissions_total", detector="det-1") == 1
+    polls = metrics.histogram("intellioptics_polls_per_query", detector="det-1")
+    assert polls["count"] == 1 and polls["max"] >= 2
+    confident = metrics.histogram("intellioptics_time_to_confident_seconds", detector="det-1")
+    assert confident["count"] == 1 and confident["max"] >= 0.2
+    get_status = {"endpoint": "/v1/image-queries/{id}", "method": "GET", "status": "200"}
+    assert metrics.counter_value("intellioptics_requests_total", **get_status) == polls["max"]
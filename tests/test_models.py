@@ -1,10 +1,16 @@
+import pytest
+
 from intellioptics.models import (
+    BinaryClassificationResult,
     Condition,
+    CountingResult,
     Detector,
     ImageQuery,
     ModeEnum,
+    MultiClassificationResult,
     Rule,
     SnoozeTimeUnitEnum,
+    TextRecognitionResult,
 )
 
 
@@ -41,6 +47,39 @@ def test_image_query_defaults_match_documentation() -> None:
     assert query.done_processing is False
 
 
+@pytest.mark.parametrize(
+    ("result_type", "expected"),
+    [
+        ("COUNTING", CountingResult),
+        ("counting", CountingResult),
+        ("multi_classification", MultiClassificationResult),
+        ("TEXT", TextRecognitionResult),
+        (None, BinaryClassificationResult),
+        ("SOMETHING_NEW", BinaryClassificationResult),
+    ],
+)
+def test_image_query_result_model_follows_result_type(result_type, expected) -> None:
+    # Every result model accepts a bare label/confidence, so only result_type disambiguates.
+    query = ImageQuery(id="iq-1", result_type=result_type, result={"label": "person", "confidence": 0.8})
+
+    assert type(query.result) is expected
+    assert query.result.label == "person"
+
+
+def test_image_query_result_falls_back_to_union_when_type_does_not_fit() -> None:
+    query = ImageQuery(id="iq-1", result_type="COUNTING", result={"count": "many", "text": "many"})
+
+    assert type(query.result) is TextRecognitionResult
+
+
+def test_image_query_result_model_from_detector_mode_context() -> None:
+    data = {"id": "iq-1", "result": {"label": "person", "confidence": 0.8}}
+
+    query = ImageQuery.model_validate(data, context={"mode": ModeEnum.COUNTING})
+
+    assert type(query.result) is CountingResult
+
+
 def test_rule_defaults_match_documentation() -> None:
     condition = Condition(verb="CHANGED_TO", parameters={"label": "YES"})
     rule = Rule(
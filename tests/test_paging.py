@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from intellioptics import AsyncIntelliOptics, ExperimentalApi, IntelliOptics, LocalServer
+from intellioptics._paging import aiter_items, iter_items, next_params
+from intellioptics.models import Detector, ImageQuery, Rule
+
+
+def test_next_params_follows_relative_absolute_and_cursor_links() -> None:
+    params = {"page": 1, "page_size": 5, "detector_id": "det-1"}
+
+    assert next_params(None, params) is None
+    assert next_params("?page=2&page_size=5", params) == {"page": "2", "page_size": "5", "detector_id": "det-1"}
+    assert next_params("https://api.example.com/v1/x?cursor=abc", params)["cursor"] == "abc"
+    assert next_params("https://api.example.com/v1/x/2", params)["page"] == 2
+
+
+def _pages(total: int, size: int, fetched: list[int], *, fail_on: int | None = None):
+    def fetch(params):
+        page = int(params["page"])
+        fetched.append(page)
+        if page == fail_on:
+            raise RuntimeError(f"page {page} failed")
+        items = list(range((page - 1) * size, min(page * size, total)))
+        return items, f"?page={page + 1}" if page * size < total else None, total
+
+    return fetch
+
+
+def _wait_for(condition) -> None:
+    deadline = time.monotonic() + 2
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_iter_items_prefetches_at_most_prefetch_pages_ahead(prefetch) -> None:
+    fetched: list[int] = []
+    items = iter_items(_pages(50, 10, fetched), {"page": 1}, prefetch)
+
+    assert next(items) == 0
+    _wait_for(lambda: len(fetched) >= 1 + prefetch)
+    time.sleep(0.05)
+    assert fetched == list(range(1, 2 + prefetch))
+    assert list(items) == list(range(1, 50)) and fetched == [1, 2, 3, 4, 5]
+
+
+def test_iter_items_raises_fetch_errors_in_order_and_stops_on_close() -> None:
+    items = iter_items(_pages(50, 10, [], fail_on=3), {"page": 1}, prefetch=2)
+    with pytest.raises(RuntimeError, match="page 3"):
+        assert [next(items) for _ in range(20)] == list(range(20))
+        next(items)
+
+    before = threading.active_count()
+    fetched: list[int] = []
+    items = iter_items(_pages(1000, 10, fetched), {"page": 1}, prefetch=1)
+    next(items)
+    items.close()
+    _wait_for(lambda: threading.active_count() < before + 1)
+    assert len(fetched) <= 3
+    with pytest.raises(ValueError):
+        iter_items(_pages(1, 1, []), {}, prefetch=-1)
+
+
+def test_aiter_items_prefetches_and_cleans_up() -> None:
+    fetched: list[int] = []
+    sync_fetch = _pages(25, 10, fetched)
+
+    async def fetch(params):
+        await asyncio.sleep(0)
+        return sync_fetch(params)
+
+    async def run() -> tuple[int, list[int]]:
+        items = aiter_items(fetch, {"page": 1}, prefetch=1)
+        first = await items.__anext__()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        ahead = list(fetched)
+        await items.aclose()
+        return first, ahead
+
+    first, ahead = asyncio.run(run())
+    assert first == 0 and ahead == [1, 2]
+
+
+def test_clients_iterate_every_page_of_detectors_and_image_queries() -> None:
+    image = Image.new("RGB", (8, 8))
+    with LocalServer() as server:
+        with IntelliOptics(endpoint=server.url, api_token="t") as client:
+            for index in range(7):
+                client.create_detector(f"det-{index}", "Is it open?")
+            for _ in range(12):
+                client.submit_image_query("det-1", image, wait=0)
+            detectors = list(client.iter_detectors(page_size=3))
+            queries = list(client.iter_image_queries(page_size=5, prefetch=2))
+            raw = list(client.iter_image_queries(page_size=5, raw=True, prefetch=0))
+        requests = server.stats()
+
+        async def run() -> tuple[list, list]:
+            async with AsyncIntelliOptics(endpoint=server.url, api_token="t") as async_client:
+                detectors = [d async for d in async_client.iter_detectors(page_size=3)]
+                queries = [q async for q in async_client.iter_image_queries(page_size=4, detector_id="det-1")]
+                return detectors, queries
+
+        async_detectors, async_queries = asyncio.run(run())
+
+    assert [d.name for d in detectors] == [f"det-{index}" for index in range(7)]
+    assert all(isinstance(d, Detector) for d in detectors) and async_detectors == detectors
+    assert len(queries) == 12 and all(isinstance(q, ImageQuery) for q in queries)
+    assert [q["id"] for q in raw] == [q.id for q in queries] == [q.id for q in async_queries]
+    assert requests["GET /v1/detectors 200"] == 3
+    assert requests["GET /v1/image-queries 200"] == 6
+
+
+def test_iter_rules_follows_next_links() -> None:
+    def rule(index: int) -> dict:
+        return {
+            "id": index,
+            "detector_id": "det-1",
+            "detector_name": "door",
+            "name": f"rule-{index}",
+            "condition": {"verb": "CHANGED_TO", "parameters": {"label": "YES"}},
+        }
+
+    def get_json(path, *, params=None, **_):
+        page = int(params["page"])
+        return {
+            "count": 5,
+            "next": f"/v1/rules?page={page + 1}&page_size=2" if page < 3 else None,
+            "previous": None,
+            "results": [rule(index) for index in range((page - 1) * 2, min(page * 2, 5))],
+        }
+
+    client = IntelliOptics(endpoint="http://rules.invalid", api_token="t")
+    client._http.get_json = get_json  # type: ignore[method-assign]
+
+    rules = list(ExperimentalApi(sync_client=client).iter_rules(page_size=2))
+
+    assert [r.id for r in rules] == [0, 1, 2, 3, 4] and all(isinstance(r, Rule) for r in rules)
+    assert ExperimentalApi(sync_client=client).list_rules().count == 5
+    client.close()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import pstats
+
+import pytest
+
+from intellioptics import AsyncIntelliOptics, IntelliOptics, LocalServer
+from intellioptics._profiling import ENV_DIR, ENV_EVERY, ENV_MEMORY, Profiler, resolve_profiler
+
+
+@pytest.fixture(scope="module")
+def server():
+    with LocalServer(latency=0.01) as running:
+        yield running
+
+
+def test_disabled_profiling_leaves_methods_unwrapped(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(ENV_DIR, raising=False)
+    client = IntelliOptics(endpoint="https://api.example.com", api_token="t")
+    assert "whoami" not in vars(client)
+    assert resolve_profiler(None) is None
+
+
+def test_sampled_calls_write_pstats_folded_stacks_and_allocations(server: LocalServer, tmp_path) -> None:
+    profiler = Profiler(tmp_path, every=2, interval=0.001, memory=True)
+    client = IntelliOptics(endpoint=server.url, api_token="t", profile=profiler)
+    for _ in range(4):
+        client.whoami()
+    client.close()
+
+    assert profiler.stats()["IntelliOptics.whoami"] == {"calls": 4, "profiled": 2}
+    stats = pstats.Stats(str(tmp_path / "IntelliOptics.whoami.pstats"))
+    assert any(func[2] == "get_json" for func in stats.stats)
+    folded = (tmp_path / "IntelliOptics.whoami.folded").read_text().splitlines()
+    assert folded and all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+    assert any("whoami (client.py" in line for line in folded)
+    assert "IntelliOptics.whoami" in (tmp_path / "allocations.txt").read_text()
+
+
+def test_env_var_profiles_async_client(server: LocalServer, tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(ENV_DIR, str(tmp_path))
+    monkeypatch.setenv(ENV_EVERY, "1")
+    monkeypatch.setenv(ENV_MEMORY, "0")
+
+    async def run() -> None:
+        async with AsyncIntelliOptics(endpoint=server.url, api_token="t") as client:
+            await client.whoami()
+            await client.list_detectors()
+
+    asyncio.run(run())
+    assert resolve_profiler(None) is resolve_profiler(str(tmp_path))
+    assert (tmp_path / "AsyncIntelliOptics.whoami.pstats").exists()
+    assert (tmp_path / "AsyncIntelliOptics.list_detectors.folded").exists()
+    assert not (tmp_path / "allocations.txt").exists()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from PIL import Image
+
+from intellioptics import AsyncIntelliOptics, CircuitBreaker, IntelliOptics, LocalServer
+from intellioptics.errors import CircuitOpenError
+from intellioptics.models import QueryTiming
+
+
+def test_submission_and_polling_fill_query_timing() -> None:
+    with LocalServer(confident_after=0.15) as server:
+        client = IntelliOptics(endpoint=server.url, api_token="t")
+        try:
+            submitted = client.submit_image_query("det-1", Image.new("RGB", (8, 8)), wait=0)
+            answered = client.wait_for_confident_result(submitted, timeout_sec=5, poll_interval=0.05)
+        finally:
+            client.close()
+
+    assert submitted.timing.encode > 0
+    assert submitted.timing.upload is not None and submitted.timing.submit >= submitted.timing.upload
+    assert submitted.timing.polls == 0 and submitted.timing.model_version == "local"
+
+    timing = answered.timing
+    assert timing.encode == submitted.timing.encode
+    assert timing.polls >= 2 and timing.polling >= 0.1
+    assert timing.server_latency >= 0.15
+    assert timing.total >= timing.polling + timing.submit
+
+
+def test_encode_time_of_an_aborted_submission_is_dropped() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, probe_interval=60, recovery_timeout=60)
+    breaker.record_failure()
+    with LocalServer() as server:
+        with IntelliOptics(endpoint=server.url, api_token="t", circuit_breaker=breaker) as blocked:
+            with pytest.raises(CircuitOpenError):
+                blocked.submit_image_query("det-1", Image.new("RGB", (8, 8)), wait=0)
+        with IntelliOptics(endpoint=server.url, api_token="t") as client:
+            query = client.submit_image_query_json("det-1", image="aGVsbG8=", wait=0)
+
+    assert query.timing.submit is not None and query.timing.encode is None
+
+
+def test_async_timing_and_summary() -> None:
+    async def run() -> list:
+        with LocalServer() as server:
+            async with AsyncIntelliOptics(endpoint=server.url, api_token="t") as client:
+                return [
+                    await client.submit_image_query_json("det-1", image="aGVsbG8=", wait=0) for _ in range(3)
+                ]
+
+    queries = asyncio.run(run())
+    assert all(query.timing.submit is not None and query.timing.encode is None for query in queries)
+
+    summary = QueryTiming.summarize(queries)
+    assert summary["submit"]["count"] == 3
+    assert summary["submit"]["max"] >= summary["submit"]["p50"]
+    assert "encode" not in summary
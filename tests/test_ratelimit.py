@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from intellioptics._http import HttpClient
+from intellioptics._ratelimit import RateLimiter, TokenBucket, classify_request
+from intellioptics.errors import IntelliOpticsClientError
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_classify_request_by_endpoint_class() -> None:
+    assert classify_request("POST", "/v1/image-queries") == "upload"
+    assert classify_request("POST", "/v1/image-queries-json") == "upload"
+    assert classify_request("GET", "/v1/image-queries/iq-1") == "poll"
+    assert classify_request("GET", "/v1/image-queries") == "management"
+    assert classify_request("GET", "/v1/detectors") == "management"
+
+
+def test_token_bucket_reports_wait_when_empty() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(2.0, burst=2, clock=clock)
+
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0.0
+
+
+def test_limiter_backs_off_on_429_and_recovers_gradually() -> None:
+    clock = _Clock()
+    limiter = RateLimiter({"upload": 10.0}, recovery_seconds=10.0, clock=clock)
+
+    limiter.record("POST", "/v1/image-queries", 429)
+    limiter.record("POST", "/v1/image-queries", 429)  # within the same second: no second cut
+    assert limiter.stats()["upload"]["rate"] == pytest.approx(5.0)
+    assert limiter.stats()["upload"]["throttled"] == 2
+
+    clock.now += 2.0
+    limiter.record("POST", "/v1/image-queries", 200)
+    assert limiter.stats()["upload"]["rate"] == pytest.approx(7.0)
+
+    clock.now += 30.0
+    limiter.record("POST", "/v1/image-queries", 200)
+    assert limiter.stats()["upload"]["rate"] == pytest.approx(10.0)
+
+
+def test_limiter_backs_off_under_mixed_429_and_success_traffic() -> None:
+    clock = _Clock()
+    limiter = RateLimiter({"upload": 100.0}, recovery_seconds=10.0, clock=clock)
+    limiter.record("POST", "/v1/image-queries", 429)
+    assert limiter.stats()["upload"]["rate"] == pytest.approx(50.0)
+
+    # Half the responses throttled, a success always just before each 429.
+    for _ in range(100):
+        clock.now += 0.05
+        limiter.record("POST", "/v1/image-queries", 200)
+        clock.now += 0.05
+        limiter.record("POST", "/v1/image-queries", 429)
+
+    assert limiter.stats()["upload"]["rate"] < 20.0
+
+
+def test_retry_after_pauses_the_endpoint_class() -> None:
+    clock = _Clock()
+    limiter = RateLimiter({"poll": 4.0}, clock=clock)
+
+    limiter.record("GET", "/v1/image-queries/iq-1", 429, "3")
+
+    assert limiter._buckets["poll"].try_acquire() > 2.0
+
+
+def test_http_client_feeds_responses_into_limiter() -> None:
+    limiter = Mock(spec=RateLimiter)
+    client = HttpClient("https://api.example.com", "token", rate_limiter=limiter)
+    response = Mock(ok=False, status_code=429, text="slow down", headers={"Retry-After": "1"})
+    client._session = Mock(headers={})
+    client._session.request.return_value = response
+
+    with pytest.raises(IntelliOpticsClientError) as exc:
+        client.get_json("/v1/image-queries/iq-1")
+
+    assert exc.value.status_code == 429
+    limiter.acquire.assert_called_once_with("GET", "/v1/image-queries/iq-1", timeout=None)
+    limiter.record.assert_called_once_with("GET", "/v1/image-queries/iq-1", 429, "1")
+
+
+def test_async_acquire_waits_without_blocking_loop() -> None:
+    async def run() -> None:
+        bucket = TokenBucket(50.0, burst=1)
+        await bucket.acquire_async()
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await bucket.acquire_async()
+        task.cancel()
+        assert ticks > 0
+
+    asyncio.run(run())
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from PIL import Image
+
+from intellioptics import AsyncIntelliOptics, IntelliOptics, LocalServer
+from intellioptics.client import _normalize_image_query_payload
+from intellioptics.models import Detector, ImageQuery, ImageQueryRecord, PaginatedImageQueryList, QueryResult
+
+_PAYLOAD = {
+    "id": "iq-1",
+    "detector_id": "det-1",
+    "status": "DONE",
+    "result_type": "BINARY",
+    "created_at": "2024-06-01T12:00:00+00:00",
+    "result": {"label": "YES", "confidence": 0.97},
+}
+
+
+_DETECTOR = {"id": "det-1", "name": "door", "query": "Is the door open?", "mode": "BINARY"}
+
+
+def _get_json(path: str, **_: object) -> object:
+    if path == "/v1/image-queries":
+        return {"count": 1, "next": None, "previous": None, "results": [_PAYLOAD]}
+    return _DETECTOR if path.startswith("/v1/detectors/") else _PAYLOAD
+
+
+def _client(**kwargs) -> IntelliOptics:
+    client = IntelliOptics(endpoint="http://raw.invalid", api_token="t", **kwargs)
+    client._http.get_json = _get_json  # type: ignore[method-assign]
+    return client
+
+
+def test_per_call_raw_returns_normalized_dicts_and_records() -> None:
+    client = _client()
+    normalized = _normalize_image_query_payload(_PAYLOAD)
+
+    assert isinstance(client.get_image_query("iq-1"), ImageQuery)
+    assert client.get_image_query("iq-1", raw=True) == normalized
+    json.dumps(client.list_image_queries(raw="dict"))
+
+    record = client.get_image_query("iq-1", raw="record")
+    assert isinstance(record, ImageQueryRecord)
+    assert (record.label, record.confidence, record.created_at) == ("YES", 0.97, "2024-06-01T12:00:00+00:00")
+    assert record.to_dict() == normalized
+    assert record.to_model() == client.get_image_query("iq-1")
+    assert not hasattr(record, "__dict__")
+
+    page = client.list_image_queries(raw="record")
+    assert page["count"] == 1 and page["results"] == [record]
+    assert client.get_result("iq-1", raw=True)["label"] == "YES"
+    client.close()
+
+
+def test_client_default_and_per_call_override() -> None:
+    client = _client(raw="record")
+
+    assert isinstance(client.get_image_query("iq-1"), ImageQueryRecord)
+    assert isinstance(client.get_image_query("iq-1", raw=False), ImageQuery)
+    assert isinstance(client.list_image_queries(raw=False), PaginatedImageQueryList)
+    assert isinstance(client.get_result("iq-1", raw=False), QueryResult)
+    assert isinstance(client.get_detector("det-1", raw=False), Detector)
+    assert client.get_detector("det-1") == _DETECTOR
+    with pytest.raises(ValueError):
+        client.get_image_query("iq-1", raw="yaml")
+    client.close()
+
+
+def test_raw_clients_submit_and_still_wait_with_models() -> None:
+    image = Image.new("RGB", (8, 8))
+    with LocalServer(confident_after=0.05) as server:
+        client = IntelliOptics(endpoint=server.url, api_token="t", raw=True)
+        try:
+            submitted = client.submit_image_query("det-1", image, wait=0)
+            answered = client.ask_confident("det-1", image, wait=0, timeout_sec=5, poll_interval=0.02)
+        finally:
+            client.close()
+
+        async def run() -> object:
+            async with AsyncIntelliOptics(endpoint=server.url, api_token="t") as async_client:
+                return await async_client.submit_image_query("det-1", image, wait=0, raw="record")
+
+        record = asyncio.run(run())
+
+    assert isinstance(submitted, dict) and submitted["detector_id"] == "det-1"
+    assert isinstance(answered, ImageQuery) and answered.result.confidence >= 0.9
+    assert isinstance(record, ImageQueryRecord) and record.detector_id == "det-1"
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from intellioptics import SubmissionScheduler
+from intellioptics.models import ImageQuery
+
+
+class _RecordingClient:
+    def __init__(self, gate: threading.Event | None = None) -> None:
+        self.calls: list[tuple[str, Any]] = []
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._gate = gate
+
+    def submit_image_query(self, detector_id: str, image: Any, **_: Any) -> ImageQuery:
+        with self._lock:
+            self.calls.append((detector_id, image))
+            self.active[detector_id] = self.active.get(detector_id, 0) + 1
+            self.peak[detector_id] = max(self.peak.get(detector_id, 0), self.active[detector_id])
+        if self._gate is not None:
+            self._gate.wait(2)
+        time.sleep(0.001)
+        with self._lock:
+            self.active[detector_id] -= 1
+        return ImageQuery(id=f"iq-{image}", detector_id=detector_id)
+
+
+def test_priority_classes_and_fair_share_across_sources() -> None:
+    gate = threading.Event()
+    client = _RecordingClient(gate)
+    scheduler = SubmissionScheduler(client, max_workers=1)  # type: ignore[arg-type]
+    scheduler.configure_detector("safety", priority=0)
+
+    # Occupy the only worker so everything below queues up before dispatch.
+    blocker = scheduler.submit("other", "block")
+    time.sleep(0.05)
+    futures = [scheduler.submit("other", f"chatty-{i}", source="cam-chatty") for i in range(4)]
+    futures.append(scheduler.submit("other", "quiet-0", source="cam-quiet"))
+    futures.append(scheduler.submit("safety", "alarm", source="cam-chatty"))
+    assert scheduler.stats()["queue_depth"]["priority"] == {0: 1, 2: 5}
+
+    gate.set()
+    scheduler.shutdown()
+
+    order = [image for _, image in client.calls]
+    assert order[0] == "block"
+    assert order[1] == "alarm"
+    # The quiet source is interleaved instead of waiting behind every chatty frame.
+    assert order.index("quiet-0") <= 3
+    assert blocker.result().id == "iq-block"
+    assert all(future.done() for future in futures)
+
+
+def test_per_detector_concurrency_cap() -> None:
+    client = _RecordingClient()
+    with SubmissionScheduler(client, max_workers=4) as scheduler:  # type: ignore[arg-type]
+        scheduler.configure_detector("det-capped", max_concurrency=1)
+        futures = [scheduler.submit("det-capped", i) for i in range(6)]
+        for future in futures:
+            future.result(timeout=2)
+
+    assert client.peak["det-capped"] == 1
+    stats = scheduler.stats()
+    assert stats["dispatched"] == 6
+    assert stats["wait_seconds"]["detector"]["det-capped"]["count"] == 6
+
+
+def test_global_rate_budget() -> None:
+    client = _RecordingClient()
+    started = time.monotonic()
+    with SubmissionScheduler(client, max_workers=4, max_rps=20) as scheduler:  # type: ignore[arg-type]
+        for future in [scheduler.submit("det", i) for i in range(25)]:
+            future.result(timeout=5)
+
+    # 20 tokens of burst are available up front; the remaining 5 need ~0.25 s.
+    assert time.monotonic() - started >= 0.2
+
+
+def test_idle_dispatcher_holds_no_token_and_shutdown_settles_a_selected_job() -> None:
+    client = _RecordingClient()
+    scheduler = SubmissionScheduler(client, max_workers=8, max_rps=5)  # type: ignore[arg-type]
+    time.sleep(0.05)
+    assert scheduler._bucket is not None and scheduler._bucket._tokens == 5.0  # the burst is untouched while idle
+
+    futures = [scheduler.submit("det", i) for i in range(6)]
+    deadline = time.monotonic() + 2
+    while scheduler.stats()["queued"] and time.monotonic() < deadline:
+        time.sleep(0.005)
+    scheduler.shutdown(wait=False)  # the last job is selected and waiting for a token
+    scheduler._dispatcher.join(timeout=2)
+
+    assert not scheduler._dispatcher.is_alive()
+    assert futures[-1].cancelled()
+    assert [future.result(timeout=2).id for future in futures[:-1]] == [f"iq-{i}" for i in range(5)]
+    while scheduler.stats()["active"] and time.monotonic() < deadline:
+        time.sleep(0.005)  # workers finish their bookkeeping just after setting the result
+    assert scheduler.stats()["active"] == 0
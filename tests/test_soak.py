@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from intellioptics import IntelliOptics, LocalServer, cli
+from intellioptics._soak import SoakReport, SoakSample, SoakThresholds, evaluate, open_connections, run_soak
+
+
+@pytest.mark.parametrize("target", ["sync", "async", "experimental"])
+def test_short_soak_passes_for_each_client(target: str) -> None:
+    report = run_soak(target, duration=1.5, sample_interval=0.2, warmup=0.3, recycle_every=20)
+
+    assert report.passed, report.format_table()
+    assert report.iterations > 20 and report.errors == 0
+    assert len(report.samples) >= 3
+    assert report.growth["connections_max"] <= 1
+    assert {"rss_mb", "traced_mb", "fds"} <= set(report.growth)
+
+
+def test_evaluate_flags_growth_past_thresholds() -> None:
+    mb = 1024 * 1024
+    report = SoakReport(target="sync", duration=1.0)
+    report.samples = [
+        SoakSample(elapsed=i, iterations=i * 10, rss=100 * mb + i * 10 * mb, traced=mb, fds=10 + i, connections=i)
+        for i in range(8)
+    ]
+
+    evaluate(report, SoakThresholds(rss_mb=32, traced_mb=8, fds=3, connections=4))
+
+    assert report.growth["rss_mb"] == pytest.approx(50)
+    assert report.growth["traced_mb"] == 0
+    assert [failure.split(" ")[0] for failure in report.failures] == ["rss_mb", "fds", "7"]
+
+
+def test_open_connections_and_cli_exit_code() -> None:
+    with LocalServer() as server:
+        client = IntelliOptics(endpoint=server.url, api_token="t")
+        assert open_connections(client) == 0
+        client.whoami()
+        assert open_connections(client) == 1
+        client.close()
+
+    result = CliRunner().invoke(
+        cli.app, ["soak", "--duration", "1", "--interval", "0.2", "--warmup", "0.2", "--max-fds", "-1", "--json"]
+    )
+    assert result.exit_code == 1
+    report = json.loads(result.stdout)
+    assert report["passed"] is False and report["failures"][0].startswith("fds")
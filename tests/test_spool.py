@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from io import BytesIO
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+import requests
+from PIL import Image
+
+from intellioptics import AsyncIntelliOptics, IntelliOptics, SubmissionSpool
+from intellioptics.errors import IntelliOpticsClientError
+
+
+def _jpeg(color: tuple[int, int, int] = (1, 2, 3)) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (4, 4), color=color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def _make_client(spool: SubmissionSpool) -> IntelliOptics:
+    client = IntelliOptics(endpoint="https://api.example.com", api_token="token")
+    client._http = Mock()
+    client._spool = spool
+    return client
+
+
+def test_unreachable_endpoint_spools_with_preassigned_id(tmp_path) -> None:
+    spool = SubmissionSpool(tmp_path)
+    client = _make_client(spool)
+    client._http.post_json.side_effect = requests.ConnectionError("offline")
+
+    query = client.submit_image_query("det-1", _jpeg(), metadata={"cam": 3})
+
+    assert query.status == "SPOOLED"
+    assert query.id.startswith("iq_")
+    assert spool.pending() == 1
+
+    client._http.post_json.side_effect = None
+    client._http.post_json.return_value = {"id": query.id, "status": "PENDING"}
+    assert spool.drain(client._http) == 1
+
+    form = client._http.post_json.call_args.kwargs["data"]
+    assert form["image_query_id"] == query.id
+    assert form["wait"] == 0.0
+    assert form["metadata"] == '{"cam":3}'
+    assert spool.pending() == 0
+    assert spool.stats()["delivered"] == 1
+    assert spool.drain_rate() > 0
+
+
+def test_client_errors_are_not_spooled(tmp_path) -> None:
+    spool = SubmissionSpool(tmp_path)
+    client = _make_client(spool)
+    client._http.post_json.side_effect = IntelliOpticsClientError("bad", status_code=400)
+
+    with pytest.raises(IntelliOpticsClientError):
+        client.submit_image_query("det-1", _jpeg())
+
+    assert spool.pending() == 0
+
+
+def test_drain_stops_while_service_is_still_down(tmp_path) -> None:
+    spool = SubmissionSpool(tmp_path, concurrency=1)
+    spool.record({"detector_id": "det-1"}, {"image": ("image.jpg", _jpeg(), "image/jpeg")})
+    spool.record({"detector_id": "det-1"}, {"image": ("image.jpg", _jpeg((9, 9, 9)), "image/jpeg")})
+    http = Mock()
+    http.post_json.side_effect = IntelliOpticsClientError("unavailable", status_code=503)
+
+    assert spool.drain(http) == 0
+    assert http.post_json.call_count == 1
+    assert spool.pending() == 2
+    assert spool.stats()["failed_attempts"] == 1
+
+
+def test_quota_evicts_oldest_and_identical_images_share_storage(tmp_path) -> None:
+    first, second = _jpeg((10, 0, 0)), _jpeg((0, 10, 0))
+    spool = SubmissionSpool(tmp_path, max_bytes=len(first) + len(second) - 1)
+
+    spool.record({"detector_id": "det-1"}, {"image": ("image.jpg", first, "image/jpeg")})
+    spool.record({"detector_id": "det-1"}, {"image": ("image.jpg", first, "image/jpeg")})
+    assert spool.stats()["bytes"] == len(first)
+
+    spool.record({"detector_id": "det-1"}, {"image": ("image.jpg", second, "image/jpeg")})
+
+    stats = spool.stats()
+    assert stats["evicted"] == 2
+    assert stats["pending"] == 1
+    assert stats["bytes"] == len(second)
+
+
+def test_entries_age_out(tmp_path) -> None:
+    spool = SubmissionSpool(tmp_path, max_age=0.01)
+    spool.record({"detector_id": "det-1"}, {"image": ("image.jpg", _jpeg(), "image/jpeg")})
+    time.sleep(0.02)
+
+    assert spool.drain(Mock()) == 0
+    assert spool.stats()["expired"] == 1
+    assert spool.pending() == 0
+
+
+def test_async_spooling_and_draining_stay_off_the_event_loop(tmp_path) -> None:
+    spool = SubmissionSpool(tmp_path)
+    threads: dict[str, set[threading.Thread]] = {}
+    for name in ("record", "_claim", "_settle"):
+        original = getattr(spool, name)
+
+        def traced(*args, _name=name, _original=original, **kwargs):
+            threads.setdefault(_name, set()).add(threading.current_thread())
+            return _original(*args, **kwargs)
+
+        setattr(spool, name, traced)
+
+    async def run() -> tuple[str, int]:
+        client = AsyncIntelliOptics(endpoint="https://api.example.com", api_token="token")
+        client._spool = spool
+        client._http.post_json = AsyncMock(side_effect=httpx.ConnectError("offline"))  # type: ignore[method-assign]
+        query = await client.submit_image_query("det-1", _jpeg())
+        client._http.post_json = AsyncMock(return_value={"id": query.id, "status": "PENDING"})  # type: ignore[method-assign]
+        delivered = await spool.adrain(client._http)
+        await client.close()
+        return query.status, delivered
+
+    status, delivered = asyncio.run(run())
+
+    assert status == "SPOOLED" and delivered == 1 and spool.pending() == 0
+    assert set(threads) == {"record", "_claim", "_settle"}
+    assert threading.main_thread() not in set().union(*threads.values())
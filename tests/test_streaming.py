@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import tracemalloc
+
+import pytest
+from PIL import Image
+
+from benchmarks import fixtures
+from intellioptics import AsyncIntelliOptics, ExperimentalApi, IntelliOptics, LocalServer
+from intellioptics._jsonstream import ItemStream, JsonItemParser
+from intellioptics.errors import IntelliOpticsClientError
+from intellioptics.models import ImageQuery, Rule
+
+
+def _parse(body: bytes, sizes: list[int]) -> tuple[list, dict]:
+    parser = JsonItemParser()
+    items, start = [], 0
+    for size in sizes:
+        items += parser.feed(body[start : start + size])
+        start += size
+    items += parser.feed(body[start:])
+    return items + parser.close(), parser.envelope
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"count": 3, "next": "p?page=2", "previous": None, "results": [{"id": "a"}, {"id": "ü€"}, 7, [1, 2]]},
+        {"items": [{"n": -1.5e3}, {"n": 10}], "count": 12, "extra": {"nested": [1, {"x": "]"}]}},
+        {"results": [], "count": 0},
+        [{"id": "a"}, {"id": "b", "n": 100}, 123],
+        {"count": 5},
+    ],
+)
+def test_parser_matches_json_loads_at_any_chunk_boundary(document) -> None:
+    body = json.dumps(document, ensure_ascii=False, indent=1).encode()
+    expected_items = document if isinstance(document, list) else next(
+        (document[key] for key in ("results", "items") if key in document), []
+    )
+    envelope = {} if isinstance(document, list) else {k: v for k, v in document.items() if k not in ("results", "items")}
+    rng = random.Random(fixtures.SEED)
+    splits = [[1] * len(body), [len(body)]] + [[rng.randint(1, 9) for _ in range(len(body))] for _ in range(20)]
+
+    for sizes in splits:
+        assert _parse(body, sizes) == (expected_items, envelope)
+
+
+def test_parser_rejects_truncated_and_malformed_bodies() -> None:
+    body = json.dumps(fixtures.image_query_page(3)).encode()
+    for bad in (body[:-1], body[: len(body) // 2], b'{"results": [1,, 2]}', b'"text"'):
+        parser = JsonItemParser()
+        with pytest.raises(ValueError):
+            parser.feed(bad)
+            parser.close()
+    assert JsonItemParser().close() == []
+
+
+def test_items_are_yielded_before_the_body_finishes_and_memory_stays_bounded() -> None:
+    body = json.dumps(fixtures.image_query_page(2000)).encode()
+    consumed = []
+
+    def chunks():
+        for start in range(0, len(body), 4096):
+            consumed.append(start)
+            yield body[start : start + 4096]
+
+    stream = ItemStream(lambda: (chunks(), lambda: None))
+    iterator = iter(stream)
+    assert next(iterator)["id"] and len(consumed) == 1
+
+    tracing = tracemalloc.is_tracing()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        assert sum(1 for _ in iterator) == 1999
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    assert peak < len(body) // 10
+    assert stream.count == 2000
+
+
+def test_stream_image_queries_matches_list_image_queries() -> None:
+    image = Image.new("RGB", (8, 8))
+    timings = []
+    with LocalServer() as server:
+        with IntelliOptics(endpoint=server.url, api_token="t", on_request=timings.append) as client:
+            for _ in range(5):
+                client.submit_image_query("det-1", image, wait=0)
+            listed = client.list_image_queries(page_size=50)
+            stream = client.stream_image_queries(page_size=50)
+            streamed = list(stream)
+            records = list(client.stream_image_queries(page_size=50, raw="record"))
+            with pytest.raises(IntelliOpticsClientError):
+                list(client._http.stream_json("/v1/missing"))
+
+        async def run() -> list:
+            async with AsyncIntelliOptics(endpoint=server.url, api_token="t") as async_client:
+                return [query async for query in async_client.stream_image_queries(page_size=50)]
+
+        async_streamed = asyncio.run(run())
+
+    def key(query):  # LocalServer draws a fresh latency_ms per render
+        return query.id, query.status, query.result.label, query.created_at
+
+    assert all(isinstance(query, ImageQuery) for query in streamed)
+    assert [key(q) for q in streamed] == [key(q) for q in listed.results] == [key(q) for q in async_streamed]
+    assert stream.count == listed.count == 5 and stream.next is None
+    assert [key(record.to_model()) for record in records] == [key(q) for q in streamed]
+    stream_timing = next(t for t in timings if t.path == "/v1/image-queries" and t.method == "GET")
+    assert stream_timing.response_bytes and stream_timing.status_code == 200
+
+
+def test_stream_rules_yields_rules() -> None:
+    rule = {
+        "id": 1,
+        "detector_id": "det-1",
+        "detector_name": "door",
+        "name": "alert",
+        "condition": {"verb": "CHANGED_TO", "parameters": {"label": "YES"}},
+    }
+    body = json.dumps({"count": 1, "next": None, "previous": None, "results": [rule]}).encode()
+
+    class _Response:
+        def iter_content(self, chunk_size: int):
+            return iter([body[:10], body[10:]])
+
+        def close(self) -> None:
+            pass
+
+    client = IntelliOptics(endpoint="http://rules.invalid", api_token="t")
+    client._http.request_raw = lambda *args, **kwargs: _Response()  # type: ignore[method-assign]
+    stream = ExperimentalApi(sync_client=client).stream_rules(page_size=100)
+
+    rules = list(stream)
+    assert len(rules) == 1 and isinstance(rules[0], Rule) and stream.count == 1
+    client.close()
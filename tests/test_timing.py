@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from io import BytesIO
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image
+
+from intellioptics import AsyncIntelliOptics, IntelliOptics, LocalServer, RequestTiming
+from intellioptics._http import HttpClient
+from intellioptics._timing import retry_attempt
+
+
+@pytest.fixture(scope="module")
+def server():
+    with LocalServer() as running:
+        yield running
+
+
+def _jpeg() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (8, 8), color=(1, 2, 3)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def test_sync_records_phases_bytes_and_encode_time(server: LocalServer) -> None:
+    records: list[RequestTiming] = []
+    client = IntelliOptics(endpoint=server.url, api_token="t", on_request=records.append)
+    try:
+        client.submit_image_query("det-1", Image.new("RGB", (8, 8)), wait=0)
+        client.whoami()
+    finally:
+        client.close()
+
+    first, second = records
+    assert first.method == "POST" and first.path == "/v1/image-queries"
+    assert first.status_code == 200
+    assert first.encode is not None and first.encode > 0
+    assert first.connect is not None  # new connection
+    assert first.upload is not None and first.server is not None and first.download is not None
+    assert first.request_bytes > 0 and first.response_bytes > 0
+    assert first.total >= first.server
+    assert second.connect is None  # keep-alive reuse
+    assert second.encode is None
+
+
+def test_async_records_phases_from_httpcore_trace(server: LocalServer) -> None:
+    records: list[RequestTiming] = []
+
+    async def run() -> None:
+        async with AsyncIntelliOptics(endpoint=server.url, api_token="t", on_request=records.append) as client:
+            await client.submit_image_query("det-1", _jpeg(), wait=0)
+
+    asyncio.run(run())
+    (record,) = records
+    assert record.status_code == 200
+    assert record.connect is not None and record.upload is not None and record.server is not None
+    assert record.url == f"{server.url}/v1/image-queries"
+
+
+def test_traceparent_header_retry_and_error_records() -> None:
+    records: list[RequestTiming] = []
+    client = HttpClient("https://api.example.com", "token", on_request=records.append, traceparent=True)
+    client._session = Mock(headers={})
+    client._session.request.side_effect = ConnectionError("boom")
+
+    with retry_attempt(2), pytest.raises(ConnectionError):
+        client.request_raw("GET", "/v1/detectors")
+
+    header = client._session.request.call_args.kwargs["headers"]["traceparent"]
+    assert re.fullmatch(r"00-[0-9a-f]{32}-[0-9a-f]{16}-[0-9a-f]{2}", header)
+    assert records[0].traceparent == header
+    assert records[0].error == "ConnectionError"
+    assert records[0].retry == 2
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socketserver
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import httpx
+import pytest
+
+from intellioptics._http import AsyncHttpClient, HttpClient
+from intellioptics._transport import split_unix_endpoint
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps({"path": self.path, "auth": self.headers.get("Authorization")}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+@pytest.fixture()
+def unix_socket():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "edge.sock")
+    server = _UnixServer(path, _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield path
+    finally:
+        server.shutdown()
+        server.server_close()
+        os.unlink(path)
+        os.rmdir(directory)
+
+
+def test_split_unix_endpoint() -> None:
+    assert split_unix_endpoint("unix:///run/edge.sock") == ("http://localhost", "/run/edge.sock")
+    assert split_unix_endpoint("https://api.example.com/") == ("https://api.example.com", None)
+
+
+def test_sync_client_over_unix_socket(unix_socket: str) -> None:
+    client = HttpClient(f"unix://{unix_socket}", "token")
+    try:
+        assert client.get_json("/v1/detectors") == {"path": "/v1/detectors", "auth": "Bearer token"}
+        assert client.get_json("v1/labels", params={"page": 2})["path"] == "/v1/labels?page=2"
+        assert client.warmup(connections=2) == 2
+    finally:
+        client.close()
+
+
+def test_async_client_over_unix_socket(unix_socket: str) -> None:
+    async def run() -> dict:
+        client = AsyncHttpClient(f"unix://{unix_socket}", "token")
+        try:
+            return await client.get_json("/v1/detectors")
+        finally:
+            await client.close()
+
+    assert asyncio.run(run()) == {"path": "/v1/detectors", "auth": "Bearer token"}
+
+
+def test_async_client_accepts_custom_transport() -> None:
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"host": request.url.host}))
+
+    async def run() -> dict:
+        client = AsyncHttpClient("https://edge.local", "token", transport=transport)
+        try:
+            return await client.get_json("/healthz")
+        finally:
+            await client.close()
+
+    assert asyncio.run(run()) == {"host": "edge.local"}
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from requests.adapters import HTTPAdapter
+
+from intellioptics import LocalServer
+from intellioptics._http import AsyncHttpClient, HttpClient
+
+
+def test_sync_warmup_opens_concurrent_connections(monkeypatch: pytest.MonkeyPatch) -> None:
+    resolved: list[tuple] = []
+    monkeypatch.setattr("socket.getaddrinfo", lambda *args, **kwargs: resolved.append(args) or [])
+    client = HttpClient("https://api.example.com", "token")
+    barrier = threading.Barrier(3, timeout=2)
+
+    def fake_get(url, **kwargs):
+        barrier.wait()  # all three pings are in flight together
+        return Mock(ok=True)
+
+    client._session.get = fake_get
+
+    assert client.warmup(connections=3) == 3
+    assert resolved == [("api.example.com", 443)]
+    assert client._session.get_adapter("https://api.example.com")._pool_maxsize >= 3
+    client.close()
+
+
+def test_sync_keepalive_pings_until_stopped(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("socket.getaddrinfo", lambda *args, **kwargs: [])
+    client = HttpClient("https://api.example.com", "token")
+    pinged = threading.Event()
+    calls: list[str] = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        if len(calls) > 1:
+            pinged.set()
+        return Mock(ok=True)
+
+    client._session.get = fake_get
+    client.warmup(keepalive_interval=0.01)
+
+    assert pinged.wait(2)
+    assert calls[0] == "https://api.example.com/healthz"
+    client.close()
+    assert client._keepalive_stop is None
+
+
+def test_async_warmup_pings_health_endpoint() -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(200, json={"status": "ok"})
+
+    async def run() -> int:
+        client = AsyncHttpClient("http://127.0.0.1:9", "token")
+        client._client = httpx.AsyncClient(base_url="http://127.0.0.1:9", transport=httpx.MockTransport(handler))
+        try:
+            return await client.warmup(connections=4)
+        finally:
+            await client.close()
+
+    assert asyncio.run(run()) == 4
+    assert seen == ["/healthz"] * 4
+
+
+def test_sync_warmup_resizes_the_adapter_serving_the_base_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("socket.getaddrinfo", lambda *args, **kwargs: [])
+    client = HttpClient("https://api.example.com", "token")
+    # Mounted under the base URL, this adapter outranks the scheme-level one.
+    mounted = HTTPAdapter(pool_maxsize=2)
+    client._session.mount("https://api.example.com/", mounted)
+    closed: list[bool] = []
+    monkeypatch.setattr(mounted, "close", lambda: closed.append(True))
+    client._session.get = lambda url, **kwargs: Mock(ok=True)
+
+    client.warmup(connections=16)
+
+    adapter = client._session.get_adapter("https://api.example.com/v1/detectors")
+    assert adapter is not mounted and adapter._pool_maxsize == 16
+    assert closed == [True]
+    client.close()
+
+
+def test_async_warmup_raises_the_pool_limits_under_a_pending_request() -> None:
+    with LocalServer(latency=0.3) as server:
+
+        async def run() -> tuple[dict, int, int]:
+            client = AsyncHttpClient(server.url, "token")
+            try:
+                pending = asyncio.create_task(client.get_json("/v1/detectors"))
+                await asyncio.sleep(0.1)  # the listing is now in flight
+                await client.warmup(connections=50)
+                pool = client._client._transport._pool
+                return await pending, pool._max_keepalive_connections, pool._max_connections
+            finally:
+                await client.close()
+
+        listing, keepalive, most = asyncio.run(run())
+
+    assert listing["results"] == []
+    assert keepalive == 50 and most == 100
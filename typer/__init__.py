@@ -3,8 +3,8 @@
 This shim implements the minimal surface that the project relies on without
 pulling in the third-party dependency. It purposefully mirrors the small
 pieces of behaviour exercised by the CLI tests: registering commands, raising
-``Exit`` with an ``exit_code`` attribute, and streaming output through
-``echo``.
+``Exit`` with an ``exit_code`` attribute, streaming output through
+``echo``, and ``--name value`` options declared with :func:`Option`.
 
 The goal is not to be feature complete, but to provide a stable drop-in
 replacement that behaves similarly for the supported methods.
@@ -15,9 +15,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, Iterable, Optional
 
+import inspect
 import sys
 
-__all__ = ["Typer", "Exit", "echo"]
+__all__ = ["Typer", "Exit", "Option", "echo"]
 
 
 class Exit(Exception):
@@ -37,6 +38,69 @@ def echo(message: Any, *, err: bool = False) -> None:
     stream.flush()
 
 
+@dataclass
+class OptionInfo:
+    """Default value and help text for a ``--name`` option."""
+
+    default: Any
+    param_decls: tuple = ()
+    help: Optional[str] = None
+
+
+def Option(default: Any = None, *param_decls: str, help: Optional[str] = None, **_: Any) -> Any:  # noqa: N802
+    """Declare a keyword option, spelled ``--param-name`` unless ``param_decls`` name it."""
+
+    return OptionInfo(default=default, param_decls=param_decls, help=help)
+
+
+def _convert(value: str, default: Any) -> Any:
+    if isinstance(default, bool):
+        return value.lower() in ("1", "true", "yes", "on")
+    if isinstance(default, (int, float)):
+        return type(default)(value)
+    return value
+
+
+def _parse_options(func: "CommandFn", args: list[str]) -> tuple[list[str], dict[str, Any]]:
+    """Split ``args`` into positionals and ``--name value`` / ``--flag`` / ``--no-flag`` options."""
+
+    options: dict[str, OptionInfo] = {}
+    aliases: dict[str, str] = {}
+    for name, param in inspect.signature(func).parameters.items():
+        if isinstance(param.default, OptionInfo):
+            options[name] = param.default
+            for decl in param.default.param_decls or ("--" + name.replace("_", "-"),):
+                aliases[decl.lstrip("-").replace("-", "_")] = name
+    positional: list[str] = []
+    kwargs: dict[str, Any] = {name: info.default for name, info in options.items()}
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        index += 1
+        if not arg.startswith("--"):
+            positional.append(arg)
+            continue
+        key, has_value, value = arg[2:].partition("=")
+        alias = key.replace("-", "_")
+        negated = alias.startswith("no_") and alias[3:] in aliases
+        name = aliases.get(alias[3:] if negated else alias, "")
+        info = options.get(name)
+        if info is None:
+            echo(f"No such option: --{key}", err=True)
+            raise Exit(code=2)
+        if isinstance(info.default, bool) and not has_value:
+            kwargs[name] = not negated
+            continue
+        if not has_value:
+            if index >= len(args):
+                echo(f"Option --{key} requires a value", err=True)
+                raise Exit(code=2)
+            value = args[index]
+            index += 1
+        kwargs[name] = _convert(value, info.default)
+    return positional, kwargs
+
+
 CommandFn = Callable[..., Any]
 
 
@@ -75,7 +139,8 @@ class Typer:
 
         command_name, *tail = args
         func = self._lookup(command_name)
-        func(*tail)
+        positional, options = _parse_options(func, tail)
+        func(*positional, **options)
         return 0
 
     def __call__(self, argv: Optional[Iterable[str]] = None) -> int:  # pragma: no cover - passthrough